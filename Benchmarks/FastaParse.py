@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Сравнение скорости чтения fasta файла
+
+Сравниваются прежний построчный разбор (LegacyFromFile) и
+SequenceDatabase.fromFile на синтетическом fasta файле. Результаты обоих
+способов должны совпадать, а ускорение — быть не меньше MIN_SPEEDUP,
+иначе бенчмарк завершается с ошибкой.
+
+Запуск:
+    python -m Benchmarks.FastaParse [количество белков] [количество повторов]
+"""
+from os import path
+from random import Random
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable, Dict, Tuple
+from Classes.Sequence import Sequence
+from Classes.SequenceDatabase import SequenceDatabase
+
+DEFAULT_PROTEIN_COUNT = 200000
+MIN_SPEEDUP = 2.0
+RESIDUES = "ACDEFGHIKLMNPQRSTVWY"
+
+
+def LegacyFromFile(seqDBFilename: str) -> Dict[str, Sequence]:
+    """Прежняя реализация SequenceDatabase.fromFile"""
+    with open(seqDBFilename) as seqDBFile:
+        strings = seqDBFile.read().split('\n')
+        seqDB: Dict[str, Sequence] = {}
+        i = 0
+        while(i < len(strings)):
+            if len(strings[i]):
+                if strings[i][0] == '>':
+                    seqID = strings[i].split(' ')[0][1:]
+                    seqDB[seqID] = Sequence(accession=seqID)
+                    if len(strings[i].split(' ')) > 1:
+                        seqDB[seqID].desc = strings[i].split(' ')[1]
+                        for word in strings[i].split(' ')[2:]:
+                            if word.startswith("OS="):
+                                break
+                            seqDB[seqID].desc += ' ' + word
+                    i += 1
+                    while ((i < len(strings)) and (
+                            not len(strings[i]) or strings[i][0] != '>')):
+                        seqDB[seqID].seq += ''.join(
+                            [ch for ch in strings[i]
+                             if ch in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"])
+                        i += 1
+                    i -= 1
+                    if not seqDB[seqID].len:
+                        raise IndexError(seqID)
+            i += 1
+        return seqDB
+
+
+def WriteSyntheticFasta(filename: str, proteinCount: int,
+                        seed: int = 0) -> None:
+    """Записывает fasta файл со случайными последовательностями в формате
+    UniProt (строки последовательности по 60 символов)
+
+    Args:
+        filename: имя создаваемого файла
+        proteinCount: количество белков
+        seed: начальное значение генератора случайных чисел
+    """
+    random = Random(seed)
+    with open(filename, 'w') as outFile:
+        for i in range(proteinCount):
+            seq = ''.join(random.choices(RESIDUES, k=random.randint(50, 800)))
+            outFile.write(
+                f">sp|P{i:06}|PROT{i}_HUMAN Synthetic protein {i} "
+                f"OS=Homo sapiens OX=9606 GN=PROT{i} PE=1 SV=1\n")
+            for start in range(0, len(seq), 60):
+                outFile.write(seq[start:start + 60] + '\n')
+
+
+def Measure(parser: Callable, filename: str,
+            repeats: int) -> Tuple[float, Dict[str, Sequence]]:
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = perf_counter()
+        result = parser(filename)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def IsSameDatabase(first: Dict[str, Sequence],
+                   second: Dict[str, Sequence]) -> bool:
+    if list(first.keys()) != list(second.keys()):
+        return False
+    for accession, sequence in first.items():
+        other = second[accession]
+        if (sequence.seq, sequence.desc, sequence.len) != (
+                other.seq, other.desc, other.len):
+            return False
+    return True
+
+
+def main():
+    proteinCount = int(argv[1]) if len(argv) > 1 else DEFAULT_PROTEIN_COUNT
+    repeats = int(argv[2]) if len(argv) > 2 else 3
+    with TemporaryDirectory() as tempDir:
+        filename = path.join(tempDir, "synthetic.fasta")
+        WriteSyntheticFasta(filename, proteinCount)
+        size = path.getsize(filename)
+        print(f"{proteinCount} proteins, {size / 1024 / 1024:.1f} MiB, "
+              f"best of {repeats}")
+
+        baseTime, baseResult = Measure(LegacyFromFile, filename, repeats)
+        print(f"Legacy parser:               {baseTime:.3f} s")
+        curTime, curResult = Measure(
+            SequenceDatabase.fromFile, filename, repeats)
+        if not IsSameDatabase(baseResult, curResult):
+            raise ValueError(
+                "SequenceDatabase.fromFile result differs from legacy parser")
+        speedup = baseTime / curTime
+        print(f"SequenceDatabase.fromFile:   {curTime:.3f} s (x{speedup:.2f})")
+        if speedup < MIN_SPEEDUP:
+            raise SystemExit(
+                f"Speedup x{speedup:.2f} is less than x{MIN_SPEEDUP}")
+
+
+if __name__ == "__main__":
+    main()
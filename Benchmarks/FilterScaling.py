@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Зависимость времени фильтрации таблиц от количества строк
+
+Фильтры (FDR, чёрный список, confidence, Protein таблицы) применяются к
+синтетическим таблицам разного размера. Время приводится в микросекундах на
+строку: фильтры по маске (см. TableFilter) работают за линейное время,
+поэтому время на строку не должно расти больше, чем в MAX_PER_ROW_GROWTH
+раз, иначе бенчмарк завершается с ошибкой. Для таблиц не больше
+LEGACY_MAX_ROWS строк дополнительно измеряется прежнее удаление строк по
+одной (pop в цикле), а результаты обоих способов сравниваются.
+
+Запуск:
+    python -m Benchmarks.FilterScaling [размеры таблиц через запятую]
+"""
+import gc
+from decimal import Decimal
+from random import Random
+from sys import argv
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+from Classes.Comparable import Comparable
+from Classes.FDRFilter import FDRFilter
+from Classes.Functions import (
+    ApplyPeptideConfidenceFilter,
+    IsReversed,
+    RemoveAccessionsListFromTable,
+)
+from Classes.PeptideAccession import PeptideAccession
+from Classes.PeptideRow import PeptideRow
+from Classes.PeptideTable import PeptideTable
+from Classes.PeptideTables import PeptideTables
+from Classes.RawPeptideTable import RawPeptideTable
+
+DEFAULT_SIZES = (10000, 100000, 1000000)
+LEGACY_MAX_ROWS = 100000
+MAX_PER_ROW_GROWTH = 3.0
+ACCESSION_COUNT = 5000
+TABLE_NUM = "1"
+
+
+def LegacyApplyDefaultFilter(table: RawPeptideTable) -> None:
+    i = 0
+    while i < len(table):
+        accessions = table[i].accessions
+        j = 0
+        while j < len(accessions):
+            if IsReversed(accessions[j]):
+                accessions.pop(j)
+            else:
+                j += 1
+        if len(accessions) == 0:
+            del table[i:]
+        else:
+            i += 1
+
+
+def LegacyRemoveRowsWithAccessions(table: RawPeptideTable,
+                                   accessions: List[str]) -> None:
+    i = 0
+    while i < len(table):
+        for accession in table[i].accessions:
+            if accession in accessions:
+                table.pop(i)
+                break
+        else:
+            i += 1
+
+
+def LegacyRemoveAccessionsListFromTable(table: PeptideTable,
+                                        blackList: List[str]) -> None:
+    i = 0
+    while i < len(table):
+        if table[i].name.split(";")[0] in blackList:
+            table.pop(i)
+            continue
+        i += 1
+
+
+def LegacyApplyConfidenceFilter(table: PeptideTable,
+                                conf: Comparable) -> None:
+    i = 0
+    while i < len(table):
+        if not conf.compare(table[i].confidence, TABLE_NUM):
+            table.pop(i)
+            continue
+        i += 1
+
+
+def LegacyApplyProteinPerTableList(table: PeptideTable,
+                                   proteinAccessions: List[str]) -> None:
+    i = 0
+    while i < len(table):
+        if table[i].name not in proteinAccessions:
+            table.pop(i)
+            continue
+        i += 1
+
+
+def GetAccessionNames() -> List[str]:
+    return [f"P{i:05}" for i in range(ACCESSION_COUNT)]
+
+
+def CreateRawTable(size: int, seed: int = 0) -> RawPeptideTable:
+    """Создаёт RawPeptideTable, в которой примерно каждая десятая строка
+    содержит реверсированный Accession, а последняя десятая часть строк
+    содержит только реверсированные Accession (граница FDR фильтра)"""
+    random = Random(seed)
+    names = GetAccessionNames()
+    table = RawPeptideTable()
+    decoyStart = size - size // 10
+    for i in range(size):
+        if i >= decoyStart:
+            accessions = ["RRRRR" + random.choice(names)]
+        else:
+            accessions = random.sample(names, random.randint(1, 3))
+            if random.random() < 0.1:
+                accessions.append("RRRRR" + random.choice(names))
+        table.append(PeptideRow(
+            accessions,
+            Decimal(random.randint(0, 99)),
+            Decimal(random.randint(0, 5)),
+            Decimal(random.randint(0, 10 ** 6)).scaleb(-2),
+            "K" * random.randint(5, 30),
+        ))
+    return table
+
+
+def CreatePeptideTable(size: int, seed: int = 0) -> PeptideTable:
+    random = Random(seed)
+    names = GetAccessionNames()
+    table = PeptideTable()
+    for _ in range(size):
+        table.append(PeptideAccession(
+            random.choice(names),
+            Decimal(random.randint(0, 99)),
+            Decimal(random.randint(0, 5)),
+            Decimal(random.randint(0, 10 ** 6)).scaleb(-2),
+            "K" * random.randint(5, 30),
+        ))
+    return table
+
+
+def CreatePeptideTables(table: PeptideTable) -> PeptideTables:
+    # Конструктор PeptideTables выбирает репрезентативные Accession из
+    # RawPeptideTables, поэтому таблица добавляется в пустой словарь
+    peptideTables = PeptideTables.__new__(PeptideTables)
+    peptideTables[TABLE_NUM] = table
+    return peptideTables
+
+
+def GetFilters(random: Random) -> Dict[str, Tuple[Callable, Callable,
+                                                   Callable]]:
+    """Получает фильтры вида {
+        "имя": (создание таблицы, фильтр, прежний фильтр)
+    }"""
+    names = GetAccessionNames()
+    blackList = random.sample(names, ACCESSION_COUNT // 100)
+    proteinAccessions = random.sample(names, ACCESSION_COUNT * 9 // 10)
+    conf = Comparable(">=", "20")
+    return {
+        "FDR": (
+            CreateRawTable,
+            lambda table: FDRFilter({TABLE_NUM: table}).ApplyDefaultFilter(),
+            LegacyApplyDefaultFilter,
+        ),
+        "blacklist (raw)": (
+            CreateRawTable,
+            lambda table: table.RemoveRowsWithAccessions(blackList),
+            lambda table: LegacyRemoveRowsWithAccessions(table, blackList),
+        ),
+        "blacklist": (
+            CreatePeptideTable,
+            lambda table: RemoveAccessionsListFromTable(table, blackList),
+            lambda table: LegacyRemoveAccessionsListFromTable(
+                table, blackList),
+        ),
+        "confidence": (
+            CreatePeptideTable,
+            lambda table: ApplyPeptideConfidenceFilter(
+                conf, CreatePeptideTables(table)),
+            lambda table: LegacyApplyConfidenceFilter(table, conf),
+        ),
+        "protein list": (
+            CreatePeptideTable,
+            lambda table: CreatePeptideTables(
+                table).ApplyProteinPerTableList(
+                    {TABLE_NUM: proteinAccessions}),
+            lambda table: LegacyApplyProteinPerTableList(
+                table, proteinAccessions),
+        ),
+    }
+
+
+def Measure(createTable: Callable, applyFilter: Callable,
+            size: int) -> Tuple[float, list]:
+    """Применяет фильтр к новой таблице
+
+    Returns:
+        Время применения фильтра и отфильтрованную таблицу
+    """
+    table = createTable(size)
+    gc.collect()
+    start = perf_counter()
+    applyFilter(table)
+    return perf_counter() - start, table
+
+
+def IsSameTable(first: list, second: list) -> bool:
+    return [row.__dict__ for row in first] == [row.__dict__ for row in second]
+
+
+def main():
+    sizes = (tuple(map(int, argv[1].split(","))) if len(argv) > 1
+             else DEFAULT_SIZES)
+    filters = GetFilters(Random(1))
+    growth: Dict[str, float] = {}
+    for name, (createTable, applyFilter, legacyFilter) in filters.items():
+        print(f"{name}:")
+        perRowTimes = []
+        for size in sizes:
+            elapsed, table = Measure(createTable, applyFilter, size)
+            perRowTimes.append(elapsed / size * 10 ** 6)
+            line = (f"\t{size:>8} rows: {perRowTimes[-1]:.3f} us/row, "
+                    f"{size - len(table)} removed")
+            if size <= LEGACY_MAX_ROWS:
+                legacyElapsed, legacyTable = Measure(
+                    createTable, legacyFilter, size)
+                if not IsSameTable(table, legacyTable):
+                    raise ValueError(
+                        f"{name} filter result differs from legacy filter")
+                line += (f" (legacy {legacyElapsed / size * 10 ** 6:.3f} "
+                         f"us/row, x{legacyElapsed / elapsed:.1f})")
+            del table
+            print(line)
+        growth[name] = perRowTimes[-1] / perRowTimes[0]
+    for name, value in growth.items():
+        if value > MAX_PER_ROW_GROWTH:
+            raise SystemExit(
+                f"{name}: time per row grew x{value:.2f} (more than "
+                f"x{MAX_PER_ROW_GROWTH})")
+
+
+if __name__ == "__main__":
+    main()
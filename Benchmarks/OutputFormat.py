@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Сравнение скорости записи выходных таблиц по полям Accession
+
+Сравниваются прежняя запись (LegacyGenerateTableFileByField: локальный
+контекст и вызов write для каждой ячейки) и Output.GenerateTableFileByField
+(ValueFormatter и сборка строки одним join). Таблицы Presets/exp_long
+считываются и подсчитываются так же, как при обычном запуске, для обоих
+численных представлений (decimal и float). В папке нет базы данных
+последовательностей, поэтому длины последовательностей Accession задаются
+синтетически. Выходные файлы обоих способов должны совпадать побайтно,
+а ускорение — быть не меньше MIN_SPEEDUP, иначе бенчмарк завершается с
+ошибкой.
+
+Запуск:
+    python -m Benchmarks.OutputFormat [папка с таблицами] [количество повторов]
+"""
+from decimal import Decimal, localcontext
+from os import path
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable, Dict
+from zlib import crc32
+from Classes.AccessionMatrix import AccessionMatrix
+from Classes.AccessionTables import AccessionTables
+from Classes.Functions import (
+    CalculateAccessionsNormRatios,
+    GetScPsigAndNormFilesSumm,
+)
+from Classes.Input import Input
+from Classes.Output import Output
+from Classes.PeptideColumns import PeptideColumns
+from Classes.PeptideTables import PeptideTables
+from Classes.RawPeptideTables import RawPeptideTables
+from Classes.Sequence import Sequence
+
+MIN_SPEEDUP = 1.5
+
+# Таблиц Presets/preset_FDRfit слишком мало для устойчивого измерения, а
+# расположение столбцов в таблицах Presets/exp_long отличается от
+# расположения по умолчанию
+DEFAULT_INPUT_DIR = path.join("Presets", "exp_long", "Input")
+PEPTIDE_COLUMNS = PeptideColumns(
+    accession=(6, "Accessions"),
+    sc=(22, "Sc"),
+    precursorSignal=(25, "Intensity (Peptide)"),
+    sequence=(12, "Sequence"),
+    confidence=(11, "Conf"),
+)
+
+
+def LegacyGenerateTableFileByField(
+        output: Output,
+        fieldName: str,
+        filename: str,
+        isAdditionalColumns: bool) -> None:
+    """Прежняя реализация Output.GenerateTableFileByField"""
+    accessionMatrix = output.accessionMatrix
+    with open(output.GetJoinedOutputFilename(filename), 'w') as outFile:
+        outFile.write("Accession")
+        if isAdditionalColumns:
+            outFile.write("\tDescription\tSequence length")
+        outFile.write(
+            ("\t{}" * len(accessionMatrix.tableNums)).format(
+                *accessionMatrix.tableNums))
+        names = accessionMatrix.accessionDictionary.names
+        for accession, values in zip(accessionMatrix.accessionIds,
+                                     accessionMatrix.IterRows(fieldName)):
+            name = names[accession]
+            outFile.write(f"\n{name}")
+            if isAdditionalColumns:
+                outFile.write(f"\t{output.seqDB[name].desc}"
+                              f"\t{output.seqDB[name].len}")
+            for value in values:
+                if value is not None:
+                    if isinstance(value, float):
+                        value = Decimal(repr(value))
+                    with localcontext() as context:
+                        context.prec = max(
+                            1, 7 + Decimal(value).adjusted())
+                        val = str(+value)
+                        if '.' in val and "e" not in val.lower():
+                            val = val.rstrip("0").rstrip(".")
+                        outFile.write("\t{}".format(val))
+                else:
+                    outFile.write('\t')
+
+
+def GetSyntheticSeqDB(names) -> Dict[str, Sequence]:
+    """Создаёт базу данных последовательностей с длинами, зависящими
+    только от имени Accession"""
+    return {
+        name: Sequence(name, seq="K" * (50 + crc32(name.encode()) % 800))
+        for name in names
+    }
+
+
+def CreateAccessionMatrix(inputDir: str,
+                          numericBackend: str) -> AccessionMatrix:
+    rawPeptideTables = RawPeptideTables(PEPTIDE_COLUMNS, inputDir)
+    seqDB = GetSyntheticSeqDB(rawPeptideTables.accessionDictionary.names)
+    accessionTables = AccessionTables(
+        seqDB, PeptideTables(rawPeptideTables, seqDB), numericBackend)
+    accessionMatrix = AccessionMatrix(accessionTables)
+    CalculateAccessionsNormRatios(
+        accessionMatrix, GetScPsigAndNormFilesSumm(accessionMatrix))
+    return accessionMatrix
+
+
+def CreateOutput(accessionMatrix: AccessionMatrix,
+                 outputPath: str) -> Output:
+    # Конструктор Output записывает сразу все выходные файлы, поэтому
+    # атрибуты задаются без вызова конструктора
+    output = Output.__new__(Output)
+    output.inputParams = Input()
+    output.inputParams.outputPath = outputPath
+    output.seqDB = {}
+    output.accessionMatrix = accessionMatrix
+    return output
+
+
+def Measure(generate: Callable, output: Output, repeats: int) -> float:
+    best = None
+    for _ in range(repeats):
+        start = perf_counter()
+        for field, filename, isAdditionalColumns in Output.FIELDS_TO_FILES:
+            generate(output, field, filename, isAdditionalColumns)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def ReadOutputFiles(outputPath: str) -> Dict[str, bytes]:
+    files = {}
+    for _, filename, _ in Output.FIELDS_TO_FILES:
+        with open(path.join(outputPath, filename), 'rb') as inFile:
+            files[filename] = inFile.read()
+    return files
+
+
+def main():
+    inputDir = argv[1] if len(argv) > 1 else DEFAULT_INPUT_DIR
+    repeats = int(argv[2]) if len(argv) > 2 else 5
+    for numericBackend in AccessionTables.NUMERIC_BACKENDS:
+        accessionMatrix = CreateAccessionMatrix(inputDir, numericBackend)
+        print(f"{numericBackend}: {len(accessionMatrix.accessionIds)} "
+              f"accessions, {len(accessionMatrix.tableNums)} tables, "
+              f"best of {repeats}")
+        with TemporaryDirectory() as baseDir, \
+                TemporaryDirectory() as curDir:
+            baseTime = Measure(LegacyGenerateTableFileByField,
+                               CreateOutput(accessionMatrix, baseDir),
+                               repeats)
+            print(f"Legacy writer:                     {baseTime:.3f} s")
+            curTime = Measure(Output.GenerateTableFileByField,
+                              CreateOutput(accessionMatrix, curDir),
+                              repeats)
+            if ReadOutputFiles(baseDir) != ReadOutputFiles(curDir):
+                raise ValueError(
+                    "Output.GenerateTableFileByField result differs from "
+                    "legacy writer")
+            speedup = baseTime / curTime
+            print(f"Output.GenerateTableFileByField:   {curTime:.3f} s "
+                  f"(x{speedup:.2f})")
+            if speedup < MIN_SPEEDUP:
+                raise SystemExit(
+                    f"Speedup x{speedup:.2f} is less than x{MIN_SPEEDUP}")
+
+
+if __name__ == "__main__":
+    main()
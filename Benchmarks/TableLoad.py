@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Сравнение скорости чтения PeptideSummary и ProteinSummary таблиц
+
+Сравниваются:
+    Table.Load — чтение и разбиение на столбцы всего файла (как раньше);
+    LegacyReadMappedColumns — построчное чтение нужных столбцов из
+        отображённого в память файла (mmap.readline) с декодированием
+        только нужных значений;
+    Table.ReadMappedColumns — чтение отображённого в память файла блоками
+        с разбором всех строк блока методами str.
+
+По умолчанию считываются таблицы Presets/preset_FDRfit, в которых столбцы
+расположены так же, как ожидает программа (PeptideColumns и ProteinColumns
+по умолчанию).
+
+Запуск:
+    python -m Benchmarks.TableLoad [папка с таблицами] [количество повторов]
+"""
+from locale import getpreferredencoding
+from mmap import mmap, ACCESS_READ
+from os import listdir, path
+from sys import argv
+from time import perf_counter
+from typing import Callable, List, Tuple
+from Classes.BaseClasses.Table import Table
+from Classes.PeptideColumns import PeptideColumns
+from Classes.ProteinColumns import ProteinColumns
+
+DEFAULT_INPUT_DIR = path.join("Presets", "preset_FDRfit", "Input")
+
+PEPTIDE_COLUMNS = PeptideColumns()
+PROTEIN_COLUMNS = ProteinColumns()
+
+
+class BenchmarkTable(Table):
+    def Load(self, tableFilename: str) -> List[Tuple[str, ...]]:
+        return super().Load(tableFilename)
+
+
+def LoadWholeTable(filename: str, columns) -> List[Tuple[str, ...]]:
+    table = BenchmarkTable(filename, unsafeFlag=True)
+    columns.TestColumnNames(table.pop(0))
+    positions = columns.GetPositions()
+    return [tuple(line[position] for position in positions)
+            for line in table]
+
+
+def LoadMappedColumns(filename: str, columns) -> List[Tuple[str, ...]]:
+    return list(BenchmarkTable(unsafeFlag=True).ReadMappedColumns(
+        filename, columns))
+
+
+def LegacyReadMappedColumns(filename: str,
+                            columns) -> List[Tuple[str, ...]]:
+    """Прежняя реализация Table.ReadMappedColumns (без проверки длины
+    строк и условия остановки)"""
+    encoding = getpreferredencoding(False)
+    positions = columns.GetPositions()
+    maxSplit = max(positions) + 1
+    rows = []
+    with open(filename, "rb") as inFile, mmap(
+            inFile.fileno(), 0, access=ACCESS_READ) as mappedFile:
+        lines = iter(mappedFile.readline, b"")
+        header = b""
+        for header in lines:
+            header = header.rstrip(b"\r\n")
+            if len(header):
+                break
+        columns.TestColumnNames(header.decode(encoding).split("\t"))
+        for line in lines:
+            line = line.rstrip(b"\r\n")
+            if not len(line):
+                continue
+            values = line.split(b"\t", maxSplit)
+            rows.append(tuple(values[position].decode(encoding)
+                              for position in positions))
+    return rows
+
+
+def GetTableFiles(inputDir: str):
+    files = []
+    for filename in sorted(listdir(inputDir)):
+        if "Peptide" in filename:
+            files.append((path.join(inputDir, filename), PEPTIDE_COLUMNS))
+        elif filename.endswith("ProteinSummary.txt"):
+            files.append((path.join(inputDir, filename), PROTEIN_COLUMNS))
+    return files
+
+
+def Measure(loader: Callable, files, repeats: int):
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = perf_counter()
+        result = [loader(filename, columns) for filename, columns in files]
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    inputDir = argv[1] if len(argv) > 1 else DEFAULT_INPUT_DIR
+    repeats = int(argv[2]) if len(argv) > 2 else 5
+    files = GetTableFiles(inputDir)
+    size = sum(path.getsize(filename) for filename, _ in files)
+    print(f"{len(files)} files, {size / 1024 / 1024:.1f} MiB, "
+          f"best of {repeats}")
+
+    baseTime, baseResult = Measure(LoadWholeTable, files, repeats)
+    print(f"{'Table.Load:':25}{baseTime:.3f} s")
+    for name, loader in (("LegacyReadMappedColumns", LegacyReadMappedColumns),
+                         ("Table.ReadMappedColumns", LoadMappedColumns)):
+        curTime, curResult = Measure(loader, files, repeats)
+        if curResult != baseResult:
+            raise ValueError(f"{name} result differs from Table.Load")
+        print(f"{name + ':':25}{curTime:.3f} s (x{baseTime / curTime:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Сравнение памяти, занимаемой Peptide таблицами
+
+Сравниваются RawPeptideTable/PeptideTable (списки объектов строк) и
+ArrayRawPeptideTable/ArrayPeptideTable (столбцы в массивах). Память
+измеряется с помощью tracemalloc и приводится в байтах на строку.
+
+Запуск:
+    python -m Benchmarks.TableMemory [папка с таблицами]
+"""
+import tracemalloc
+from os import listdir, path
+from sys import argv
+from time import perf_counter
+from typing import Callable, List
+from Classes.ArrayRawPeptideTable import ArrayRawPeptideTable
+from Classes.RawPeptideTable import RawPeptideTable
+from .TableLoad import DEFAULT_INPUT_DIR, PEPTIDE_COLUMNS
+
+
+def GetPeptideFiles(inputDir: str) -> List[str]:
+    return [path.join(inputDir, filename)
+            for filename in sorted(listdir(inputDir))
+            if "Peptide" in filename]
+
+
+def Measure(tableType: Callable, files: List[str]):
+    """Считывает все таблицы и создаёт для них Peptide таблицы
+
+    Returns:
+        Количество строк, время и память в байтах, занимаемую Raw таблицами
+        и Peptide таблицами
+    """
+    tracemalloc.start()
+    start = perf_counter()
+    rawTables = [tableType(filename, unsafeFlag=True,
+                           columns=PEPTIDE_COLUMNS)
+                 for filename in files]
+    elapsed = perf_counter() - start
+    rawMemory = tracemalloc.get_traced_memory()[0]
+    peptideTables = []
+    for rawTable in rawTables:
+        peptideTable = rawTable.CreatePeptideTable()
+        for row, accessionIds in zip(rawTable, rawTable.IterAccessionIds()):
+            peptideTable.AppendRow(row, accessionIds[0])
+        peptideTables.append(peptideTable)
+    peptideMemory = tracemalloc.get_traced_memory()[0] - rawMemory
+    tracemalloc.stop()
+    rowsCount = sum(len(rawTable) for rawTable in rawTables)
+    return rowsCount, elapsed, rawMemory, peptideMemory
+
+
+def main():
+    inputDir = argv[1] if len(argv) > 1 else DEFAULT_INPUT_DIR
+    files = GetPeptideFiles(inputDir)
+    results = {}
+    for name, tableType in (("RawPeptideTable", RawPeptideTable),
+                            ("ArrayRawPeptideTable", ArrayRawPeptideTable)):
+        rowsCount, elapsed, rawMemory, peptideMemory = Measure(
+            tableType, files)
+        results[name] = (rawMemory + peptideMemory) / rowsCount
+        print(f"{name + ':':22} {rowsCount} rows, read {elapsed:.3f} s, "
+              f"raw {rawMemory / rowsCount:.0f} B/row, "
+              f"peptide {peptideMemory / rowsCount:.0f} B/row")
+    ratio = results["RawPeptideTable"] / results["ArrayRawPeptideTable"]
+    print(f"Memory ratio: x{ratio:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+from typing import Dict, Mapping, Set
+from .AccessionDictionary import AccessionDictionary
+from .Sequence import Sequence
+
+
+class AccessionCatalog:
+    """Каталог различных Accession считанных Peptide таблиц
+
+    Заполняется при обработке строк таблиц (см. RowPipeline): для каждой
+    таблицы хранится количество появлений каждого Accession, а количество
+    во всех таблицах суммируется при добавлении таблицы. Наличие в базе
+    данных последовательностей и длины последовательностей находятся один
+    раз для каждого различного Accession, а не для каждого появления.
+
+    Attributes:
+        accessionDictionary: словарь кодов Accession
+        tableCounts: словарь вида {
+                "номер таблицы": {код Accession: количество появлений}
+            }
+        generalCounts: словарь вида {
+                код Accession: количество появлений во всех таблицах
+            }
+        lengths: словарь вида {код Accession: длина последовательности}
+            для найденных в базе данных Accession
+        notFoundAccessions: Accession, отсутствующие в базе данных
+            последовательностей
+    """
+
+    accessionDictionary: AccessionDictionary
+    tableCounts: Dict[str, Dict[int, int]]
+    generalCounts: Dict[int, int]
+    lengths: Dict[int, int]
+    notFoundAccessions: Set[str]
+
+    def __init__(self, accessionDictionary: AccessionDictionary) -> None:
+        """
+        Args:
+            accessionDictionary: словарь кодов Accession
+        """
+        self.accessionDictionary = accessionDictionary
+        self.tableCounts = {}
+        self.generalCounts = {}
+        self.lengths = {}
+        self.notFoundAccessions = set()
+
+    def AddTable(self, tableNum: str, counts: Dict[int, int]) -> None:
+        """Добавляет количество появлений Accession в таблице
+
+        Args:
+            tableNum: номер таблицы
+            counts: словарь вида {код Accession: количество появлений}
+        """
+        self.tableCounts[tableNum] = counts
+        generalCounts = self.generalCounts
+        get = generalCounts.get
+        for accessionId, count in counts.items():
+            generalCounts[accessionId] = get(accessionId, 0) + count
+
+    def ResolveSequences(self, seqDB: Mapping[str, Sequence]) -> Set[str]:
+        """Находит длины последовательностей Accession, которые ещё не
+        искались в базе данных. Отсутствующие Accession добавляются в
+        notFoundAccessions
+
+        Args:
+            seqDB: база данных последовательностей Accession
+
+        Returns:
+            Множество всех отсутствующих в seqDB Accession каталога
+        """
+        names = self.accessionDictionary.names
+        lengths = self.lengths
+        for accessionId in self.generalCounts.keys() - lengths.keys():
+            name = names[accessionId]
+            if name in self.notFoundAccessions:
+                continue
+            # dict.get не вызывает SequenceDatabase.__getitem__, который
+            # вызывает исключение для отсутствующих Accession
+            sequence = seqDB.get(name)
+            if sequence is None:
+                self.notFoundAccessions.add(name)
+            else:
+                lengths[accessionId] = sequence.len
+        return self.notFoundAccessions
@@ -0,0 +1,96 @@
+from typing import Any, Dict, Iterable, List
+
+
+class AccessionDictionary:
+    """Сопоставляет именам Accession плотные целочисленные коды
+
+    Коды выдаются по порядку начиная с 0 при первом обращении к имени.
+    Словарь создаётся при считывании таблиц (см. RawPeptideTables) и общий
+    для всех таблиц, поэтому при обработке Accession'ы сравниваются и
+    используются как ключи словарей в виде кодов, а имена нужны только при
+    выводе. Каждое имя хранится в единственном экземпляре.
+
+    Attributes:
+        names: имена Accession, где индекс — код Accession
+        ids: словарь вида {"Имя Accession": код}
+    """
+
+    names: List[str]
+    ids: Dict[str, int]
+
+    def __init__(self) -> None:
+        self.names = []
+        self.ids = {}
+
+    def GetId(self, name: str) -> int:
+        """Получает код Accession, добавляя имя в словарь при необходимости
+
+        Args:
+            name: имя Accession
+
+        Returns:
+            Код Accession
+        """
+        accessionId = self.ids.get(name)
+        if accessionId is None:
+            accessionId = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return accessionId
+
+    def GetName(self, accessionId: int) -> str:
+        return self.names[accessionId]
+
+    def Intern(self, name: str) -> str:
+        """Получает единственный экземпляр строки с именем Accession
+
+        Args:
+            name: имя Accession
+
+        Returns:
+            Строка из names, равная name
+        """
+        return self.names[self.GetId(name)]
+
+    def SortByNames(self, accessionIds: Iterable[int]) -> List[int]:
+        """Сортирует коды Accession по именам
+
+        Args:
+            accessionIds: коды Accession
+
+        Returns:
+            Список кодов, упорядоченный по именам Accession
+        """
+        return sorted(accessionIds, key=self.names.__getitem__)
+
+    def KeysToNames(self, values: Dict[int, Any]) -> Dict[str, Any]:
+        """Заменяет коды Accession в ключах словаря на имена
+
+        Используется для передачи данных между процессами, у каждого из
+        которых свой словарь кодов.
+
+        Args:
+            values: словарь вида {код Accession: значение}
+
+        Returns:
+            Словарь вида {"Имя Accession": значение}
+        """
+        names = self.names
+        return {names[key]: value for key, value in values.items()}
+
+    def KeysToIds(self, values: Dict[str, Any]) -> Dict[int, Any]:
+        """Заменяет имена Accession в ключах словаря на коды
+
+        Args:
+            values: словарь вида {"Имя Accession": значение}
+
+        Returns:
+            Словарь вида {код Accession: значение}
+        """
+        getId = self.GetId
+        return {getId(key): value for key, value in values.items()}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def __len__(self) -> int:
+        return len(self.names)
@@ -0,0 +1,131 @@
+import re
+from typing import (Dict, FrozenSet, Iterable, List, Optional, Pattern,
+                    Sequence)
+from .AccessionDictionary import AccessionDictionary
+from .TableFilter import CompactTable
+
+
+class AccessionExclusionList:
+    """Чёрный список Accession (ID exclusion list)
+
+    Каждая непустая строка файла чёрного списка — правило:
+        ИМЯ — Accession с таким именем
+        ПРЕФИКС* — Accession, имена которых начинаются с ПРЕФИКС
+        /ВЫРАЖЕНИЕ/ — Accession, имена которых целиком совпадают с
+            регулярным выражением (без ссылок на группы по номеру)
+
+    Имена проверяются по множеству, а префиксы и регулярные выражения
+    объединяются в одно регулярное выражение, поэтому проверка одного имени
+    не зависит от количества правил. Каждое имя из словаря кодов Accession
+    проверяется один раз (см. GetExcludedIds).
+
+    Attributes:
+        accessions: имена Accession из правил-имён
+        rules: правила-префиксы и регулярные выражения в порядке файла
+    """
+
+    accessions: FrozenSet[str]
+    rules: List[str]
+    __pattern: Optional[Pattern]
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        """
+        Args:
+            lines: строки файла чёрного списка
+        """
+        accessions = []
+        self.rules = []
+        expressions = []
+        for line in lines:
+            line = line.strip()
+            if not len(line):
+                continue
+            if len(line) > 2 and line.startswith("/") and line.endswith("/"):
+                expression = line[1:-1]
+                try:
+                    re.compile(expression)
+                except re.error as error:
+                    raise ValueError(
+                        f"Invalid ID exclusion rule: {line}") from error
+            elif len(line) > 1 and line.endswith("*"):
+                expression = re.escape(line[:-1]) + ".*"
+            else:
+                accessions.append(line)
+                continue
+            expressions.append(
+                f"(?P<_rule{len(self.rules)}>{expression})")
+            self.rules.append(line)
+        self.accessions = frozenset(accessions)
+        self.__pattern = (
+            re.compile("|".join(expressions)) if len(expressions) else None
+        )
+
+    def Match(self, accession: str) -> Optional[str]:
+        """Находит правило, под которое попадает Accession
+
+        Args:
+            accession: имя Accession
+
+        Returns:
+            Правило (для правил-имён — имя Accession) или None, если
+            Accession не в чёрном списке
+        """
+        if accession in self.accessions:
+            return accession
+        if self.__pattern is not None:
+            match = self.__pattern.fullmatch(accession)
+            if match is not None:
+                return self.rules[int(match.lastgroup[len("_rule"):])]
+        return None
+
+    def GetExcludedIds(
+        self, accessionDictionary: AccessionDictionary
+    ) -> Dict[int, str]:
+        """Проверяет все Accession из словаря кодов
+
+        Args:
+            accessionDictionary: словарь кодов Accession
+
+        Returns:
+            Словарь вида {код Accession: правило} для Accession из чёрного
+            списка
+        """
+        excludedIds: Dict[int, str] = {}
+        for accessionId, accession in enumerate(accessionDictionary.names):
+            rule = self.Match(accession)
+            if rule is not None:
+                excludedIds[accessionId] = rule
+        return excludedIds
+
+    @staticmethod
+    def RemoveExcludedRows(
+        table: Sequence, excludedIds: Dict[int, str]
+    ) -> Dict[str, int]:
+        """Удаляет из таблицы строки, содержащие хотя бы один Accession из
+        чёрного списка
+
+        Args:
+            table: RawPeptideTable или ArrayRawPeptideTable
+            excludedIds: словарь, полученный GetExcludedIds
+
+        Returns:
+            Количество удалённых строк по правилам вида {правило: количество}.
+            Строка учитывается в правиле её первого Accession из чёрного
+            списка
+        """
+        keep = []
+        removedCounts: Dict[str, int] = {}
+        isdisjoint = excludedIds.keys().isdisjoint
+        for accessionIds in table.IterAccessionIds():
+            if isdisjoint(accessionIds):
+                keep.append(True)
+                continue
+            keep.append(False)
+            rule = next(
+                excludedIds[accessionId]
+                for accessionId in accessionIds
+                if accessionId in excludedIds
+            )
+            removedCounts[rule] = removedCounts.get(rule, 0) + 1
+        CompactTable(table, keep)
+        return removedCounts
@@ -0,0 +1,215 @@
+from decimal import Decimal
+from functools import reduce
+from itertools import accumulate, compress
+from operator import add, attrgetter
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+from .AccessionDictionary import AccessionDictionary
+from .AccessionTables import AccessionTables
+from .FDRCutoff import FDRCutoff
+
+
+class AccessionMatrix:
+    """Матрица значений Accession по таблицам
+
+    Строки матрицы — Accession, упорядоченные по именам, столбцы — таблицы
+    в порядке номеров (sortedTableNums). Для каждого поля Accession хранится
+    отдельная плоскость: список столбцов, в каждом из которых значение поля
+    для каждой строки или None, если Accession нет в таблице. Суммы по
+    таблицам считаются по столбцам, а выходные файлы записываются по
+    строкам, без обхода словарей Accession каждой таблицы. Столбцы таблиц,
+    подсчитанных в этом процессе, заполняются из списков значений, в которые
+    AccessionTables их подсчитал (см. AccessionTables.GetTableColumns).
+
+    Порядок строк таблицы, в котором были подсчитаны её Accession
+    (см. AccessionTables), сохраняется в tableRows: суммы по столбцу
+    считаются в этом порядке, поэтому совпадают с суммами по словарю
+    Accession таблицы до последнего знака.
+
+    Attributes:
+        accessionDictionary: словарь кодов Accession
+        tableNums: номера таблиц (столбцов) по возрастанию
+        accessionIds: коды Accession строк, упорядоченные по именам
+        tableRows: номера строк Accession каждой таблицы в порядке таблицы
+        planes: словарь вида {
+                "поле Accession": [[значение строки или None] для таблицы]
+            }
+        zero: ноль того же типа, что и значения (AccessionTables.zero)
+        fdrCutoffs: границы глобального FDR фильтра для каждой таблицы или
+            None, если применялся default FDR фильтр
+    """
+
+    # Поля Accession, которые переносятся из AccessionTables. Плоскости
+    # ScNormToFileNormRatio и PSignalNormToFileNormRatio заполняются
+    # SetRatios
+    FIELDS: Tuple[str, ...] = (
+        "Counts",
+        "SeqlenSumm",
+        "ScSumm",
+        "PSignalSumm",
+        "ScNorm",
+        "PSignalNorm",
+    )
+
+    accessionDictionary: AccessionDictionary
+    tableNums: List[str]
+    accessionIds: List[int]
+    tableRows: List[List[int]]
+    planes: Dict[str, List[List[Any]]]
+    zero: Union[Decimal, float]
+    fdrCutoffs: Optional[Dict[str, FDRCutoff]]
+
+    def __init__(self, accessionTables: AccessionTables) -> None:
+        """
+        Args:
+            accessionTables: посчитанные AccessionTables
+        """
+        self.accessionDictionary = accessionTables.accessionDictionary
+        self.tableNums = sorted(accessionTables, key=lambda x: float(x))
+        self.zero = accessionTables.zero
+        self.fdrCutoffs = accessionTables.fdrCutoffs
+        accessionIds: Set[int] = set()
+        for table in accessionTables.values():
+            accessionIds.update(table)
+        self.accessionIds = self.accessionDictionary.SortByNames(
+            accessionIds)
+        rowOf = {
+            accessionId: row
+            for row, accessionId in enumerate(self.accessionIds)
+        }
+        rowRange = range(len(self.accessionIds))
+        self.tableRows = []
+        self.planes = {fieldName: [] for fieldName in self.FIELDS}
+        for tableNum in self.tableNums:
+            tableColumns = accessionTables.GetTableColumns(tableNum)
+            if tableColumns is not None:
+                # Значения берутся из списков, в которые они были
+                # подсчитаны, без обхода объектов Accession
+                uniqueIds, columns = tableColumns
+            else:
+                table = accessionTables[tableNum]
+                uniqueIds = list(table)
+                accessions = list(table.values())
+                columns = {
+                    fieldName: list(map(attrgetter(fieldName), accessions))
+                    for fieldName in self.FIELDS
+                }
+            rows = list(map(rowOf.__getitem__, uniqueIds))
+            self.tableRows.append(rows)
+            for fieldName, plane in self.planes.items():
+                # Столбец заполняется по словарю {строка: значение} без
+                # цикла по строкам в Python
+                plane.append(list(map(
+                    dict(zip(rows, columns[fieldName])).get, rowRange)))
+
+    def GetColumnValues(
+        self, fieldName: str, column: int
+    ) -> Iterator[Any]:
+        """Получает значения поля Accession таблицы в порядке таблицы
+
+        Args:
+            fieldName: имя поля Accession
+            column: номер столбца (индекс в tableNums)
+
+        Returns:
+            Значения поля для Accession таблицы
+        """
+        return map(self.planes[fieldName][column].__getitem__,
+                   self.tableRows[column])
+
+    def GetColumnSums(self, fieldName: str) -> List[Any]:
+        """Суммирует значения поля по каждому столбцу
+
+        Значения складываются последовательно, начиная с zero, в порядке
+        таблицы, как при сложении по словарю Accession таблицы
+
+        Args:
+            fieldName: имя поля Accession
+
+        Returns:
+            Сумма для каждого столбца
+        """
+        return [
+            reduce(add, self.GetColumnValues(fieldName, column), self.zero)
+            for column in range(len(self.tableNums))
+        ]
+
+    def SetRatios(
+        self, fieldName: str, sourceFieldName: str, columnSums: List[Any]
+    ) -> None:
+        """Заполняет плоскость отношений значений к суммам столбцов
+
+        Если сумма столбца равна 0, отношения в нём равны zero
+
+        Args:
+            fieldName: имя заполняемого поля Accession
+            sourceFieldName: имя поля, значения которого делятся на суммы
+            columnSums: сумма для каждого столбца
+        """
+        zero = self.zero
+        self.planes[fieldName] = [
+            [
+                None if value is None
+                else (value / columnSum if columnSum != 0 else zero)
+                for value in sourceColumn
+            ]
+            for sourceColumn, columnSum in zip(
+                self.planes[sourceFieldName], columnSums)
+        ]
+
+    def GetColumn(self, tableNum: str, fieldName: str) -> Dict[int, Any]:
+        """Получает значения поля Accession одной таблицы
+
+        Args:
+            tableNum: номер таблицы
+            fieldName: имя поля Accession
+
+        Returns:
+            Словарь вида {код Accession: значение} для Accession таблицы
+        """
+        column = self.tableNums.index(tableNum)
+        return dict(zip(
+            map(self.accessionIds.__getitem__, self.tableRows[column]),
+            self.GetColumnValues(fieldName, column),
+        ))
+
+    def GetTableRows(self) -> Dict[str, List[int]]:
+        """Получает номера строк Accession каждой таблицы
+
+        Returns:
+            Словарь вида {"Номер таблицы": [номера строк]}
+        """
+        return dict(zip(self.tableNums, self.tableRows))
+
+    def IterRows(self, fieldName: str) -> Iterator[Tuple[Any, ...]]:
+        """Получает строки плоскости поля
+
+        Args:
+            fieldName: имя поля Accession
+
+        Returns:
+            Для каждой строки кортеж значений по столбцам (None, если
+            Accession нет в таблице)
+        """
+        plane = self.planes[fieldName]
+        if not plane:
+            return iter([()] * len(self.accessionIds))
+        return zip(*plane)
+
+    def KeepRows(self, rows: Set[int]) -> None:
+        """Оставляет только строки из множества
+
+        Args:
+            rows: номера оставляемых строк
+        """
+        keep = [row in rows for row in range(len(self.accessionIds))]
+        if all(keep):
+            return
+        # Новый номер каждой оставляемой строки
+        newRows = [row - 1 for row in accumulate(keep)]
+        self.accessionIds = list(compress(self.accessionIds, keep))
+        self.tableRows = [
+            [newRows[row] for row in tableRows if keep[row]]
+            for tableRows in self.tableRows
+        ]
+        for plane in self.planes.values():
+            plane[:] = [list(compress(column, keep)) for column in plane]
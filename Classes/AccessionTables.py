@@ -1,9 +1,16 @@
-from typing import Dict, List
+from decimal import Decimal
+from operator import attrgetter, truediv
+from typing import (Any, Dict, Iterable, List, Optional, Sequence as Seq,
+                    Tuple, Union)
 from .Accession import Accession
+from .AccessionDictionary import AccessionDictionary
+from .ArrayPeptideTable import ArrayPeptideTable
+from .FDRCutoff import FDRCutoff
+from .FixedPoint import GetKeySums, ScaleCoefficients
+from .FloatColumns import GroupFloatSums, ToFloats
 from .Sequence import Sequence
 from .PeptideTables import PeptideTables
 from .PeptideTable import PeptideTable
-from decimal import Decimal
 
 
 class AccessionTables(dict):
@@ -13,25 +20,64 @@ class AccessionTables(dict):
     Словарь, хранящий Accession'ы, распределённые по таблицам.
     Имеет вид: {
         "Номер таблицы": {
-            "Имя Accession": Accession
+            код Accession: Accession
         }
     }
 
+    Имена Accession по кодам хранятся в accessionDictionary, а также в поле
+    name каждого Accession. Для нормализации, фильтра по группам и вывода
+    таблицы переводятся в AccessionMatrix.
+
     Args:
-        sortedTableNums: отсортированный список номеров таблиц
+        accessionDictionary: словарь кодов Accession
+        numericBackend: "decimal", если значения Accession — Decimal, или
+            "float", если float (см. FloatColumns)
+        referenceTables: таблицы выборки, посчитанные в Decimal, для
+            проверки подсчёта в float (см. NumericVerification) или None
+        fdrCutoffs: границы глобального FDR фильтра для каждой таблицы или
+            None, если применялся default FDR фильтр
+        tableColumns: значения полей Accession таблиц, подсчитанных
+            GetAccessionsPerTable, по слотам (см. GetTableColumns)
     """
-    sortedTableNums: List[str]
+    NUMERIC_BACKENDS = ("decimal", "float")
+
+    accessionDictionary: AccessionDictionary
+    numericBackend: str
+    referenceTables: Optional['AccessionTables'] = None
+    fdrCutoffs: Optional[Dict[str, FDRCutoff]] = None
+    tableColumns: Dict[
+        str, Tuple[Dict[int, Accession], List[int], Dict[str, List[Any]]]]
 
     def __init__(self,
                  seqDB: Dict[str, Sequence],
-                 peptideTables: PeptideTables) -> None:
+                 peptideTables: Optional[PeptideTables],
+                 numericBackend: str = "decimal",
+                 tableNums: Optional[Iterable[str]] = None) -> None:
         """См. GetAccessionsPerTable
+
+        Если peptideTables равно None, создаётся пустой словарь, который
+        заполняется таблицами, подсчитанными отдельно (см. ImportTable)
         """
-        self.GetAccessionsPerTable(seqDB, peptideTables)
+        if numericBackend not in self.NUMERIC_BACKENDS:
+            raise ValueError(f"Unknown numeric backend: {numericBackend}")
+        self.numericBackend = numericBackend
+        self.tableColumns = {}
+        if peptideTables is not None:
+            self.accessionDictionary = peptideTables.accessionDictionary
+            self.GetAccessionsPerTable(seqDB, peptideTables, tableNums)
+        else:
+            self.accessionDictionary = AccessionDictionary()
+
+    @property
+    def zero(self) -> Union[Decimal, float]:
+        """Ноль того же типа, что и значения Accession"""
+        return 0.0 if self.numericBackend == "float" else Decimal(0)
 
-    def GetAccessionsPerTable(self,
-                              seqDB: Dict[str, Sequence],
-                              peptideTables: PeptideTables) -> None:
+    def GetAccessionsPerTable(
+            self,
+            seqDB: Dict[str, Sequence],
+            peptideTables: PeptideTables,
+            tableNums: Optional[Iterable[str]] = None) -> None:
         """Конвертирует PeptideTables в AccessionTables и подсчитывает
         нормализованные значения для каждого Accession
 
@@ -44,100 +90,380 @@ class AccessionTables(dict):
         Args:
             seqDB: словарь с последовательностями, считанными из БД, вида: {
                     "Имя Accession": Sequence
-                }
+                }. Длины последовательностей берутся из каталога Accession
+                peptideTables.accessionCatalog, а из seqDB — только длины
+                отсутствующих в каталоге Accession
             peptideTables: класс PeptideTables, который будет конвертирован в
                 AccessionTables
+            tableNums: номера конвертируемых таблиц, если нужно
+                конвертировать не все таблицы
         """
 
         self.clear()
+        self.tableColumns.clear()
+        lengths = peptideTables.accessionCatalog.lengths
         for tableNum, peptideTable in peptideTables.items():
-            self[tableNum] = self._GetAccessionsFromTable(peptideTable)
-            self._CalculateNormParamsForAccessions(self[tableNum], seqDB)
+            if tableNums is not None and tableNum not in tableNums:
+                continue
+            if self.numericBackend == "float":
+                uniqueIds, columns = self._GetTableColumnsAsFloat(
+                    peptideTable, seqDB, lengths)
+            else:
+                uniqueIds, columns = self._GetTableColumns(
+                    peptideTable, seqDB, lengths)
+            self[tableNum] = self._CreateAccessions(uniqueIds, columns)
+            self.tableColumns[tableNum] = (
+                self[tableNum], uniqueIds, columns)
+
+    def GetTableColumns(
+            self, tableNum: str
+    ) -> Optional[Tuple[List[int], Dict[str, List[Any]]]]:
+        """Получает значения полей Accession таблицы в том виде, в котором
+        они были подсчитаны
+
+        По этим спискам AccessionMatrix заполняет свои плоскости напрямую,
+        без обхода объектов Accession. Таблицы, добавленные ImportTable
+        (подсчитанные в другом процессе) или заменённые после подсчёта,
+        таких списков не имеют.
+
+        Args:
+            tableNum: номер таблицы
+
+        Returns:
+            Коды Accession таблицы по слотам и словарь вида {
+                "поле Accession": [значение для слота]
+            } или None, если для таблицы их нет
+        """
+        recorded = self.tableColumns.get(tableNum)
+        if recorded is None or recorded[0] is not self.get(tableNum):
+            return None
+        return recorded[1], recorded[2]
 
-    def _GetAccessionsFromTable(
+    def _GetTableColumns(
             self,
-            peptideTable: PeptideTable) -> Dict[str, Accession]:
-        """Конвертирует PeptideTables в AccessionTables
+            peptideTable: Union[PeptideTable, ArrayPeptideTable],
+            seqDB: Dict[str, Sequence],
+            lengths: Dict[int, int]
+    ) -> Tuple[List[int], Dict[str, List[Any]]]:
+        """Подсчитывает значения полей Accession таблицы
 
         Получает суммы значений Sc, Precursor Signal и сумму длинн
         последовательностей и подсчитывает количество строк с Accession для
-        каждого Accession
+        каждого Accession. Для ArrayPeptideTable суммы Sc и Precursor
+        Signal считаются в целых числах по коэффициентам DecimalArray
+        (см. FixedPoint), если это не меняет результат, иначе сложением
+        Decimal (см. _GetTableColumnsInDecimal)
 
         Args:
-            peptideTables: класс PeptideTables, который будет конвертирован в
-                AccessionTables
+            peptideTable: конвертируемая таблица
+            seqDB: база данных последовательностей Accession
+            lengths: длины последовательностей по кодам Accession
+                (см. _GetSequenceLengths)
 
         Returns:
-            Словарь с Accession'ами вида: {
-                "Имя Accession": Accession
-            }
+            Коды Accession таблицы по слотам (см. _GetSlots) и значения полей
+            по слотам (см. _GetColumns)
         """
-        accessions: Dict[str, Accession] = {}
-        i = 0
-        while i < len(peptideTable):
-            curAccession = peptideTable[i].name
-            if curAccession not in accessions:
-                accessions[curAccession] = Accession(name=curAccession)
-            accessions[curAccession].Counts += 1
-            accessions[curAccession].ScSumm += Decimal(peptideTable[i].sc)
-            accessions[curAccession].PSignalSumm += (
-                Decimal(peptideTable[i].precursorSignal) if
-                peptideTable[i].precursorSignal != '' else Decimal(0))
-            accessions[curAccession].SeqlenSumm += len(
-                peptideTable[i].sequence)
-            i += 1
-        return accessions
-
-    def _CalculateNormParamsForAccessions(
+        if not isinstance(peptideTable, ArrayPeptideTable):
+            return self._GetTableColumnsInDecimal(
+                peptideTable, seqDB, lengths)
+        scValues = ScaleCoefficients(peptideTable.sc)
+        pSignalValues = ScaleCoefficients(peptideTable.precursorSignal)
+        if scValues is None or pSignalValues is None:
+            return self._GetTableColumnsInDecimal(
+                peptideTable, seqDB, lengths)
+
+        uniqueIds, slots = self._GetSlots(peptideTable.names)
+        counts, seqlenSumms, scTotals, pSignalTotals = self._SumByAccession(
+            slots,
+            len(uniqueIds),
+            peptideTable.sequenceLengths,
+            scValues[0],
+            pSignalValues[0],
+            0)
+        return uniqueIds, self._GetColumns(
+            counts,
+            seqlenSumms,
+            GetKeySums(slots, peptideTable.sc.exponents, scTotals,
+                       scValues[1]),
+            GetKeySums(slots, peptideTable.precursorSignal.exponents,
+                       pSignalTotals, pSignalValues[1]),
+            self._GetSequenceLengths(uniqueIds, seqDB, lengths))
+
+    def _GetTableColumnsAsFloat(
             self,
-            accessions: Dict[str, Accession],
-            seqDB: Dict[str, Sequence]) -> None:
-        """Подсчитывает нормализованные параметры Sc и Psignal для всех
-        Accession'ов из словаря accessions
+            peptideTable: Union[PeptideTable, ArrayPeptideTable],
+            seqDB: Dict[str, Sequence],
+            lengths: Dict[int, int]
+    ) -> Tuple[List[int], Dict[str, List[Any]]]:
+        """То же, что _GetTableColumns, но суммы Sc и Precursor
+        Signal считаются в float (см. FloatColumns)"""
+        uniqueIds, slots = self._GetSlots(peptideTable.IterAccessionIds())
+        if isinstance(peptideTable, ArrayPeptideTable):
+            scValues = ToFloats(peptideTable.sc)
+            pSignalValues = ToFloats(peptideTable.precursorSignal)
+            sequenceLengths: Iterable[int] = peptideTable.sequenceLengths
+        else:
+            scColumn, pSignalColumn, sequenceLengths = self._GetRowColumns(
+                peptideTable)
+            scValues = list(map(float, scColumn))
+            pSignalValues = list(map(float, pSignalColumn))
+        counts, seqlenSumms, _, _ = self._SumByAccession(
+            slots, len(uniqueIds), sequenceLengths)
+        return uniqueIds, self._GetColumns(
+            counts,
+            seqlenSumms,
+            GroupFloatSums(slots, scValues),
+            GroupFloatSums(slots, pSignalValues),
+            self._GetSequenceLengths(uniqueIds, seqDB, lengths))
 
-        Этот метод не заполняет поля ScNormToFileNormRatio,
-        PSignalNormToFileNormRatio и PSignalAndScNormRatiosAverage!!!
+    def _GetTableColumnsInDecimal(
+            self,
+            peptideTable: Union[PeptideTable, ArrayPeptideTable],
+            seqDB: Dict[str, Sequence],
+            lengths: Dict[int, int]
+    ) -> Tuple[List[int], Dict[str, List[Any]]]:
+        """То же, что _GetTableColumns, но суммы Sc и Precursor
+        Signal считаются последовательным сложением Decimal"""
+        uniqueIds, slots = self._GetSlots(peptideTable.IterAccessionIds())
+        if isinstance(peptideTable, ArrayPeptideTable):
+            scValues: Iterable[Decimal] = peptideTable.sc
+            pSignalValues: Iterable[Decimal] = peptideTable.precursorSignal
+            sequenceLengths: Iterable[int] = peptideTable.sequenceLengths
+        else:
+            scValues, pSignalValues, sequenceLengths = self._GetRowColumns(
+                peptideTable)
+        counts, seqlenSumms, scSumms, pSignalSumms = self._SumByAccession(
+            slots, len(uniqueIds), sequenceLengths, scValues, pSignalValues,
+            Decimal(0))
+        return uniqueIds, self._GetColumns(
+            counts,
+            seqlenSumms,
+            scSumms,
+            pSignalSumms,
+            self._GetSequenceLengths(uniqueIds, seqDB, lengths))
+
+    @staticmethod
+    def _GetRowColumns(
+            peptideTable: PeptideTable
+    ) -> Tuple[Iterable[Decimal], Iterable[Decimal], Iterable[int]]:
+        """Получает столбцы Sc, Precursor Signal и длин последовательностей
+        из строк таблицы
+
+        Returns:
+            Итераторы значений Sc, Precursor Signal и длин
+            последовательностей строк
+        """
+        return (
+            map(attrgetter("sc"), peptideTable),
+            map(attrgetter("precursorSignal"), peptideTable),
+            # Длина считается так же, как PeptideAccession.sequenceLength,
+            # но без вызова свойства для каждой строки
+            map(len, map(attrgetter("sequence"), peptideTable)),
+        )
+
+    @staticmethod
+    def _GetSlots(accessionIds: Iterable[int]) -> Tuple[List[int], List[int]]:
+        """Нумерует Accession таблицы подряд в порядке первого появления
+
+        Коды Accession общие для всех таблиц (см. AccessionDictionary),
+        поэтому списки сумм по коду имели бы размер всего словаря. Номера
+        Accession в таблице (слоты) ограничены количеством Accession таблицы.
 
         Args:
-            accessions: словарь вида: {
-                    "Имя Accession": Accession
-                }
-            seqDB: словарь с последовательностями, считанными из БД, вида: {
-                    "Имя Accession": Sequence
-                }
+            accessionIds: код Accession каждой строки
+
+        Returns:
+            Коды Accession таблицы по слотам и слот каждой строки
         """
-        for accession, curAccession in accessions.items():
-            curAccession.ScNorm = curAccession.ScSumm / seqDB[accession].len
-            curAccession.PSignalNorm = (
-                curAccession.PSignalSumm / seqDB[accession].len)
+        accessionIds = list(accessionIds)
+        uniqueIds = list(dict.fromkeys(accessionIds))
+        slotsById = dict(zip(uniqueIds, range(len(uniqueIds))))
+        return uniqueIds, list(map(slotsById.__getitem__, accessionIds))
+
+    @staticmethod
+    def _SumByAccession(
+            slots: Seq[int],
+            size: int,
+            sequenceLengths: Iterable[int],
+            scValues: Optional[Iterable[Union[Decimal, int]]] = None,
+            pSignalValues: Optional[Iterable[Union[Decimal, int]]] = None,
+            zero: Union[Decimal, int] = 0
+    ) -> Tuple[List[int], List[int], List[Union[Decimal, int]],
+               List[Union[Decimal, int]]]:
+        """Суммирует столбцы таблицы по Accession за один проход
 
-    def GenerateAccessionsBunchOverAllTables(
-            self) -> Dict[str, Dict[str, Accession]]:
-        """Получает словарь с Accession, каждый из которых разбит по таблицам
+        Слот Accession (см. _GetSlots) — номер ячейки в списках сумм,
+        поэтому каждая строка прибавляется к спискам по индексу, без
+        словарей и объектов Accession. Если scValues и pSignalValues не
+        заданы, суммируются только количество строк и длины
+        последовательностей.
 
-        Если конкретного Accession нет в конкретной таблице, то эта таблица
-        отсутствует в словаре таблиц этого Accession
+        Args:
+            slots: слот Accession каждой строки
+            size: количество слотов
+            sequenceLengths: длина последовательности каждой строки
+            scValues: Sc каждой строки
+            pSignalValues: Precursor Signal каждой строки
+            zero: начальное значение сумм Sc и Precursor Signal
 
         Returns:
-            Словарь вида: {
-                "Имя Accession": {
-                    "Номер таблицы": Accession
-                }
+            Списки количества строк, сумм длин последовательностей, Sc и
+            Precursor Signal, индекс в которых — слот Accession
+        """
+        counts = [0] * size
+        seqlenSumms = [0] * size
+        scSumms = [zero] * size
+        pSignalSumms = [zero] * size
+        if scValues is None or pSignalValues is None:
+            for slot, sequenceLength in zip(slots, sequenceLengths):
+                counts[slot] += 1
+                seqlenSumms[slot] += sequenceLength
+            return counts, seqlenSumms, scSumms, pSignalSumms
+        for slot, sequenceLength, sc, pSignal in zip(
+                slots, sequenceLengths, scValues, pSignalValues):
+            counts[slot] += 1
+            seqlenSumms[slot] += sequenceLength
+            scSumms[slot] += sc
+            pSignalSumms[slot] += pSignal
+        return counts, seqlenSumms, scSumms, pSignalSumms
+
+    def _GetSequenceLengths(
+            self,
+            uniqueIds: Iterable[int],
+            seqDB: Dict[str, Sequence],
+            lengths: Dict[int, int]
+    ) -> List[int]:
+        """Получает длины последовательностей Accession таблицы
+
+        Длины берутся из каталога Accession (PeptideTables.accessionCatalog),
+        а длины Accession, отсутствующих в каталоге, — из seqDB
+
+        Args:
+            uniqueIds: коды Accession таблицы по слотам (см. _GetSlots)
+            seqDB: база данных последовательностей Accession
+            lengths: длины последовательностей по кодам Accession
+
+        Returns:
+            Длины последовательностей по слотам
+        """
+        try:
+            return list(map(lengths.__getitem__, uniqueIds))
+        except KeyError:
+            names = self.accessionDictionary.names
+            return [
+                lengths[accessionId] if accessionId in lengths
+                else seqDB[names[accessionId]].len
+                for accessionId in uniqueIds
+            ]
+
+    @staticmethod
+    def _GetColumns(
+            counts: List[int],
+            seqlenSumms: List[int],
+            scSumms: Union[Seq, Dict[int, Union[Decimal, float]]],
+            pSignalSumms: Union[Seq, Dict[int, Union[Decimal, float]]],
+            sequenceLengths: Seq[int]
+    ) -> Dict[str, List[Any]]:
+        """Собирает значения полей Accession по слотам и подсчитывает
+        нормализованные значения Sc и Precursor Signal
+
+        ScNorm и PSignalNorm всех Accession таблицы считаются делением сумм
+        на длины последовательностей сразу для всей таблицы.
+        Поля ScNormToFileNormRatio, PSignalNormToFileNormRatio и
+        PSignalAndScNormRatiosAverage не заполняются!!!
+
+        Args:
+            counts: количество строк по слотам
+            seqlenSumms: суммы длин последовательностей строк по слотам
+            scSumms: суммы Sc по слотам
+            pSignalSumms: суммы Precursor Signal по слотам
+            sequenceLengths: длины последовательностей по слотам (см.
+                _GetSequenceLengths)
+
+        Returns:
+            Словарь вида {
+                "поле Accession": [значение для слота]
             }
         """
-        accessions: Dict[str, Dict[str, Accession]] = {}
-        for tableName, table in self.items():
-            for accessionName, accession in table.items():
-                if accessionName not in accessions:
-                    accessions[accessionName] = {}
-                accessions[accessionName][tableName] = accession
-        return accessions
-
-    def RemoveAccessionFromAllTables(self, accession: str) -> None:
+        slots = range(len(counts))
+        tableScSumms = list(map(scSumms.__getitem__, slots))
+        tablePSignalSumms = list(map(pSignalSumms.__getitem__, slots))
+        return {
+            "Counts": counts,
+            "SeqlenSumm": seqlenSumms,
+            "ScSumm": tableScSumms,
+            "PSignalSumm": tablePSignalSumms,
+            "ScNorm": list(map(truediv, tableScSumms, sequenceLengths)),
+            "PSignalNorm": list(map(
+                truediv, tablePSignalSumms, sequenceLengths)),
+        }
+
+    def _CreateAccessions(
+            self,
+            uniqueIds: Seq[int],
+            columns: Dict[str, List[Any]]
+    ) -> Dict[int, Accession]:
+        """Создаёт Accession'ы по значениям полей (см. _GetColumns)
+
+        Args:
+            uniqueIds: коды Accession таблицы по слотам (см. _GetSlots)
+            columns: значения полей Accession по слотам
+
+        Returns:
+            Словарь с Accession'ами вида: {
+                код Accession: Accession
+            }
+        """
+        names = self.accessionDictionary.names
+        return {
+            accessionId: Accession(
+                name=names[accessionId],
+                ScSumm=scSumm,
+                ScNorm=scNorm,
+                PSignalSumm=pSignalSumm,
+                PSignalNorm=pSignalNorm,
+                SeqlenSumm=seqlenSumm,
+                Counts=count)
+            for (accessionId, scSumm, scNorm, pSignalSumm, pSignalNorm,
+                 seqlenSumm, count) in zip(
+                uniqueIds, columns["ScSumm"], columns["ScNorm"],
+                columns["PSignalSumm"], columns["PSignalNorm"],
+                columns["SeqlenSumm"], columns["Counts"])
+        }
+
+    def RemoveAccessionFromAllTables(self, accession: int) -> None:
         """Удаляет Accession из всех таблиц
 
         Args:
-            accession: имя Accession
+            accession: код Accession
         """
         for table in self.values():
             table.pop(accession, None)
+        self.tableColumns.clear()
+
+    def ExportTable(self, tableNum: str) -> Dict[str, Accession]:
+        """Получает таблицу с именами Accession вместо кодов для передачи в
+        другой процесс
+
+        Args:
+            tableNum: номер таблицы
+
+        Returns:
+            Словарь вида: {
+                "Имя Accession": Accession
+            }
+        """
+        return self.accessionDictionary.KeysToNames(self[tableNum])
+
+    def ImportTable(
+            self, tableNum: str, accessions: Dict[str, Accession]) -> None:
+        """Добавляет таблицу, полученную с помощью ExportTable
+
+        Args:
+            tableNum: номер таблицы
+            accessions: словарь вида: {
+                    "Имя Accession": Accession
+                }
+        """
+        self[tableNum] = self.accessionDictionary.KeysToIds(accessions)
@@ -0,0 +1,166 @@
+from array import array
+from collections.abc import MutableSequence
+from copy import copy
+from itertools import compress
+from typing import Any, Iterator, Optional, Sequence, Union
+from .AccessionDictionary import AccessionDictionary
+from .DecimalArray import DecimalArray
+from .PeptideViews import PeptideAccessionView, PeptideRowView
+
+
+class ArrayPeptideTable(MutableSequence):
+    """PeptideTable, хранящая столбцы в массивах (struct of arrays)
+
+    Вместо списка PeptideAccession хранятся коды Accession
+    (см. AccessionDictionary), значения confidence, sc и precursorSignal в
+    DecimalArray и длины последовательностей. Строки таблицы доступны как
+    PeptideAccessionView, поэтому таблицу можно использовать вместо
+    PeptideTable.
+
+    Attributes:
+        accessionDictionary: словарь кодов Accession
+        names: коды Accession строк
+        confidence: значения confidence строк
+        sc: значения sc строк
+        precursorSignal: значения precursorSignal строк
+        sequenceLengths: длины последовательностей строк
+    """
+
+    CODE_TYPE = "i"
+
+    accessionDictionary: AccessionDictionary
+    names: array
+    confidence: DecimalArray
+    sc: DecimalArray
+    precursorSignal: DecimalArray
+    sequenceLengths: array
+
+    def __init__(
+        self, accessionDictionary: Optional[AccessionDictionary] = None
+    ) -> None:
+        """
+        Args:
+            accessionDictionary: словарь кодов Accession. Если не задан,
+                создаётся новый
+        """
+        self.accessionDictionary = (
+            accessionDictionary
+            if accessionDictionary is not None
+            else AccessionDictionary()
+        )
+        self.clear()
+
+    def clear(self) -> None:
+        self.names = array(self.CODE_TYPE)
+        self.confidence = DecimalArray()
+        self.sc = DecimalArray()
+        self.precursorSignal = DecimalArray()
+        self.sequenceLengths = array(self.CODE_TYPE)
+
+    def AppendRow(self, row: Any, accessionId: int) -> None:
+        """Добавляет строку Peptide таблицы с репрезентативным Accession
+
+        Args:
+            row: PeptideRow или PeptideRowView
+            accessionId: код репрезентативного Accession
+        """
+        self.names.append(accessionId)
+        if isinstance(row, PeptideRowView):
+            self.confidence.AppendFrom(row.table.confidence, row.index)
+            self.sc.AppendFrom(row.table.sc, row.index)
+            self.precursorSignal.AppendFrom(
+                row.table.precursorSignal, row.index)
+        else:
+            self.confidence.append(row.confidence)
+            self.sc.append(row.sc)
+            self.precursorSignal.append(row.precursorSignal)
+        self.sequenceLengths.append(row.sequenceLength)
+
+    def append(self, value: Any) -> None:
+        self.AppendRow(value, self.accessionDictionary.GetId(value.name))
+
+    def insert(self, index: int, value: Any) -> None:
+        index = min(max(index + len(self) if index < 0 else index, 0),
+                    len(self))
+        self.append(value)
+        if index < len(self) - 1:
+            last = len(self) - 1
+            self.names.insert(index, self.names.pop())
+            self.confidence.Move(last, index)
+            self.sc.Move(last, index)
+            self.precursorSignal.Move(last, index)
+            self.sequenceLengths.insert(index, self.sequenceLengths.pop())
+
+    def pop(self, index: int = -1) -> None:
+        """Удаляет строку. В отличие от list.pop ничего не возвращает, так как
+        представление удалённой строки было бы недействительным"""
+        del self[index]
+
+    def Compact(self, keep: Sequence[bool]) -> None:
+        """Оставляет только строки, для которых keep истинно
+
+        Args:
+            keep: маска строк, длина которой равна длине таблицы
+        """
+        self.names = array(self.CODE_TYPE, compress(self.names, keep))
+        self.confidence.Compact(keep)
+        self.sc.Compact(keep)
+        self.precursorSignal.Compact(keep)
+        self.sequenceLengths = array(
+            self.CODE_TYPE, compress(self.sequenceLengths, keep))
+
+    def Snapshot(self) -> 'ArrayPeptideTable':
+        """Создаёт копию таблицы, массивы которой общие с исходной таблицей
+
+        Compact не изменяет массивы, а заменяет их отфильтрованными, поэтому
+        копию можно фильтровать независимо от исходной таблицы, а массивы
+        копируются только при фильтрации. Изменять строки копии нельзя.
+        """
+        snapshot = copy(self)
+        snapshot.confidence = copy(self.confidence)
+        snapshot.sc = copy(self.sc)
+        snapshot.precursorSignal = copy(self.precursorSignal)
+        return snapshot
+
+    def IterAccessionIds(self) -> Iterator[int]:
+        """Получает код Accession каждой строки
+
+        Yields:
+            Код Accession строки
+        """
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> PeptideAccessionView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("table index out of range")
+        return PeptideAccessionView(self, index)
+
+    def __setitem__(self, index: int, value: Any) -> None:
+        row = self[index]
+        row.name = value.name
+        row.confidence = value.confidence
+        row.sc = value.sc
+        row.precursorSignal = value.precursorSignal
+        self.sequenceLengths[row.index] = value.sequenceLength
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        del self.names[index]
+        del self.confidence[index]
+        del self.sc[index]
+        del self.precursorSignal[index]
+        del self.sequenceLengths[index]
+
+    def __iter__(self) -> Iterator[PeptideAccessionView]:
+        for i in range(len(self)):
+            yield PeptideAccessionView(self, i)
+
+    def __str__(self):
+        return self.__repr__()
+
+    def __repr__(self):
+        return "[\n " + "\n ".join([str(e) for e in self]) + "\n]"
@@ -0,0 +1,277 @@
+from array import array
+from collections.abc import MutableSequence
+from itertools import compress
+from typing import (Any, Callable, Iterator, List, Optional, Sequence,
+                    Tuple, Union)
+from .AccessionDictionary import AccessionDictionary
+from .ArrayPeptideTable import ArrayPeptideTable
+from .DecimalArray import DecimalArray
+from .PeptideColumns import PeptideColumns
+from .PeptideViews import PeptideRowView
+from .RawPeptideTable import RawPeptideTable
+from .TableCache import TableCache
+from .TableFilter import CompactTable
+
+
+class ArrayRawPeptideTable(MutableSequence):
+    """RawPeptideTable, хранящая столбцы в массивах (struct of arrays)
+
+    Accession'ы строк хранятся кодами (см. AccessionDictionary) в общем
+    массиве accessionCodes: для каждой строки известны начало её кодов в
+    этом массиве и их количество. При удалении строк коды не сдвигаются, а
+    при замене списка Accession строки на более длинный новые коды
+    дописываются в конец массива. Значения confidence, sc и precursorSignal
+    хранятся в DecimalArray, от последовательности хранится только длина.
+    Строки таблицы доступны как PeptideRowView, поэтому таблицу можно
+    использовать вместо RawPeptideTable.
+
+    Attributes:
+        unsafeFlag: разрешает строкам таблицы быть разной длины
+        columns: номера и имена считываемых столбцов
+        cache: кэш считанных таблиц
+        accessionDictionary: словарь кодов Accession
+        stopCondition: условие остановки чтения (см. Table.stopCondition)
+        accessionCodes: коды Accession всех строк
+        accessionStarts: начало кодов Accession строки в accessionCodes
+        accessionCounts: количество Accession в строке
+        confidence: значения confidence строк
+        sc: значения sc строк
+        precursorSignal: значения precursorSignal строк
+        sequenceLengths: длины последовательностей строк
+    """
+
+    CODE_TYPE = "i"
+
+    unsafeFlag: bool
+    columns: PeptideColumns
+    cache: Optional[TableCache]
+    accessionDictionary: AccessionDictionary
+    stopCondition: Optional[Callable[[Tuple[str, ...]], bool]]
+    accessionCodes: array
+    accessionStarts: array
+    accessionCounts: array
+    confidence: DecimalArray
+    sc: DecimalArray
+    precursorSignal: DecimalArray
+    sequenceLengths: array
+
+    def __init__(
+        self,
+        tableFilename: str = None,
+        unsafeFlag: bool = False,
+        columns: PeptideColumns = PeptideColumns(),
+        cache: Optional[TableCache] = None,
+        accessionDictionary: Optional[AccessionDictionary] = None,
+        stopCondition: Optional[Callable[[Tuple[str, ...]], bool]] = None,
+    ) -> None:
+        """
+        Args:
+            tableFilename: имя файла таблицы. Если задано, таблица
+                считывается из файла
+            unsafeFlag: разрешает строкам таблицы быть разной длины
+            columns: номера и имена считываемых столбцов
+            cache: кэш считанных таблиц
+            accessionDictionary: словарь кодов Accession. Если не задан,
+                создаётся новый
+            stopCondition: условие остановки чтения (см.
+                Table.stopCondition)
+        """
+        self.unsafeFlag = unsafeFlag
+        self.stopCondition = stopCondition
+        self.columns = columns
+        self.cache = cache
+        self.accessionDictionary = (
+            accessionDictionary
+            if accessionDictionary is not None
+            else AccessionDictionary()
+        )
+        self.clear()
+        if tableFilename is not None:
+            self.Load(tableFilename)
+
+    def Load(self, tableFilename: str) -> 'ArrayRawPeptideTable':
+        """Считывает таблицу из файла так же, как RawPeptideTable, но без
+        хранения объектов строк
+
+        Args:
+            tableFilename: имя файла таблицы
+        """
+        reader = RawPeptideTable(
+            unsafeFlag=self.unsafeFlag,
+            columns=self.columns,
+            cache=self.cache,
+            accessionDictionary=self.accessionDictionary,
+            stopCondition=self.stopCondition,
+        )
+        self.clear()
+        # Значения из кэша добавляются в массивы напрямую, без создания
+        # PeptideRow и восстановления Decimal
+        for row in reader.IterPackedRows(tableFilename, self.columns):
+            self.AppendPacked(row)
+        return self
+
+    def clear(self) -> None:
+        self.accessionCodes = array(self.CODE_TYPE)
+        self.accessionStarts = array(self.CODE_TYPE)
+        self.accessionCounts = array(self.CODE_TYPE)
+        self.confidence = DecimalArray()
+        self.sc = DecimalArray()
+        self.precursorSignal = DecimalArray()
+        self.sequenceLengths = array(self.CODE_TYPE)
+
+    def append(self, row: Any) -> None:
+        """Добавляет строку
+
+        Args:
+            row: PeptideRow или PeptideRowView
+        """
+        accessions = row.accessions
+        self.accessionStarts.append(len(self.accessionCodes))
+        self.accessionCounts.append(len(accessions))
+        self.accessionCodes.extend(
+            map(self.accessionDictionary.GetId, accessions))
+        if isinstance(row, PeptideRowView):
+            self.confidence.AppendFrom(row.table.confidence, row.index)
+            self.sc.AppendFrom(row.table.sc, row.index)
+            self.precursorSignal.AppendFrom(
+                row.table.precursorSignal, row.index)
+        else:
+            self.confidence.append(row.confidence)
+            self.sc.append(row.sc)
+            self.precursorSignal.append(row.precursorSignal)
+        self.sequenceLengths.append(row.sequenceLength)
+
+    def AppendPacked(self, values: Tuple) -> None:
+        """Добавляет строку, преобразованную RawPeptideTable.PackRow
+
+        Args:
+            values: значения строки
+        """
+        accessions = values[0]
+        self.accessionStarts.append(len(self.accessionCodes))
+        self.accessionCounts.append(len(accessions))
+        self.accessionCodes.extend(
+            map(self.accessionDictionary.GetId, accessions))
+        self.confidence.AppendPacked(values[1], values[2])
+        self.sc.AppendPacked(values[3], values[4])
+        self.precursorSignal.AppendPacked(values[5], values[6])
+        self.sequenceLengths.append(len(values[7]))
+
+    def insert(self, index: int, row: Any) -> None:
+        index = min(max(index + len(self) if index < 0 else index, 0),
+                    len(self))
+        self.append(row)
+        if index < len(self) - 1:
+            last = len(self) - 1
+            self.accessionStarts.insert(index, self.accessionStarts.pop())
+            self.accessionCounts.insert(index, self.accessionCounts.pop())
+            self.confidence.Move(last, index)
+            self.sc.Move(last, index)
+            self.precursorSignal.Move(last, index)
+            self.sequenceLengths.insert(index, self.sequenceLengths.pop())
+
+    def pop(self, index: int = -1) -> None:
+        """Удаляет строку. В отличие от list.pop ничего не возвращает, так как
+        представление удалённой строки было бы недействительным"""
+        del self[index]
+
+    def SetAccessions(self, index: int, accessions: List[str]) -> None:
+        """Заменяет список Accession строки
+
+        Args:
+            index: номер строки
+            accessions: новый список имён Accession
+        """
+        codes = array(
+            self.CODE_TYPE, map(self.accessionDictionary.GetId, accessions))
+        start = self.accessionStarts[index]
+        if len(codes) > self.accessionCounts[index]:
+            start = self.accessionStarts[index] = len(self.accessionCodes)
+            self.accessionCodes.extend(codes)
+        else:
+            self.accessionCodes[start:start + len(codes)] = codes
+        self.accessionCounts[index] = len(codes)
+
+    def RemoveRowsWithAccessions(self, accessions: List[str]) -> None:
+        """Удаляет все строки, содержащие хотя бы один Accession из списка
+
+        Args:
+            accessions: список имён Accession
+        """
+        removedIds = {
+            self.accessionDictionary.ids[accession]
+            for accession in accessions
+            if accession in self.accessionDictionary
+        }
+        codes = self.accessionCodes
+        CompactTable(self, [
+            removedIds.isdisjoint(codes[start:start + count])
+            for start, count in zip(self.accessionStarts,
+                                    self.accessionCounts)
+        ])
+
+    def Compact(self, keep: Sequence[bool]) -> None:
+        """Оставляет только строки, для которых keep истинно
+
+        Args:
+            keep: маска строк, длина которой равна длине таблицы
+        """
+        self.accessionStarts = array(
+            self.CODE_TYPE, compress(self.accessionStarts, keep))
+        self.accessionCounts = array(
+            self.CODE_TYPE, compress(self.accessionCounts, keep))
+        self.confidence.Compact(keep)
+        self.sc.Compact(keep)
+        self.precursorSignal.Compact(keep)
+        self.sequenceLengths = array(
+            self.CODE_TYPE, compress(self.sequenceLengths, keep))
+
+    def IterAccessionIds(self) -> Iterator[array]:
+        """Получает коды Accession каждой строки
+
+        Yields:
+            Массив кодов Accession строки
+        """
+        codes = self.accessionCodes
+        for start, count in zip(self.accessionStarts, self.accessionCounts):
+            yield codes[start:start + count]
+
+    def CreatePeptideTable(self) -> ArrayPeptideTable:
+        """Создаёт пустую Peptide таблицу для строк этой таблицы"""
+        return ArrayPeptideTable(self.accessionDictionary)
+
+    def __len__(self) -> int:
+        return len(self.accessionStarts)
+
+    def __getitem__(self, index: int) -> PeptideRowView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("table index out of range")
+        return PeptideRowView(self, index)
+
+    def __setitem__(self, index: int, row: Any) -> None:
+        view = self[index]
+        view.accessions = row.accessions
+        view.confidence = row.confidence
+        view.sc = row.sc
+        view.precursorSignal = row.precursorSignal
+        self.sequenceLengths[view.index] = row.sequenceLength
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        del self.accessionStarts[index]
+        del self.accessionCounts[index]
+        del self.confidence[index]
+        del self.sc[index]
+        del self.precursorSignal[index]
+        del self.sequenceLengths[index]
+
+    def __iter__(self) -> Iterator[PeptideRowView]:
+        for i in range(len(self)):
+            yield PeptideRowView(self, i)
+
+    def __str__(self):
+        return self.__repr__()
+
+    def __repr__(self):
+        return "[\n " + "\n ".join([str(e) for e in self]) + "\n]"
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, fields
-from typing import Sequence
+from typing import Sequence, Tuple
 
 
 @dataclass
@@ -16,3 +16,11 @@ class ColumnNames:
                 raise ValueError(f"Unknown column on position {position}!"
                                  f" Expected {self.__dict__[field.name][1]}"
                                  f", got {curColumn}")
+
+    def GetPositions(self) -> Tuple[int, ...]:
+        """Возвращает номера столбцов в порядке объявления полей
+
+        Returns:
+            Кортеж номеров столбцов, например: (3, 20, 23, 8, 6)
+        """
+        return tuple(self.__dict__[field.name][0] for field in fields(self))
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import Dict, List, Optional
 from os import path, listdir
 from ..ProteinTable import ProteinTable
+from ..TableCache import TableCache
 
 
 class ProteinDB(dict, ABC):
@@ -33,11 +34,17 @@ class ProteinDB(dict, ABC):
         return sorted(self, key=lambda x: float(x))
 
     @staticmethod
-    def GetProteinTables(folder: str) -> Dict[str, ProteinTable]:
+    def GetProteinTables(
+            folder: str,
+            cache: Optional[TableCache] = None) -> Dict[str, ProteinTable]:
         """Загружает все Protein файлы по пути folder в классы ProteinTable
 
+        Таблицы считываются до первого обратного Accession (см.
+        ProteinTable.IsDecoyRow).
+
         Args:
             folder: путь к папки с Protein файлами
+            cache: кэш считанных таблиц
 
         Returns:
             Словарь вида: {
@@ -48,7 +55,9 @@ class ProteinDB(dict, ABC):
         tables: Dict[str, ProteinTable] = {}
         for filename in filenames:
             tableNum = path.split(filename)[1].split('_')[0]
-            tables[tableNum] = ProteinTable(filename, True)
+            tables[tableNum] = ProteinTable(
+                filename, True, cache=cache,
+                stopCondition=ProteinTable.IsDecoyRow)
         return tables
 
     @staticmethod
@@ -1,5 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import List, Any
+from itertools import chain, compress, repeat
+from locale import getpreferredencoding
+from mmap import mmap, ACCESS_READ
+from operator import itemgetter
+from os import path
+from typing import (Any, Callable, Iterator, List, Optional, Sequence,
+                    Tuple)
+from .ColumnNames import ColumnNames
+from ..TableCache import TableCache
 
 
 class Table(ABC, list):
@@ -8,13 +16,28 @@ class Table(ABC, list):
 
     Attributes:
         unsafeFlag: разрешает строкам таблицы быть разной длины
+        cache: кэш считанных таблиц, используемый LoadRows
+        stopCondition: функция, получающая кортеж значений столбцов строки
+            (см. ReadMappedColumns). Чтение таблицы прекращается перед первой
+            строкой, для которой она истинна. None — таблица читается
+            целиком
     """
+    # Размер блока, которыми ReadMappedColumns разбирает файл
+    MAPPED_BLOCK_SIZE = 1 << 22
+
     unsafeFlag: bool
+    cache: Optional[TableCache]
+    stopCondition: Optional[Callable[[Tuple[str, ...]], bool]]
 
     def __init__(self,
                  tableFilename: str = None,
-                 unsafeFlag: bool = False):
+                 unsafeFlag: bool = False,
+                 cache: Optional[TableCache] = None,
+                 stopCondition: Optional[
+                     Callable[[Tuple[str, ...]], bool]] = None):
         self.unsafeFlag = unsafeFlag
+        self.cache = cache
+        self.stopCondition = stopCondition
         if tableFilename is not None:
             self.Load(tableFilename)
 
@@ -33,3 +56,191 @@ class Table(ABC, list):
                                      f" File: {tableFilename}")
                 self.append(values)
         return self
+
+    def Compact(self, keep: Sequence[bool]) -> None:
+        """Оставляет только строки, для которых keep истинно
+
+        Args:
+            keep: маска строк, длина которой равна длине таблицы
+        """
+        self[:] = compress(self, keep)
+
+    def LoadRows(self, tableFilename: str, columns: ColumnNames) -> None:
+        """Заполняет таблицу строками, полученными из IterLoadedRows
+
+        Args:
+            tableFilename: имя файла таблицы
+            columns: номера и имена считываемых столбцов
+        """
+        self.clear()
+        self.extend(self.IterLoadedRows(tableFilename, columns))
+
+    def IterLoadedRows(self,
+                       tableFilename: str,
+                       columns: ColumnNames) -> Iterator[Any]:
+        """Лениво считывает строки таблицы с помощью IterRows
+
+        Если задан self.cache, то строки берутся из кэша, а при их отсутствии
+        в кэше — считываются и сохраняются в кэш с помощью PackRow.
+
+        Args:
+            tableFilename: имя файла таблицы
+            columns: номера и имена считываемых столбцов
+
+        Yields:
+            Строки таблицы
+        """
+        if self.cache is None:
+            yield from self.IterRows(tableFilename)
+            return
+        key = self._GetCacheKey(tableFilename, columns)
+        cachedRows = self.cache.Load(key)
+        if cachedRows is not None:
+            yield from map(self.UnpackRow, cachedRows)
+            return
+        packedRows = []
+        for row in self.IterRows(tableFilename):
+            packedRows.append(self.PackRow(row))
+            yield row
+        self.cache.Save(key, packedRows)
+
+    def IterPackedRows(self,
+                       tableFilename: str,
+                       columns: ColumnNames) -> Iterator[Tuple]:
+        """Лениво считывает строки таблицы в виде, полученном PackRow
+
+        Используется, когда строки таблицы не нужны как объекты: при
+        попадании в кэш строки не восстанавливаются с помощью UnpackRow.
+
+        Args:
+            tableFilename: имя файла таблицы
+            columns: номера и имена считываемых столбцов
+
+        Yields:
+            Строки таблицы, преобразованные PackRow
+        """
+        if self.cache is None:
+            yield from map(self.PackRow, self.IterRows(tableFilename))
+            return
+        key = self._GetCacheKey(tableFilename, columns)
+        cachedRows = self.cache.Load(key)
+        if cachedRows is not None:
+            yield from cachedRows
+            return
+        packedRows = []
+        for row in self.IterRows(tableFilename):
+            packedRows.append(self.PackRow(row))
+            yield packedRows[-1]
+        self.cache.Save(key, packedRows)
+
+    def _GetCacheKey(self, tableFilename: str, columns: ColumnNames) -> str:
+        return self.cache.GetKey(
+            tableFilename, type(self).__name__, self.unsafeFlag, columns,
+            getattr(self.stopCondition, "__qualname__", None))
+
+    def IterRows(self, tableFilename: str) -> Iterator[Any]:
+        """Лениво считывает строки таблицы (см. LoadRows)"""
+        raise NotImplementedError
+
+    @staticmethod
+    def PackRow(row: Any) -> Tuple:
+        """Преобразует строку таблицы в кортеж из str, int и кортежей из них
+        для хранения в кэше"""
+        raise NotImplementedError
+
+    @staticmethod
+    def UnpackRow(values: Tuple) -> Any:
+        """Восстанавливает строку таблицы из кортежа, полученного PackRow"""
+        raise NotImplementedError
+
+    def ReadMappedColumns(
+            self,
+            tableFilename: str,
+            columns: ColumnNames) -> Iterator[Tuple[str, ...]]:
+        """Считывает из таблицы только столбцы из columns, отображая файл в
+        память
+
+        Файл разбирается блоками по MAPPED_BLOCK_SIZE байт, границы которых
+        сдвигаются к концу строки (см. _IterMappedLines). Каждый блок
+        декодируется одним вызовом, после чего переводы строк, табуляции и
+        количество столбцов каждой строки ищутся методами str сразу для
+        всех строк блока, без цикла Python по строкам. Файл не
+        декодируется целиком, поэтому память ограничена размером блока.
+        Чтение быстрее построчного (mmap.readline) примерно в 1.5 раза и
+        быстрее Table.Load в 2-3.5 раза (см. Benchmarks/TableLoad.py).
+        Заголовок таблицы проверяется с помощью columns.TestColumnNames.
+        Чтение прекращается перед строкой, для которой истинно
+        self.stopCondition.
+
+        Args:
+            tableFilename: имя файла таблицы
+            columns: номера и имена считываемых столбцов
+
+        Yields:
+            Кортеж значений столбцов строки в порядке объявления полей
+            columns (см. ColumnNames.GetPositions)
+        """
+        positions = columns.GetPositions()
+        maxSplit = max(positions) + 1
+        if len(positions) > 1:
+            getValues = itemgetter(*positions)
+        else:
+            def getValues(values: List[str]) -> Tuple[str, ...]:
+                return (values[positions[0]],)
+        stopCondition = self.stopCondition
+        blocks = self._IterMappedLines(tableFilename)
+        lines: List[str] = []
+        for lines in blocks:
+            if len(lines):
+                break
+        if not len(lines):
+            return
+        headerValues = lines[0].split("\t")
+        columns.TestColumnNames(headerValues)
+        tabCount = len(headerValues) - 1
+        del lines[0]
+        for lines in chain((lines,), blocks):
+            if not self.unsafeFlag and any(map(
+                    tabCount.__ne__, map(str.count, lines, repeat("\t")))):
+                raise ValueError("Table with variable len lines detected!"
+                                 f" File: {tableFilename}")
+            rows = map(getValues,
+                       map(str.split, lines, repeat("\t"), repeat(maxSplit)))
+            if stopCondition is None:
+                yield from rows
+                continue
+            for values in rows:
+                if stopCondition(values):
+                    return
+                yield values
+
+    @classmethod
+    def _IterMappedLines(cls, tableFilename: str) -> Iterator[List[str]]:
+        """Считывает непустые строки файла блоками
+
+        Блок — не меньше MAPPED_BLOCK_SIZE байт отображённого в память файла
+        (или остаток файла), продолженный до конца строки, поэтому строки не
+        разрываются между блоками.
+
+        Args:
+            tableFilename: имя файла таблицы
+
+        Yields:
+            Непустые строки блока без символов перевода строки
+        """
+        if path.getsize(tableFilename) == 0:
+            return
+        encoding = getpreferredencoding(False)
+        with open(tableFilename, "rb") as inFile, mmap(
+                inFile.fileno(), 0, access=ACCESS_READ) as mappedFile:
+            size = len(mappedFile)
+            start = 0
+            while start < size:
+                end = mappedFile.find(
+                    b"\n", min(start + cls.MAPPED_BLOCK_SIZE, size)) + 1
+                if end == 0:
+                    end = size
+                text = mappedFile[start:end].decode(encoding)
+                yield list(filter(None, map(
+                    str.rstrip, text.split("\n"), repeat("\r"))))
+                start = end
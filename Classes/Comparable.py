@@ -1,124 +1,242 @@
-from typing import Optional, Union, Dict
-
-
-class Comparable:
-    """Класс для хранения параметров фильтра
-
-    Позволяет хранить параметры фильтра и сравнивать их с любыми значениями
-
-    Attributes:
-        op: операция сравнения
-        val: значение, с которым будет производится сравнение, либо словарь
-            вида: {
-                "имя файла": значение
-            }.
-            Также может быть равно None, в этом случае все операции сравнения
-            вернут истину
-    """
-
-    op: Optional[str]
-    __val: Optional[Union[str, Dict[str, str]]]
-    __isFileToCompare: bool
-
-    def __init__(self, op: str = None, val: str = None) -> None:
-        self.__isFileToCompare: bool = True
-        if val is not None:
-            self.op = op
-            self.val = val
-        elif op is not None:
-            self.GetComparable(op)
-        else:
-            self.op = None
-            self.val = None
-
-    @property
-    def val(self):
-        return self.__val
-
-    @val.setter
-    def val(self, value):
-        try:
-            float(value)
-            self.__val = value
-            self.__isFileToCompare = False
-        except (TypeError, ValueError):
-            if value is None or (
-                isinstance(value, str) and len(value.strip()) == 0
-            ):
-                self.__val = value
-            elif isinstance(value, dict):
-                self.__val = value
-                self.__isFileToCompare = True
-            else:
-                self._LoadFromFile(value)
-                self.__isFileToCompare = True
-
-    def GetComparable(self, paramString: str):
-        """Получение параметра
-
-        Получение параметра, общего для всех фалов, либо для каждого своего, из
-        строки.
-        Формат: [операция][[имя файла] или [число]]
-
-        Args:
-            paramString: строка, которая будет ковертирована в параметр
-
-        Примеры:
-            >=99
-            < paramList.txt"""
-
-        paramString = paramString.strip()
-        self.op = "".join([ch for ch in paramString if ch in "!=<>"])
-
-        paramValue = paramString[len(self.op) :].strip()
-        if paramValue.strip() == "":
-            self.val = None
-        else:
-            self.val = paramValue
-
-    def _LoadFromFile(self, filename: str):
-        """Получение значений параметра из файла
-
-        Args:
-            filename: имя файла, из которого будут считываться значения
-        """
-        with open(filename) as paramStringFile:
-            strings = paramStringFile.read().replace(" ", "\t").split("\n")
-            paramStrings = {}
-            for string in strings:
-                string = string.strip()
-                if len(string):
-                    paramStrings[string.split("\t")[0]] = string.split("\t")[1]
-            self.val = paramStrings
-
-    def compare(
-        self, value: Union[str, float, int], filename: str = None
-    ) -> bool:
-        """Сравнивает значение с параметром
-
-        Args:
-            value: значение, которое будет сравниваться
-            filename: имя файла, если параметр был считан из файла
-        Returns:
-            Результат сравнения значения с параметром
-        """
-        if self.val is None:
-            return True
-        elif isinstance(self.val, str) or self.__isFileToCompare:
-            return eval(f"{value}{self.op}{self.val}")
-        elif (
-            self.val is not None
-            and filename is not None
-            and filename in self.val
-        ):
-            return eval(f"{value}{self.op}{self.val[filename]}")
-        return True
-
-    def __str__(self):
-        return self.__repr__()
-
-    def __repr__(self):
-        if not (self.op is None or self.val is None):
-            return f"{self.op} {self.val}"
-        else:
-            return ""
+import operator
+from decimal import Decimal
+from functools import partial
+from itertools import repeat
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+from .DecimalArray import DecimalArray
+
+
+def AlwaysTrue(value: Any) -> bool:
+    return True
+
+
+class Comparable:
+    """Класс для хранения параметров фильтра
+
+    Позволяет хранить параметры фильтра и сравнивать их с любыми значениями.
+    Параметр компилируется в функцию сравнения (см. GetPredicate) один раз
+    для каждого имени файла, поэтому при сравнении не разбираются строки.
+
+    Attributes:
+        op: операция сравнения
+        val: значение, с которым будет производится сравнение, либо словарь
+            вида: {
+                "имя файла": значение
+            }.
+            Также может быть равно None, в этом случае все операции сравнения
+            вернут истину
+    """
+
+    # Значение value op порог равно REFLECTED_OPERATORS[op](порог, value)
+    REFLECTED_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+        "<": operator.gt,
+        "<=": operator.ge,
+        ">": operator.lt,
+        ">=": operator.le,
+        "==": operator.eq,
+        "!=": operator.ne,
+    }
+
+    # Операция сравнения для параметра без операции (например, "95")
+    DEFAULT_OPERATOR = ">="
+
+    __op: Optional[str]
+    __val: Optional[Union[str, Dict[str, str]]]
+    __predicates: Dict[Optional[str], Callable[[Any], bool]]
+
+    def __init__(self, op: str = None, val: str = None) -> None:
+        self.__predicates = {}
+        if val is not None:
+            self.op = op
+            self.val = val
+        elif op is not None:
+            self.GetComparable(op)
+        else:
+            self.op = None
+            self.val = None
+
+    @property
+    def op(self):
+        return self.__op
+
+    @op.setter
+    def op(self, value):
+        self.__op = value
+        self.__predicates.clear()
+
+    @property
+    def val(self):
+        return self.__val
+
+    @val.setter
+    def val(self, value):
+        self.__predicates.clear()
+        try:
+            float(value)
+            self.__val = value
+        except (TypeError, ValueError):
+            if value is None or (
+                isinstance(value, str) and len(value.strip()) == 0
+            ):
+                self.__val = value
+            elif isinstance(value, dict):
+                self.__val = value
+            else:
+                self._LoadFromFile(value)
+
+    def GetComparable(self, paramString: str):
+        """Получение параметра
+
+        Получение параметра, общего для всех фалов, либо для каждого своего, из
+        строки.
+        Формат: [операция][[имя файла] или [число]]. Если операция не
+        указана, используется DEFAULT_OPERATOR.
+
+        Args:
+            paramString: строка, которая будет ковертирована в параметр
+
+        Примеры:
+            >=99
+            < paramList.txt
+            99 (то же, что >=99)"""
+
+        paramString = paramString.strip()
+        op = "".join([ch for ch in paramString if ch in "!=<>"])
+
+        paramValue = paramString[len(op) :].strip()
+        if paramValue.strip() == "":
+            self.op = op
+            self.val = None
+        else:
+            self.op = op or self.DEFAULT_OPERATOR
+            self.val = paramValue
+
+    def _LoadFromFile(self, filename: str):
+        """Получение значений параметра из файла
+
+        Args:
+            filename: имя файла, из которого будут считываться значения
+        """
+        with open(filename) as paramStringFile:
+            strings = paramStringFile.read().replace(" ", "\t").split("\n")
+            paramStrings = {}
+            for string in strings:
+                string = string.strip()
+                if len(string):
+                    paramStrings[string.split("\t")[0]] = string.split("\t")[1]
+            self.val = paramStrings
+
+    def GetThreshold(self, filename: str = None) -> Optional[Decimal]:
+        """Получает значение, с которым сравниваются значения из файла
+
+        Args:
+            filename: имя файла, если параметр был считан из файла
+
+        Returns:
+            Значение параметра или None, если для файла параметр не задан
+        """
+        value = self.val
+        if isinstance(value, dict):
+            if filename is None or filename not in value:
+                return None
+            value = value[filename]
+        if value is None or len(str(value).strip()) == 0:
+            return None
+        return Decimal(str(value).strip())
+
+    def GetPredicate(self, filename: str = None) -> Callable[[Any], bool]:
+        """Получает функцию сравнения значения с параметром
+
+        Функция создаётся один раз для каждого имени файла и использует
+        функции модуля operator, поэтому её можно вызывать для каждой строки
+        таблицы.
+
+        Args:
+            filename: имя файла, если параметр был считан из файла
+
+        Returns:
+            Функция, получающая значение (Decimal или int) и возвращающая
+            результат его сравнения с параметром
+        """
+        predicate = self.__predicates.get(filename)
+        if predicate is None:
+            threshold = self.GetThreshold(filename)
+            if threshold is None:
+                predicate = AlwaysTrue
+            elif self.op in self.REFLECTED_OPERATORS:
+                predicate = partial(
+                    self.REFLECTED_OPERATORS[self.op], threshold)
+            else:
+                raise ValueError(f"Unknown comparison operation: {self.op}")
+            self.__predicates[filename] = predicate
+        return predicate
+
+    def compare(
+        self, value: Union[str, Decimal, int], filename: str = None
+    ) -> bool:
+        """Сравнивает значение с параметром
+
+        Args:
+            value: значение, которое будет сравниваться
+            filename: имя файла, если параметр был считан из файла
+        Returns:
+            Результат сравнения значения с параметром
+        """
+        if isinstance(value, str):
+            value = Decimal(value)
+        return self.GetPredicate(filename)(value)
+
+    def compareMany(
+        self, values: Sequence[Union[Decimal, int]], filename: str = None
+    ) -> List[bool]:
+        """Сравнивает с параметром все значения
+
+        Значения DecimalArray сравниваются в целых числах: коэффициенты
+        значений и параметра приводятся к общему порядку.
+
+        Args:
+            values: значения, которые будут сравниваться
+            filename: имя файла, если параметр был считан из файла
+
+        Returns:
+            Результат сравнения каждого значения с параметром
+        """
+        predicate = self.GetPredicate(filename)
+        if predicate is AlwaysTrue:
+            return [True] * len(values)
+        threshold = self.GetThreshold(filename)
+        if (
+            not isinstance(values, DecimalArray)
+            or values.decimals is not None
+            or not threshold.is_finite()
+            or len(values) == 0
+        ):
+            return list(map(predicate, values))
+        sign, digits, exponent = threshold.as_tuple()
+        coefficient = int("".join(map(str, digits))) * (-1 if sign else 1)
+        exponents = values.exponents
+        minExponent = min(min(exponents), exponent)
+        scales = [
+            10 ** i
+            for i in range(max(max(exponents), exponent) - minExponent + 1)
+        ]
+        scaledCoefficients = map(
+            operator.mul,
+            values.coefficients,
+            map(scales.__getitem__,
+                map(operator.sub, exponents, repeat(minExponent))),
+        )
+        return list(map(
+            partial(self.REFLECTED_OPERATORS[self.op],
+                    coefficient * scales[exponent - minExponent]),
+            scaledCoefficients,
+        ))
+
+    def __str__(self):
+        return self.__repr__()
+
+    def __repr__(self):
+        if not (self.op is None or self.val is None):
+            return f"{self.op} {self.val}"
+        else:
+            return ""
@@ -0,0 +1,196 @@
+from array import array
+from decimal import Decimal
+from itertools import compress
+from typing import (Iterable, Iterator, List, Optional, Sequence, Tuple,
+                    Union)
+
+
+class DecimalArray:
+    """Компактный массив Decimal
+
+    Каждое значение хранится как целый коэффициент (int64) и порядок (int8),
+    поэтому Decimal восстанавливается без потери точности и с тем же
+    количеством знаков после запятой (Decimal("1.50") остаётся "1.50").
+    Если значение нельзя так представить (слишком большой коэффициент или
+    порядок, -0, NaN, Infinity), массив переходит к хранению списка Decimal.
+
+    Attributes:
+        coefficients: коэффициенты значений
+        exponents: порядки значений
+        decimals: список значений, если массив хранит Decimal напрямую,
+            иначе None
+    """
+
+    COEFFICIENT_TYPE = "q"
+    EXPONENT_TYPE = "b"
+    # Границы значений коэффициента и порядка, помещающихся в
+    # COEFFICIENT_TYPE и EXPONENT_TYPE
+    COEFFICIENT_RANGE = range(-2 ** 63, 2 ** 63)
+    EXPONENT_RANGE = range(-2 ** 7, 2 ** 7)
+    # Степени 10 для всех порядков: умножение на них точно и быстрее, чем
+    # Decimal(coefficient).scaleb(exponent) или Decimal(str)
+    SCALES = {exponent: Decimal(1).scaleb(exponent)
+              for exponent in EXPONENT_RANGE}
+
+    coefficients: array
+    exponents: array
+    decimals: Optional[List[Decimal]]
+
+    def __init__(self, values: Iterable[Decimal] = ()) -> None:
+        self.coefficients = array(self.COEFFICIENT_TYPE)
+        self.exponents = array(self.EXPONENT_TYPE)
+        self.decimals = None
+        for value in values:
+            self.append(value)
+
+    def append(self, value: Decimal) -> None:
+        if self.decimals is None:
+            coefficient, exponent = self.Pack(value)
+            if exponent is not None:
+                self.coefficients.append(coefficient)
+                self.exponents.append(exponent)
+                return
+            self._SwitchToDecimals()
+        self.decimals.append(value)
+
+    @classmethod
+    def Pack(cls, value: Decimal) -> Tuple[Union[int, str], Optional[int]]:
+        """Преобразует значение в пару для хранения в кэше (см. TableCache)
+
+        Args:
+            value: значение
+
+        Returns:
+            Коэффициент и порядок значения, как они хранятся в массиве, или
+            строковое представление значения и None, если значение нельзя так
+            представить
+        """
+        sign, _, exponent = value.as_tuple()
+        if isinstance(exponent, int) and exponent in cls.EXPONENT_RANGE:
+            coefficient = int(value.scaleb(-exponent))
+            if ((coefficient or not sign)
+                    and coefficient in cls.COEFFICIENT_RANGE):
+                return coefficient, exponent
+        return str(value), None
+
+    @classmethod
+    def Unpack(cls,
+               coefficient: Union[int, str],
+               exponent: Optional[int]) -> Decimal:
+        """Восстанавливает значение из пары, полученной Pack
+
+        Args:
+            coefficient: коэффициент или строковое представление значения
+            exponent: порядок или None
+
+        Returns:
+            Значение
+        """
+        if exponent is None:
+            return Decimal(coefficient)
+        return cls.SCALES[exponent] * coefficient
+
+    def AppendPacked(self,
+                     coefficient: Union[int, str],
+                     exponent: Optional[int]) -> None:
+        """Добавляет значение из пары, полученной Pack, без преобразования в
+        Decimal, если это возможно
+
+        Args:
+            coefficient: коэффициент или строковое представление значения
+            exponent: порядок или None
+        """
+        if self.decimals is None and exponent is not None:
+            self.coefficients.append(coefficient)
+            self.exponents.append(exponent)
+        else:
+            self.append(self.Unpack(coefficient, exponent))
+
+    def AppendFrom(self, other: 'DecimalArray', index: int) -> None:
+        """Добавляет значение other[index] без преобразования в Decimal,
+        если это возможно
+
+        Args:
+            other: массив, из которого копируется значение
+            index: номер значения в other
+        """
+        if self.decimals is None and other.decimals is None:
+            self.coefficients.append(other.coefficients[index])
+            self.exponents.append(other.exponents[index])
+        else:
+            self.append(other[index])
+
+    def insert(self, index: int, value: Decimal) -> None:
+        index = min(max(index + len(self) if index < 0 else index, 0),
+                    len(self))
+        self.append(value)
+        if index < len(self) - 1:
+            self.Move(len(self) - 1, index)
+
+    def Compact(self, keep: Sequence[bool]) -> None:
+        """Оставляет только значения, для которых keep истинно
+
+        Args:
+            keep: маска значений, длина которой равна длине массива
+        """
+        if self.decimals is None:
+            self.coefficients = array(
+                self.COEFFICIENT_TYPE, compress(self.coefficients, keep))
+            self.exponents = array(
+                self.EXPONENT_TYPE, compress(self.exponents, keep))
+        else:
+            self.decimals = list(compress(self.decimals, keep))
+
+    def Move(self, source: int, destination: int) -> None:
+        """Перемещает значение с номером source на место destination"""
+        if self.decimals is None:
+            self.coefficients.insert(
+                destination, self.coefficients.pop(source))
+            self.exponents.insert(destination, self.exponents.pop(source))
+        else:
+            self.decimals.insert(destination, self.decimals.pop(source))
+
+    def _SwitchToDecimals(self) -> None:
+        self.decimals = list(self)
+        self.coefficients = array(self.COEFFICIENT_TYPE)
+        self.exponents = array(self.EXPONENT_TYPE)
+
+    def __len__(self) -> int:
+        if self.decimals is not None:
+            return len(self.decimals)
+        return len(self.exponents)
+
+    def __getitem__(self, index: int) -> Decimal:
+        if self.decimals is not None:
+            return self.decimals[index]
+        return self.SCALES[self.exponents[index]] * self.coefficients[index]
+
+    def __setitem__(self, index: int, value: Decimal) -> None:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("DecimalArray index out of range")
+        self.append(value)
+        if self.decimals is None:
+            self.coefficients[index] = self.coefficients.pop()
+            self.exponents[index] = self.exponents.pop()
+        else:
+            self.decimals[index] = self.decimals.pop()
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if self.decimals is not None:
+            del self.decimals[index]
+        else:
+            del self.coefficients[index]
+            del self.exponents[index]
+
+    def __iter__(self) -> Iterator[Decimal]:
+        if self.decimals is not None:
+            return iter(self.decimals)
+        scales = self.SCALES
+        return (scales[exponent] * coefficient
+                for coefficient, exponent in zip(self.coefficients,
+                                                 self.exponents))
+
+    def __repr__(self) -> str:
+        return f"DecimalArray({list(self)})"
@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
+
+
+@dataclass
+class FDRCutoff:
+    """Граница глобального FDR фильтра для таблицы
+
+    Attributes:
+        confidence: наименьший confidence строк до границы или None, если до
+            границы нет ни одной строки
+        targetCount: количество прямых строк до границы (остаются в таблице)
+        decoyCount: количество обратных строк до границы
+    """
+    confidence: Optional[Decimal] = None
+    targetCount: int = 0
+    decoyCount: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{'-' if self.confidence is None else self.confidence}"
+            f" ({self.targetCount} target, {self.decoyCount} decoy)"
+        )
@@ -1,12 +1,22 @@
-from Classes.Functions import IsReversed
+from decimal import Decimal
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from Classes.FDRCutoff import FDRCutoff
+from Classes.Functions import GetConfidences, IsReversed
+from Classes.GlobalFDR import GlobalFDR
 from Classes.PeptideRow import PeptideRow
 from Classes.RawPeptideTable import RawPeptideTable
 from Classes.RawPeptideTables import RawPeptideTables
+from Classes.TableFilter import CompactTable
 
 
 class FDRFilter:
     """Применяет FDR фильтр к RawPeptideTables
 
+    Параметр FDR фильтра (Input.fdr) — "default" (или пустая строка) либо
+    "<% k r": критическое значение глобального FDR в процентах и
+    необязательный поправочный коэффициент k (по умолчанию 1), например
+    "1 1.333" (см. GlobalFDR.ParseParams).
+
     Attributes:
         rawPeptideTables: считанные построчно Peptide таблицы
     """
@@ -21,24 +31,133 @@ class FDRFilter:
 
         self.rawPeptideTables = rawPeptideTables
 
+    def Apply(self, fdr: Optional[str]) -> Dict[str, FDRCutoff]:
+        """Применяет default или глобальный FDR фильтр в зависимости от
+        параметра
+
+        Args:
+            fdr: параметр FDR фильтра (см. GlobalFDR.ParseParams)
+
+        Returns:
+            Границы глобального FDR фильтра для каждой таблицы или пустой
+            словарь для default фильтра
+        """
+        params = GlobalFDR.ParseParams(fdr)
+        if params is None:
+            self.ApplyDefaultFilter()
+            return {}
+        return self.ApplyGlobalFilter(*params)
+
+    def GetReversedIds(self) -> FrozenSet[int]:
+        """Получает коды всех обратных Accession таблиц"""
+        return frozenset(
+            accessionId
+            for accessionId, accession in enumerate(
+                self.rawPeptideTables.accessionDictionary.names)
+            if IsReversed(accession)
+        )
+
+    def GetBlankIds(self) -> FrozenSet[int]:
+        """Получает коды пустых Accession таблиц (пустая ячейка Accessions
+        в конце выгрузки ProteinPilot)"""
+        return frozenset(
+            accessionId
+            for accessionId, accession in enumerate(
+                self.rawPeptideTables.accessionDictionary.names)
+            if not accession.strip()
+        )
+
+    @staticmethod
+    def GetScoredRows(
+        table: RawPeptideTable,
+        reversedIds: FrozenSet[int],
+        blankIds: FrozenSet[int],
+    ) -> Tuple[List[int], List[bool]]:
+        """Находит строки таблицы, учитываемые глобальным FDR, и обратные
+        строки среди них — строки, все Accession которых обратные
+
+        Строки без непустых Accession не являются ни прямыми, ни обратными:
+        они не учитываются при подсчёте FDR и всегда удаляются фильтром
+
+        Args:
+            table: Peptide таблица
+            reversedIds: коды обратных Accession (см. GetReversedIds)
+            blankIds: коды пустых Accession (см. GetBlankIds)
+
+        Returns:
+            Номера учитываемых строк таблицы и является ли обратной каждая
+            из них
+        """
+        rows: List[int] = []
+        isDecoy: List[bool] = []
+        for rowIndex, accessionIds in enumerate(table.IterAccessionIds()):
+            if blankIds.issuperset(accessionIds):
+                continue
+            rows.append(rowIndex)
+            isDecoy.append(reversedIds.issuperset(accessionIds))
+        return rows, isDecoy
+
+    def ApplyGlobalFilter(
+        self, criticalValue: Decimal, k: Decimal = Decimal(1)
+    ) -> Dict[str, FDRCutoff]:
+        """Оставляет в каждой таблице прямые строки до границы, на которой
+        глобальный FDR меньше критического значения (см. GlobalFDR), и
+        удаляет из них реверсированные Accession
+
+        Args:
+            criticalValue: критическое значение глобального FDR в процентах
+            k: поправочный коэффициент
+
+        Returns:
+            Границы фильтра для каждой таблицы
+        """
+        cutoffs: Dict[str, FDRCutoff] = {}
+        reversedIds = self.GetReversedIds()
+        blankIds = self.GetBlankIds()
+        for tableNum, table in self.rawPeptideTables.items():
+            rows, isDecoy = self.GetScoredRows(table, reversedIds, blankIds)
+            tableConfidences = GetConfidences(table)
+            confidences = [tableConfidences[row] for row in rows]
+            globalFDR = GlobalFDR(confidences, isDecoy)
+            cutoffCount = globalFDR.GetCutoffCount(criticalValue, k)
+            keep = [False] * len(table)
+            for index in globalFDR.order[:cutoffCount]:
+                keep[rows[index]] = not isDecoy[index]
+            targetCount = sum(keep)
+            cutoffs[tableNum] = FDRCutoff(
+                confidences[globalFDR.order[cutoffCount - 1]]
+                if cutoffCount else None,
+                targetCount,
+                cutoffCount - targetCount,
+            )
+            CompactTable(table, keep)
+            for row in table:
+                self.RemoveReversedAccessionsFromRow(row)
+        return cutoffs
+
     def ApplyDefaultFilter(self):
+        """Удаляет из строк реверсированные Accession и отбрасывает таблицу,
+        начиная с первой строки, в которой не осталось Accession"""
         table: RawPeptideTable
         for table in self.rawPeptideTables.values():
             row: PeptideRow
-            i = 0
-            while i < len(table):
-                row = table[i]
+            keptCount = len(table)
+            for i, row in enumerate(table):
                 self.RemoveReversedAccessionsFromRow(row)
                 if len(row.accessions) == 0:
-                    del table[i:]
-                else:
-                    i += 1
+                    keptCount = i
+                    break
+            CompactTable(
+                table,
+                [True] * keptCount + [False] * (len(table) - keptCount))
 
     @staticmethod
     def RemoveReversedAccessionsFromRow(row: PeptideRow) -> None:
-        i = 0
-        while i < len(row.accessions):
-            if IsReversed(row.accessions[i]):
-                row.accessions.pop(i)
-            else:
-                i += 1
+        accessions = row.accessions
+        keptAccessions = [
+            accession for accession in accessions
+            if not IsReversed(accession)
+        ]
+        # Для PeptideRowView accessions возвращает копию списка
+        if len(keptAccessions) != len(accessions):
+            row.accessions = keptAccessions
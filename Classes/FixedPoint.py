@@ -0,0 +1,151 @@
+"""Точное суммирование Decimal в целых числах (фиксированная точка)
+
+Значения Sc и Precursor Signal в таблицах записаны с фиксированным
+количеством знаков после запятой, поэтому их суммы можно считать в целых
+числах: значение coefficient * 10 ** exponent хранится как coefficient
+(см. DecimalArray), а в Decimal переводится только готовая сумма. Пока
+сумма помещается в точность контекста Decimal, результат совпадает с
+последовательным сложением Decimal до последнего знака, включая количество
+знаков после запятой.
+"""
+from decimal import Decimal, getcontext
+from itertools import compress, repeat
+from operator import mul, sub
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+from .DecimalArray import DecimalArray
+
+
+def IsExact(bound: int) -> bool:
+    """Проверяет, что целое число помещается в точность контекста Decimal
+
+    Args:
+        bound: модуль наибольшего коэффициента суммы
+
+    Returns:
+        True, если сложение Decimal с такими коэффициентами не округляется
+    """
+    return len(str(bound)) <= getcontext().prec
+
+
+def GetUnit(exponent: int) -> Decimal:
+    """Получает Decimal 1 * 10 ** exponent
+
+    Произведение Decimal(coefficient) * GetUnit(exponent) — значение
+    coefficient * 10 ** exponent с порядком exponent, если coefficient
+    помещается в точность контекста
+
+    Args:
+        exponent: порядок
+
+    Returns:
+        Единица младшего разряда с порядком exponent
+    """
+    return Decimal(1).scaleb(exponent)
+
+
+def ScaleCoefficients(
+    values: DecimalArray,
+) -> Optional[Tuple[Iterable[int], int]]:
+    """Переводит значения в целые числа единиц младшего разряда
+    10 ** minExponent, где minExponent — наименьший из порядков значений и 0
+
+    Args:
+        values: значения
+
+    Returns:
+        Целые значения и minExponent или None, если values хранит Decimal
+        напрямую или сумма значений не помещается в точность контекста
+    """
+    if values.decimals is not None:
+        return None
+    coefficients = values.coefficients
+    exponents = values.exponents
+    if len(exponents) == 0:
+        return coefficients, 0
+    minExponent = min(min(exponents), 0)
+    maxExponent = max(exponents)
+    if not IsExact(sum(map(abs, coefficients))
+                   * 10 ** (maxExponent - minExponent)):
+        return None
+    if min(exponents) == maxExponent:
+        if maxExponent == minExponent:
+            return coefficients, minExponent
+        return (map(mul, coefficients,
+                    repeat(10 ** (maxExponent - minExponent))),
+                minExponent)
+    scales = [10 ** i for i in range(maxExponent - minExponent + 1)]
+    return (
+        map(mul,
+            coefficients,
+            map(scales.__getitem__,
+                map(sub, exponents, repeat(minExponent)))),
+        minExponent,
+    )
+
+
+def GetKeySums(
+    keys: Sequence[int],
+    exponents: Sequence[int],
+    totals: Sequence[int],
+    minExponent: int,
+) -> Dict[int, Decimal]:
+    """Переводит суммы целых значений из ScaleCoefficients в Decimal
+
+    Порядок суммы каждого ключа — наименьший из порядков его значений и 0,
+    как при последовательном сложении Decimal(0) и значений.
+
+    Args:
+        keys: ключ каждого значения
+        exponents: порядок каждого значения (DecimalArray.exponents)
+        totals: суммы целых значений по ключам (индекс — ключ)
+        minExponent: порядок младшего разряда целых значений
+
+    Returns:
+        Словарь вида {ключ: сумма} в порядке первого появления ключей
+    """
+    if len(exponents) and min(exponents) == max(exponents):
+        keyExponents = dict.fromkeys(keys, minExponent)
+    else:
+        keyExponents = dict.fromkeys(keys, 0)
+        for exponent in sorted(set(exponents), reverse=True):
+            if exponent < 0:
+                keyExponents.update(dict.fromkeys(
+                    compress(keys, map(exponent.__eq__, exponents)),
+                    exponent))
+    divisors = {exponent: 10 ** (exponent - minExponent)
+                for exponent in set(keyExponents.values())}
+    units = {exponent: GetUnit(exponent) for exponent in divisors}
+    return {
+        key: Decimal(totals[key] // divisors[exponent]) * units[exponent]
+        for key, exponent in keyExponents.items()
+    }
+
+
+def GroupSums(
+    keys: Sequence[int], values: DecimalArray
+) -> Optional[Dict[int, Decimal]]:
+    """Суммирует значения по ключам
+
+    Результат для каждого ключа совпадает с
+    Decimal(0) + values[i1] + values[i2] + ..., где i1, i2, ... — номера
+    значений с этим ключом: порядок суммы — наименьший из порядков
+    слагаемых и 0.
+
+    Args:
+        keys: ключ каждого значения, количество ключей равно len(values)
+        values: суммируемые значения
+
+    Returns:
+        Словарь вида {ключ: сумма} в порядке первого появления ключей или
+        None, если values хранит Decimal напрямую или сумма не помещается в
+        точность контекста. В этом случае значения нужно сложить в Decimal
+    """
+    scaled = ScaleCoefficients(values)
+    if scaled is None:
+        return None
+    coefficients, minExponent = scaled
+    # Ключи — коды Accession, поэтому суммы хранятся в списке по коду
+    totals = [0] * (max(keys, default=-1) + 1)
+    for key, coefficient in zip(keys, coefficients):
+        totals[key] += coefficient
+    return GetKeySums(keys, values.exponents, totals, minExponent)
@@ -0,0 +1,74 @@
+"""Суммирование значений в числах с плавающей точкой (float64)
+
+Используется при inputParams.numericBackend == "float" вместо Decimal. Если
+установлен NumPy, столбцы и суммы считаются с его помощью, иначе обычными
+float. Результаты обоих вариантов — float64, но могут отличаться в
+последних знаках из-за порядка сложения.
+"""
+from typing import Dict, Sequence
+from .DecimalArray import DecimalArray
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def DecimalToFloat(coefficient: int, exponent: int) -> float:
+    """Получает ближайший к coefficient * 10 ** exponent float
+
+    Степени 10 до 10 ** 22 представимы в float точно, поэтому для значений
+    из таблиц результат совпадает с float(Decimal)
+    """
+    if exponent < 0:
+        return coefficient / 10.0 ** -exponent
+    return coefficient * 10.0 ** exponent
+
+
+def ToFloats(values: DecimalArray) -> Sequence[float]:
+    """Переводит значения DecimalArray в float
+
+    Args:
+        values: значения
+
+    Returns:
+        Значения в виде numpy.ndarray, если установлен NumPy, иначе в виде
+        списка float
+    """
+    if values.decimals is not None:
+        return list(map(float, values.decimals))
+    if numpy is not None:
+        coefficients = numpy.frombuffer(values.coefficients, dtype=numpy.int64)
+        exponents = numpy.frombuffer(
+            values.exponents, dtype=numpy.int8).astype(numpy.int64)
+        return numpy.where(
+            exponents < 0,
+            coefficients / 10.0 ** -numpy.minimum(exponents, 0),
+            coefficients * 10.0 ** numpy.maximum(exponents, 0),
+        )
+    return list(map(DecimalToFloat, values.coefficients, values.exponents))
+
+
+def GroupFloatSums(
+    keys: Sequence[int], values: Sequence[float]
+) -> Dict[int, float]:
+    """Суммирует значения по ключам
+
+    Args:
+        keys: ключ (код Accession) каждого значения
+        values: значения, количество равно количеству ключей
+
+    Returns:
+        Словарь вида {ключ: сумма} в порядке первого появления ключей
+    """
+    if numpy is not None and len(keys):
+        totals = numpy.bincount(
+            numpy.asarray(keys, dtype=numpy.int64),
+            weights=numpy.asarray(values, dtype=numpy.float64),
+        ).tolist()
+    else:
+        totals = [0.0] * (max(keys, default=-1) + 1)
+        for key, value in zip(keys, values):
+            totals[key] += value
+    return {key: totals[key] for key in dict.fromkeys(keys)}
+
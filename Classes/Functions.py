@@ -1,12 +1,17 @@
 from Classes.PeptideRow import PeptideRow
 from Classes.RawPeptideTable import RawPeptideTable
 from Classes.RawPeptideTables import RawPeptideTables
+from argparse import ArgumentParser, Namespace
+from collections import Counter
 from decimal import Decimal
-from os import listdir, path
+from itertools import compress
+from os import cpu_count, listdir, path
 from sys import argv
-from typing import List, Dict, Union, Optional, Set
-from .Accession import Accession
+from typing import Any, List, Dict, Union, Optional, Sequence, Set, Tuple
+from .AccessionMatrix import AccessionMatrix
 from .AccessionTables import AccessionTables
+from .ArrayPeptideTable import ArrayPeptideTable
+from .ArrayRawPeptideTable import ArrayRawPeptideTable
 from .Comparable import Comparable
 from .Input import Input
 from .ProteinAccession import ProteinAccession
@@ -14,71 +19,14 @@ from .ProteinTable import ProteinTable
 from .PeptideAccession import PeptideAccession
 from .PeptideTable import PeptideTable
 from .PeptideTables import PeptideTables
+from .PresenceMatrix import PresenceMatrix
+from .RepresentativeStats import RepresentativeStats
 from .SequenceDatabase import SequenceDatabase
-
-
-def CountAccessionLackInGroup(
-    accession: str,
-    group: List[str],
-    accessionsPerTable: Dict[str, Dict[str, Accession]],
-) -> int:
-    """Подсчитывает количество файлов, не содержащих данный accession, в группе
-
-    Args:
-        accession: Имя accession, для которого считается отсутствие в группе
-        group: Список номеров таблиц, входящих в группу
-        accessionsPerTable: Словарь, ключом в котором является номер таблицы, а
-            значением — словарь, в котором, в свою очередь, ключом
-            является имя accession, а значением — экземпляр
-            класса Classes.Accession
-
-    Returns:
-        Количество файлов, не содержащих данный accession, в группе
-    """
-    groupAbsence = 0
-    for tableName in group:
-        if accession not in accessionsPerTable[tableName]:
-            groupAbsence += 1
-    return groupAbsence
-
-
-def CountGroupsWithAccession(
-    groups: Dict[str, List[str]],
-    accession: str,
-    maxGroupAbsence: int,
-    accessionsPerTable: Dict[str, Dict[str, Accession]],
-) -> int:
-    """Подсчёт количества групп, в которых данный accession отсутствует не
-    более maxGroupAbsence раз
-
-    Args:
-        groups: Словарь, в котором ключом является номер группы, а значением —
-                  список номеров входящих в неё таблиц
-        accession: Имя accession, для которого считается отсутствие в группах
-        maxGroupAbsence: Максимальное количество отсутствий accession в группе
-        accessionsPerTable: Словарь, ключом в котором является номер таблицы, а
-            ключом — словарь, в котором, в свою очередь, ключом является имя
-            accession, а значением — экземпляр Accession
-
-    Returns:
-        Количество групп, в которых accession отсутствует не более
-        maxGroupAbsence раз
-    """
-
-    groupsWithAccessionCount = len(groups)
-    for tableNames in groups.values():
-        if (
-            CountAccessionLackInGroup(
-                accession, tableNames, accessionsPerTable
-            )
-            > maxGroupAbsence
-        ):
-            groupsWithAccessionCount -= 1
-    return groupsWithAccessionCount
+from .TableFilter import CompactTable, FilterTable
 
 
 def GenerateGroupsBunch(
-    accessionsPerTable: Dict[str, Dict[str, Accession]]
+    accessionsPerTable: Dict[str, Any]
 ) -> Dict[str, List[str]]:
     groups: Dict[str, List[str]] = {}
     """Создаёт словарь с группами, в котором ключом является номер группы, а
@@ -86,9 +34,8 @@ def GenerateGroupsBunch(
 
     Args:
         accessionsPerTable: Словарь, ключом в котором является номер таблицы, а
-            ключом — словарь, в котором, в свою очередь, ключом
-            является имя accession, а значением — экземпляр
-            класса Classes.Accession
+            значением — Accession'ы таблицы (используются только номера
+            таблиц)
 
     Returns:
         Словарь с группами, в котором ключом является номер группы, а
@@ -104,41 +51,39 @@ def GenerateGroupsBunch(
 
 
 def ApplyGroupFilter(
-    accessionTables: AccessionTables,
+    accessionMatrix: AccessionMatrix,
     maxGroupAbsence: int,
     minGroupsWithAccession: int,
 ) -> None:
-    """Применение фильтра по группам к AccessionTables
+    """Применение фильтра по группам к AccessionMatrix
 
     Таблицы, начинающиеся с одинакового числа входят в одну группу, например:
     1.1, 1.2, 1.3 входят в одну группу, 2.1, 2.2 входят в другую и т. д.
-    Из всех таблиц удаляются все Accession, присутствующие в меньше, чем в
+    Из матрицы удаляются все Accession, присутствующие в меньше, чем в
     minGroupsWithAccession группах. Accession считается отсутствуюющим в
     группе, если он отсутствует в больше, чем maxGroupAbsence таблицах внутри
     группы.
 
     Args:
-        accessionTables: Экземпляр класса Classes.AccessionTables, к которому
+        accessionMatrix: Экземпляр класса Classes.AccessionMatrix, к которому
             применяется фильтр
         maxGroupAbsence: максимально возможное количество таблиц без Accession
             в группе
         minGroupsWithAccession: минимальное количество групп с accession
     """
-    groups: Dict[str, List[str]] = GenerateGroupsBunch(accessionTables)
+    tableRows = accessionMatrix.GetTableRows()
+    groups: Dict[str, List[str]] = GenerateGroupsBunch(tableRows)
 
-    accessionBunch = accessionTables.GenerateAccessionsBunchOverAllTables()
-    for accession in accessionBunch:
-        if (
-            CountGroupsWithAccession(
-                groups, accession, maxGroupAbsence, accessionTables
-            )
-            < minGroupsWithAccession
-        ):
-            accessionTables.RemoveAccessionFromAllTables(accession)
+    accessionMatrix.KeepRows(
+        PresenceMatrix(tableRows).GetAccessionsInGroups(
+            groups, maxGroupAbsence, minGroupsWithAccession
+        )
+    )
 
 
 def CalculateAccessionsNormRatios(
-    accessionTables: AccessionTables, tableSumms: Dict[str, Dict[str, Decimal]]
+    accessionMatrix: AccessionMatrix,
+    tableSumms: Dict[str, Dict[str, Decimal]],
 ) -> None:
     """Подсчёт нормализованных значений PSignalNormToFileNormRatio и
     ScNormToFileNormRatio
@@ -148,37 +93,33 @@ def CalculateAccessionsNormRatios(
     в файле ScNormToFileNormRatio для всех accession
 
     Args:
-        accessionTables: Экземпляр класса Classes.AccessionTables, к которому
-            применяется фильтр
+        accessionMatrix: Экземпляр класса Classes.AccessionMatrix, в котором
+            заполняются плоскости нормализованных значений
         tableSumms: Словарь, содержащий суммы значений ScNorm и PSignalNorm
             для каждой таблицы
     """
-    for tableNum, curSumm in tableSumms.items():
-        for accession in accessionTables[tableNum].values():
-            accession.ScNormToFileNormRatio = (
-                (accession.ScNorm / curSumm["ScNorm"])
-                if curSumm["ScNorm"] != 0
-                else Decimal(0)
-            )
-            accession.PSignalNormToFileNormRatio = (
-                (accession.PSignalNorm / curSumm["PSignalNorm"])
-                if curSumm["PSignalNorm"] != 0
-                else Decimal(0)
-            )
+    for fieldName, sourceFieldName in (
+        ("ScNormToFileNormRatio", "ScNorm"),
+        ("PSignalNormToFileNormRatio", "PSignalNorm"),
+    ):
+        accessionMatrix.SetRatios(
+            fieldName,
+            sourceFieldName,
+            [
+                tableSumms[tableNum][sourceFieldName]
+                for tableNum in accessionMatrix.tableNums
+            ],
+        )
 
 
 def GetScPsigAndNormFilesSumm(
-    accessionsPerTable: Dict[str, Dict[str, Accession]]
+    accessionMatrix: AccessionMatrix,
 ) -> Dict[str, Dict[str, Decimal]]:
-    """Получает суммы параметров Sc, Sequence, PrecursorSignal,
-    ScNorm, PSignalNorm по файлам
+    """Получает суммы параметров Sc, PrecursorSignal, ScNorm, PSignalNorm по
+    файлам — суммы по столбцам AccessionMatrix
 
     Args:
-        accessionsPerTable: Словарь {
-                "Номер таблицы": {
-                    "Имя Accession": Accession
-                }
-            }
+        accessionMatrix: Экземпляр класса Classes.AccessionMatrix
 
     Returns:
         Словарь с суммами {
@@ -190,23 +131,18 @@ def GetScPsigAndNormFilesSumm(
             }
         }
     """
-
-    fileSumms: Dict[str, Dict[str, Decimal]] = {}
-
-    for tableNum, curTable in accessionsPerTable.items():
-        fileSumms[tableNum] = {}
-        curSumm = fileSumms[tableNum]
-        curSumm["ScSumm"] = Decimal(0)
-        curSumm["PSignalSumm"] = Decimal(0)
-        curSumm["ScNorm"] = Decimal(0)
-        curSumm["PSignalNorm"] = Decimal(0)
-
-        for accession in curTable:
-            curSumm["ScSumm"] += Decimal(curTable[accession].ScSumm)
-            curSumm["ScNorm"] += Decimal(curTable[accession].ScNorm)
-            curSumm["PSignalSumm"] += Decimal(curTable[accession].PSignalSumm)
-            curSumm["PSignalNorm"] += Decimal(curTable[accession].PSignalNorm)
-    return fileSumms
+    fieldNames = ("ScSumm", "PSignalSumm", "ScNorm", "PSignalNorm")
+    columnSumms = {
+        fieldName: accessionMatrix.GetColumnSums(fieldName)
+        for fieldName in fieldNames
+    }
+    return {
+        tableNum: {
+            fieldName: columnSumms[fieldName][column]
+            for fieldName in fieldNames
+        }
+        for column, tableNum in enumerate(accessionMatrix.tableNums)
+    }
 
 
 def RemoveAccessionsListFromTable(
@@ -218,48 +154,32 @@ def RemoveAccessionsListFromTable(
         peptideTable: Peptide таблица
         blackList: список Accession для удаления
     """
-    i = 0
-    while i < len(peptideTable):
-        if peptideTable[i].name.split(";")[0] in blackList:
-            peptideTable.pop(i)
-            continue
-        i += 1
+    blackSet = set(blackList)
+    FilterTable(
+        peptideTable, lambda row: row.name.split(";")[0] not in blackSet)
 
 
-def ApplyBlackList(
-    rawPeptideTables: RawPeptideTables, blackList: List[str]
-) -> None:
-    """Удаляет из всех таблиц все id, находящиеся в чёрном списке
+def ReportBlackListCounts(removedCounts: Dict[str, int]) -> None:
+    """Выводит количество строк, удалённых по правилам чёрного списка
 
     Args:
-        rawPeptideTables: словарь с таблицами Peptide вида: {
-                "номер таблицы": RawPeptideTable
-            }
-        blackList: список Accession, находящихся в чёрном списке
+        removedCounts: количество удалённых строк по правилам (см.
+            RowPipeline)
     """
-
-    curTable: RawPeptideTable
-    for curTable in rawPeptideTables.values():
-        curTable.RemoveRowsWithAccessions(blackList)
+    print(f"ID exclusion list: {sum(removedCounts.values())} rows removed")
+    for rule, count in sorted(
+        removedCounts.items(), key=lambda item: (-item[1], item[0])
+    ):
+        print(f"\t{rule}: {count}")
 
 
-def TestConfParams(
-    conf: Comparable,
-    peptideTable: PeptideTable,
-    tableNum: str,
-    tableRowNum: int,
-) -> bool:
-    """Проверка confidence параметра
+def ReportRepresentativeStats(stats: RepresentativeStats) -> None:
+    """Выводит статистику выбора репрезентативных Accession
 
     Args:
-        conf: параметр фильтра confidence
-        peptideTable: Peptide таблица
-        tableNum: номер таблицы, в которой находится значение
-        tableRowNum: номер строк в таблице
+        stats: статистика выбора (см. PeptideTables.representativeStats)
     """
-    if conf.compare(peptideTable[tableRowNum].confidence, tableNum):
-        return True
-    return False
+    print(f"Representative accessions: {stats}")
 
 
 def ApplyPeptideConfidenceFilter(
@@ -275,50 +195,40 @@ def ApplyPeptideConfidenceFilter(
     """
 
     for tableNum, curTable in peptideTables.items():
-        i = 0
+        CompactTable(
+            curTable, conf.compareMany(GetConfidences(curTable), tableNum))
 
-        while i < len(curTable):
-            if not TestConfParams(conf, curTable, tableNum, i):
-                curTable.pop(i)
-                continue
-            i += 1
 
-
-def TestConfDefaultCondition(confVal: Decimal) -> int:
-    """Проверка default-условия для confidence
+def GetConfidences(
+    peptideTable: Union[PeptideTable, RawPeptideTable]
+) -> Sequence[Decimal]:
+    """Получает значения confidence всех строк таблицы
 
     Args:
-        confVal: значение confidence, которое проверяется
+        peptideTable: Peptide таблица
 
     Returns:
-        2, если confVal >= 99
-        1, если confVal >= 95
-        иначе 0
+        Столбец confidence для ArrayPeptideTable и ArrayRawPeptideTable,
+        иначе список значений
     """
-    if confVal >= Decimal("99"):
-        return 2
-    if confVal >= Decimal("95"):
-        return 1
-    return 0
+    if isinstance(peptideTable, (ArrayPeptideTable, ArrayRawPeptideTable)):
+        return peptideTable.confidence
+    return [row.confidence for row in peptideTable]
 
 
-def GenerateTableAccessionsBunch(peptideTable: PeptideTable) -> Dict[str, int]:
-    """Создание словаря, содержащего все accession из данной таблицы в качестве
-    ключей и 0 в качестве значений
+def KeepPassedAccessions(
+    peptideTable: PeptideTable,
+    accessionIds: Sequence[int],
+    passedIds: Set[int],
+) -> None:
+    """Оставляет в таблице только строки с Accession из множества passedIds
 
     Args:
-        peptideTable: Таблица-результат чтения PeptideSummary файла с помощью
-            Classes.ReadTable
-
-    Returns:
-        Словарь, содержащий все accession данной таблицы в качестве ключей
-        и 0 в качестве значений
+        peptideTable: Peptide таблица
+        accessionIds: коды Accession строк таблицы
+        passedIds: коды оставляемых Accession
     """
-    accessionBunch: Dict[str, int] = {}
-    for line in peptideTable:
-        if line.name not in accessionBunch:
-            accessionBunch[line.name] = 0
-    return accessionBunch
+    CompactTable(peptideTable, list(map(passedIds.__contains__, accessionIds)))
 
 
 def ApplyConfidenceDefaultFilter(peptideTables: PeptideTables) -> None:
@@ -330,27 +240,30 @@ def ApplyConfidenceDefaultFilter(peptideTables: PeptideTables) -> None:
     из строк с ним имеет Conf >= 99 или минимум две строки имеют
     Conf >= 95
 
+    Условие проверяется группировкой строк по коду Accession за один проход:
+    для каждого Accession определяется, достигает ли наибольший confidence
+    99, и подсчитывается количество строк с Conf >= 95.
+
     Args:
         peptideTables: словарь вида: {
                 "Номер таблицы": PeptideTable
             }
     """
+    atLeast95 = Comparable(">=", "95")
+    atLeast99 = Comparable(">=", "99")
     for curTable in peptideTables.values():
-        curTableLen = len(curTable)
-        # Заносим все Accession в список Accession для удаления
-        # В процессе чтения списка записи из него будут удаляться
-        blackList = GenerateTableAccessionsBunch(curTable)
-        i = 0
-        while i < curTableLen:
-            curAccession = curTable[i].name
-            if curAccession in blackList:
-                blackList[curAccession] += TestConfDefaultCondition(
-                    Decimal(curTable[i].confidence)
-                )
-                if blackList[curAccession] > 1:
-                    del blackList[curAccession]
-            i += 1
-        RemoveAccessionsListFromTable(curTable, [*blackList])
+        accessionIds = list(curTable.IterAccessionIds())
+        confidences = GetConfidences(curTable)
+        highIds = list(compress(
+            accessionIds, atLeast95.compareMany(confidences)))
+        passedIds = set(compress(
+            accessionIds, atLeast99.compareMany(confidences)))
+        passedIds.update(
+            accessionId
+            for accessionId, count in Counter(highIds).items()
+            if count > 1
+        )
+        KeepPassedAccessions(curTable, accessionIds, passedIds)
 
 
 def ApplyProteinConfidenceFilter(
@@ -375,18 +288,10 @@ def ApplyProteinConfidenceFilter(
         ApplyConfidenceDefaultFilter(peptideTables)
     else:
         for tableNum, curTable in peptideTables.items():
-            curTableLen = len(curTable)
-            # Заносим все Accession в список Accession для удаления
-            # В процессе чтения списка записи из него будут удаляться
-            blackList = GenerateTableAccessionsBunch(curTable)
-            i = 0
-            while i < curTableLen:
-                curAccession = curTable[i].name
-                if curAccession in blackList:
-                    if confID.compare(curTable[i].confidence, tableNum):
-                        del blackList[curAccession]
-                i += 1
-            RemoveAccessionsListFromTable(curTable, [*blackList])
+            accessionIds = list(curTable.IterAccessionIds())
+            passedIds = set(compress(accessionIds, confID.compareMany(
+                GetConfidences(curTable), tableNum)))
+            KeepPassedAccessions(curTable, accessionIds, passedIds)
 
 
 def GetFileLines(filename: str) -> Union[List[str], None]:
@@ -425,28 +330,48 @@ def FindFastaFile(inputPath: str) -> str:
     raise FileNotFoundError(f'Fasta file not found in folder "{inputPath}"!')
 
 
-def TestFastaAccessions(
+def GetNotFoundAccessions(
     seqDB: SequenceDatabase,
     rawPeptideTables: RawPeptideTables,
     proteinTables: Optional[Dict[str, ProteinTable]] = None,
-) -> None:
+) -> Set[str]:
+    """Находит Accession, отсутствующие в базе данных последовательностей
+
+    Args:
+        seqDB: база данных последовательностей
+        rawPeptideTables: считанные построчно Peptide таблицы
+        proteinTables: Protein таблицы
+
+    Returns:
+        Множество не обратных Accession, отсутствующих в seqDB
+    """
+    # Каждый различный Accession ищется в seqDB один раз
+    accessions: Set[str] = set()
     rawPeptideTable: RawPeptideTable
-    notFoundAccessions: Set[str] = set()
     for rawPeptideTable in rawPeptideTables.values():
         peptideRow: PeptideRow
         for peptideRow in rawPeptideTable:
-            for accession in peptideRow.accessions:
-                if accession not in seqDB and not IsReversed(accession):
-                    notFoundAccessions.add(accession)
+            accessions.update(peptideRow.accessions)
     if proteinTables is not None:
         proteinTable: ProteinTable
         for proteinTable in proteinTables.values():
             proteinAccession: ProteinAccession
             for proteinAccession in proteinTable:
-                if proteinAccession.name not in seqDB and not IsReversed(
-                    proteinAccession.name
-                ):
-                    notFoundAccessions.add(proteinAccession.name)
+                accessions.add(proteinAccession.name)
+    return {
+        accession
+        for accession in accessions
+        if accession not in seqDB and not IsReversed(accession)
+    }
+
+
+def RaiseNotFoundAccessions(notFoundAccessions: Set[str]) -> None:
+    """Выводит список и вызывает исключение, если есть Accession,
+    отсутствующие в базе данных последовательностей
+
+    Args:
+        notFoundAccessions: множество отсутствующих Accession
+    """
     if len(notFoundAccessions) > 0:
         print(
             f"ERROR! missing {len(notFoundAccessions)} sequences:\n\t"
@@ -455,35 +380,87 @@ def TestFastaAccessions(
         raise KeyError("ERROR! Missing sequences (check above)!")
 
 
+def GetOptions(arguments: List[str]) -> Tuple[Namespace, List[str]]:
+    """Отделяет именованные параметры от позиционных
+
+    Args:
+        arguments: аргументы командной строки без имени программы
+
+    Returns:
+        Именованные параметры и оставшиеся позиционные аргументы
+    """
+    parser = ArgumentParser(add_help=False)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--cache", default=None)
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--array-tables", action="store_true")
+    parser.add_argument(
+        "--numeric", choices=AccessionTables.NUMERIC_BACKENDS,
+        default="decimal"
+    )
+    parser.add_argument("--verify-tables", type=int, default=0)
+    parser.add_argument("--fasta-index", action="store_true")
+    parser.add_argument("--fasta-snapshot", action="store_true")
+    parser.add_argument("--sweep", default=None)
+    return parser.parse_known_args(arguments)
+
+
 def GetInput() -> Input:
     """Получение параметров для запуска обработки
 
     Returns:
         Класс Input, содержащий все нужные параметры для запуска обработки
     """
+    options, arguments = GetOptions(argv[1:])
+    arguments = argv[:1] + arguments
     inputParams = Input()
     inputParams.rootPath = "."
     inputParams.inputPath = "./Input"
-    inputParams.seqDB = SequenceDatabase.fromFile(
-        FindFastaFile(inputParams.rootPath)
+    inputParams.jobs = (
+        options.jobs if options.jobs > 0 else (cpu_count() or 1)
     )
-    if len(argv) == 8:
-        blackListLines = GetFileLines(argv[1])
-        inputParams.fdr = argv[1]
+    inputParams.cachePath = options.cache
+    inputParams.cacheSize = options.cache_size << 20
+    inputParams.arrayTables = options.array_tables
+    inputParams.numericBackend = options.numeric
+    inputParams.verifyTables = options.verify_tables
+    inputParams.sweepPath = options.sweep
+    seqDBFilename = FindFastaFile(inputParams.rootPath)
+    if options.fasta_snapshot:
+        inputParams.seqDB = SequenceDatabase.fromSnapshot(
+            seqDBFilename, withSequences=not options.fasta_index
+        )
+    elif options.fasta_index:
+        inputParams.seqDB = SequenceDatabase.fromIndexedFile(seqDBFilename)
+    else:
+        inputParams.seqDB = SequenceDatabase.fromFile(seqDBFilename)
+    if len(arguments) == 8:
+        blackListLines = GetFileLines(arguments[1])
+        try:
+            inputParams.fdr = arguments[1]
+        except ValueError as error:
+            raise SystemExit(f"ERROR! {error}")
         inputParams.blackList = (
-            (argv[2], blackListLines) if blackListLines is not None else None
+            (arguments[2], blackListLines)
+            if blackListLines is not None
+            else None
         )
-        inputParams.proteinConfidence = argv[4]
-        inputParams.proteinGroupingConfidence = argv[5]
-        inputParams.confPeptide = argv[6]
-        inputParams.minGroupsWithAccession = int(argv[7])
-        inputParams.maxGroupAbsence = int(argv[8])
+        inputParams.proteinConfidence = arguments[4]
+        inputParams.proteinGroupingConfidence = arguments[5]
+        inputParams.confPeptide = arguments[6]
+        inputParams.minGroupsWithAccession = int(arguments[7])
+        inputParams.maxGroupAbsence = int(arguments[8])
     else:
         print('"ProteinPilot summary analyzer"')
         print("#Protein filter")
-        inputParams.fdr = input(
-            "Global FDR critical value (<% k or default): "
-        )
+        while True:
+            try:
+                inputParams.fdr = input(
+                    "Global FDR critical value (<% k r or default): "
+                )
+                break
+            except ValueError as error:
+                print(f"ERROR! {error}")
         blackListFile = input("ID exclusion list: ")
         blackListLines = GetFileLines(blackListFile)
         inputParams.blackList = (
@@ -0,0 +1,137 @@
+from array import array
+from bisect import bisect_left
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+from typing import List, Optional, Sequence, Tuple
+
+
+class GlobalFDR:
+    """Глобальный FDR для каждой границы таблицы
+
+    Строки таблицы упорядочиваются по убыванию confidence. Строки без
+    непустых Accession в подсчёт не передаются (см.
+    FDRFilter.GetScoredRows). Границы проходят только между строками с
+    различными confidence, поэтому строки с одинаковым confidence остаются
+    или удаляются вместе. Если граница проходит после первых N строк, то
+    глобальный FDR равен D(N) / N * 100 * k, где D(N) — количество обратных
+    строк (строк, все Accession которых обратные) среди первых N строк, а
+    k — поправочный коэффициент.
+
+    Количества обратных строк считаются за один проход по строкам, после
+    чего FDR делается неубывающим (q-value): для каждой границы берётся
+    наименьший FDR среди этой и всех последующих границ. Поэтому граница для
+    любого критического значения находится двоичным поиском (см.
+    GetCutoffCount). Элемент i — q-value i-й границы, делённый на 100 * k.
+
+    Attributes:
+        order: номера строк таблицы в порядке убывания confidence
+        isDecoy: является ли обратной каждая строка таблицы
+        boundaries: количество строк до каждой границы
+        decoyCounts: числители q-value (количество обратных строк)
+        rowCounts: знаменатели q-value (количество строк)
+    """
+
+    order: List[int]
+    isDecoy: Sequence[bool]
+    boundaries: array
+    decoyCounts: array
+    rowCounts: array
+
+    def __init__(
+        self, confidences: Sequence[Decimal], isDecoy: Sequence[bool]
+    ) -> None:
+        """
+        Args:
+            confidences: confidence каждой строки таблицы
+            isDecoy: является ли обратной каждая строка таблицы
+        """
+        self.isDecoy = isDecoy
+        self.order = sorted(
+            range(len(confidences)),
+            key=confidences.__getitem__,
+            reverse=True,
+        )
+        boundaries = array("q")
+        decoyCounts = array("q")
+        decoyCount = 0
+        for i, rowIndex in enumerate(self.order):
+            decoyCount += isDecoy[rowIndex]
+            # Граница после строки, если следующая строка имеет другой
+            # confidence или строка последняя
+            if (i + 1 == len(self.order)
+                    or confidences[self.order[i + 1]]
+                    != confidences[rowIndex]):
+                boundaries.append(i + 1)
+                decoyCounts.append(decoyCount)
+        rowCounts = array("q", boundaries)
+        # Наименьшая дробь decoyCount / rowCount, начиная с конца
+        for i in range(len(boundaries) - 2, -1, -1):
+            if (decoyCounts[i] * rowCounts[i + 1]
+                    > decoyCounts[i + 1] * rowCounts[i]):
+                decoyCounts[i] = decoyCounts[i + 1]
+                rowCounts[i] = rowCounts[i + 1]
+        self.boundaries = boundaries
+        self.decoyCounts = decoyCounts
+        self.rowCounts = rowCounts
+
+    @staticmethod
+    def ParseParams(fdr: Optional[str]) -> Optional[Tuple[Decimal, Decimal]]:
+        """Разбирает параметр FDR фильтра
+
+        Формат "<% k r": критическое значение в процентах, необязательный
+        коэффициент k и необязательный параметр r, который не используется
+        (оценка k по данным, например "1 kest 30", не поддерживается: k
+        должен быть числом)
+
+        Args:
+            fdr: параметр FDR фильтра вида "default" или "<% k r"
+
+        Returns:
+            Критическое значение в процентах и коэффициент k или None для
+            default фильтра
+        """
+        if fdr is None or fdr.strip() in ("", "default"):
+            return None
+        values = fdr.strip().lstrip("<").replace("%", " ").split()
+        if len(values) > 3:
+            raise ValueError(
+                f'Wrong global FDR critical value (expected "<% k r" or '
+                f'default): {fdr}')
+        try:
+            criticalValue = Decimal(values[0])
+        except InvalidOperation:
+            raise ValueError(f"Wrong global FDR critical value: {fdr}")
+        try:
+            k = Decimal(values[1]) if len(values) > 1 else Decimal(1)
+        except InvalidOperation:
+            raise ValueError(
+                f"FDR coefficient k must be a number (estimation of k is "
+                f"not supported): {fdr}")
+        if not k > 0:
+            raise ValueError(f"FDR coefficient must be positive: {fdr}")
+        return criticalValue, k
+
+    def __len__(self) -> int:
+        return len(self.boundaries)
+
+    def __getitem__(self, index: int) -> Fraction:
+        return Fraction(self.decoyCounts[index], self.rowCounts[index])
+
+    def GetCutoffCount(
+        self, criticalValue: Decimal, k: Decimal = Decimal(1)
+    ) -> int:
+        """Находит границу, до которой глобальный FDR меньше критического
+        значения
+
+        Args:
+            criticalValue: критическое значение глобального FDR в процентах
+            k: поправочный коэффициент
+
+        Returns:
+            Количество строк (в порядке order) до границы
+        """
+        if k <= 0:
+            raise ValueError(f"FDR coefficient must be positive: {k}")
+        boundaryCount = bisect_left(
+            self, Fraction(criticalValue) / (100 * Fraction(k)))
+        return self.boundaries[boundaryCount - 1] if boundaryCount else 0
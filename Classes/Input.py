@@ -1,5 +1,6 @@
 from typing import List, Union, Optional, Tuple
 from Classes.Comparable import Comparable
+from Classes.GlobalFDR import GlobalFDR
 from Classes.SequenceDatabase import SequenceDatabase
 
 
@@ -10,7 +11,8 @@ class Input:
         rootPath: путь для поиска базы данных fasta
         inputPath: путь для таблиц
         outputPath: путь для выходных файлов
-        fdr: параметры FDR фильтра
+        fdr: параметры FDR фильтра. Проверяются при присваивании (см.
+            GlobalFDR.ParseParams)
         seqDB: база данных с длинами последовательностей для Accession
         proteinConfidence: параметр фильтра Protein confidence
         proteinGroupingConfidence: параметр фильтра Protein grouping (conf)
@@ -18,12 +20,25 @@ class Input:
         blackList: чёрный список Accession
         minGroupsWithAccession: минимум групп с Accession
         maxGroupAbsence: максимальное количество таблиц в группе без Accession
+        jobs: количество процессов для обработки таблиц
+        cachePath: папка кэша считанных таблиц или None, если кэш не
+            используется
+        cacheSize: максимальный размер кэша считанных таблиц в байтах
+        arrayTables: хранить Peptide таблицы в массивах (ArrayRawPeptideTable
+            и ArrayPeptideTable) вместо списков объектов строк
+        numericBackend: "decimal" — считать параметры Accession в Decimal,
+            "float" — в float (быстрее, но с погрешностью)
+        verifyTables: количество таблиц, для которых при numericBackend ==
+            "float" параметры также считаются в Decimal для оценки
+            погрешности (см. NumericVerification)
+        sweepPath: файл сетки параметров для обработки с несколькими
+            наборами параметров (см. ParameterSweep) или None
     """
 
     rootPath: str
     inputPath: str
     outputPath: str = "Output"
-    fdr: str
+    __fdr: str = "default"
     seqDB: SequenceDatabase
     __proteinConfidence: Comparable
     __proteinGroupingConfidence: Comparable
@@ -32,6 +47,22 @@ class Input:
     blackList: Optional[Tuple[str, List[str]]]
     minGroupsWithAccession: int
     maxGroupAbsence: int
+    jobs: int = 1
+    cachePath: Optional[str] = None
+    cacheSize: int = 1 << 30
+    arrayTables: bool = False
+    numericBackend: str = "decimal"
+    verifyTables: int = 0
+    sweepPath: Optional[str] = None
+
+    @property
+    def fdr(self):
+        return self.__fdr
+
+    @fdr.setter
+    def fdr(self, val):
+        GlobalFDR.ParseParams(val)
+        self.__fdr = val
 
     @property
     def proteinConfidence(self):
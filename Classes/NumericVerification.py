@@ -0,0 +1,134 @@
+"""Проверка точности подсчёта в float (inputParams.numericBackend == "float")
+
+Для выборки таблиц параметры Accession дополнительно считаются в Decimal,
+после чего для каждого выходного файла находится наибольшее относительное
+отклонение значений, посчитанных в float, от значений, посчитанных в
+Decimal. Нормализованные значения зависят только от своей таблицы, поэтому
+для проверки достаточно посчитать в Decimal только таблицы выборки.
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Union
+from .AccessionMatrix import AccessionMatrix
+from .AccessionTables import AccessionTables
+from .Functions import CalculateAccessionsNormRatios, GetScPsigAndNormFilesSumm
+from .Output import Output
+from .PeptideTables import PeptideTables
+from .Sequence import Sequence
+
+JOINT_OUTPUT_FILENAME = "output.txt"
+
+
+def SelectVerificationTables(
+    tableNums: Iterable[str], count: int
+) -> List[str]:
+    """Выбирает таблицы для проверки, равномерно по отсортированному
+    списку номеров таблиц
+
+    Args:
+        tableNums: номера всех таблиц
+        count: количество таблиц для проверки
+
+    Returns:
+        Номера выбранных таблиц
+    """
+    sortedTableNums = sorted(tableNums, key=lambda x: float(x))
+    if count >= len(sortedTableNums):
+        return sortedTableNums
+    if count <= 0:
+        return []
+    step = len(sortedTableNums) / count
+    return [sortedTableNums[int(i * step)] for i in range(count)]
+
+
+def GetReferenceTables(
+    seqDB: Dict[str, Sequence],
+    peptideTables: PeptideTables,
+    tableNums: Iterable[str],
+) -> AccessionTables:
+    """Считает параметры Accession выбранных таблиц в Decimal
+
+    Args:
+        seqDB: база данных последовательностей Accession
+        peptideTables: Peptide таблицы после фильтров по confidence
+        tableNums: номера таблиц для проверки
+
+    Returns:
+        AccessionTables выбранных таблиц. Нормализованные значения
+        подсчитываются в ReportNumericDeviations
+    """
+    return AccessionTables(seqDB, peptideTables, "decimal", set(tableNums))
+
+
+def GetRelativeDeviation(
+    value: Union[Decimal, float, int], reference: Union[Decimal, int]
+) -> float:
+    """Получает относительное отклонение value от reference
+
+    Если reference равно 0, возвращается абсолютное отклонение
+    """
+    deviation = abs(float(value) - float(reference))
+    if reference != 0:
+        deviation /= abs(float(reference))
+    return deviation
+
+
+def GetMaxRelativeDeviations(
+    accessionMatrix: AccessionMatrix, referenceMatrix: AccessionMatrix
+) -> Dict[str, float]:
+    """Находит наибольшее относительное отклонение значений для каждого
+    выходного файла
+
+    Сравниваются только Accession'ы, присутствующие в обеих матрицах.
+
+    Args:
+        accessionMatrix: AccessionMatrix, посчитанная в float
+        referenceMatrix: AccessionMatrix, посчитанная в Decimal, с тем же
+            словарём кодов Accession
+
+    Returns:
+        Словарь вида {"имя выходного файла": отклонение}
+    """
+    deviations: Dict[str, float] = {}
+    for fieldName, filename, _ in Output.FIELDS_TO_FILES:
+        maxDeviation = 0.0
+        for tableNum in referenceMatrix.tableNums:
+            column = accessionMatrix.GetColumn(tableNum, fieldName)
+            for accessionId, reference in referenceMatrix.GetColumn(
+                tableNum, fieldName
+            ).items():
+                if accessionId in column:
+                    maxDeviation = max(maxDeviation, GetRelativeDeviation(
+                        column[accessionId], reference))
+        deviations[filename] = maxDeviation
+    deviations[JOINT_OUTPUT_FILENAME] = max(deviations.values())
+    return deviations
+
+
+def ReportNumericDeviations(
+    accessionMatrix: AccessionMatrix,
+    referenceTables: Optional[AccessionTables],
+) -> None:
+    """Выводит наибольшие отклонения от значений, посчитанных в Decimal,
+    если были посчитаны проверочные таблицы
+
+    Args:
+        accessionMatrix: AccessionMatrix, посчитанная в float, после
+            CalculateAccessionsNormRatios
+        referenceTables: проверочные таблицы (AccessionTables.referenceTables)
+            или None
+    """
+    if referenceTables is None:
+        return
+    referenceMatrix = AccessionMatrix(referenceTables)
+    CalculateAccessionsNormRatios(
+        referenceMatrix, GetScPsigAndNormFilesSumm(referenceMatrix)
+    )
+    print(
+        "Float backend verification ("
+        + ", ".join(referenceMatrix.tableNums)
+        + "), max relative deviation:"
+    )
+    for filename, deviation in GetMaxRelativeDeviations(
+        accessionMatrix, referenceMatrix
+    ).items():
+        print(f"\t{filename}: {deviation:.3e}")
@@ -1,13 +1,13 @@
-from decimal import localcontext, Decimal
-from typing import Dict, Tuple, List, Optional, Set
+from decimal import Decimal
+from typing import Dict, Tuple, List, Optional
 from os import makedirs, path
-from Classes.AccessionTables import AccessionTables
+from Classes.AccessionMatrix import AccessionMatrix
 from Classes.Sequence import Sequence
-from Classes.Accession import Accession
 from Classes.ProteinGroupsDB import ProteinGroupsDB
 from Classes.ProteinGroup import ProteinGroup
 from Classes.Errors import RepresentativeAccessionNotFoundError
 from Classes.Input import Input
+from Classes.ValueFormatter import ValueFormatter
 
 
 class Output:
@@ -16,17 +16,25 @@ class Output:
     Attributes:
         outputDirPath: путь для выходных файлов
         seqDB: база данных последовательностей Accession
-        accessionTables: таблицы с Accession вида: {
-                "Номер таблицы": {
-                    "Имя Accession": Accession
-                }
-            }
+        accessionMatrix: матрица значений Accession по таблицам
         proteinGroupsDB: база данных с Protein группами
     """
+    # Поле Accession, имя файла и нужно ли добавлять столбцы Description и
+    # Sequence Length
+    FIELDS_TO_FILES: Tuple[Tuple[str, str, bool], ...] = (
+        ("Counts", "Pep_counts.txt", False),
+        ("SeqlenSumm", "Pep_seq_length_summ.txt", False),
+        ("ScNormToFileNormRatio", "Sc_norm.txt", False),
+        ("ScSumm", "Sc_summ.txt", False),
+        ("PSignalNormToFileNormRatio", "Pep_intensity_norm.txt", False),
+        ("PSignalSumm", "Pep_intensity_summ.txt", False),
+    )
+    # Количество строк, записываемых в выходную таблицу за один вызов
+    WRITE_BATCH_SIZE: int = 1024
+
     inputParams: Input
-    _accessionsBunch: Dict[str, Dict[str, Accession]]
     seqDB: Dict[str, Sequence]
-    accessionTables: AccessionTables
+    accessionMatrix: AccessionMatrix
     proteinGroupsDB: Optional[ProteinGroupsDB]
     formattedProteinGroups: Optional[
         Dict[str, Dict[str, List[Decimal]]]] = None
@@ -35,12 +43,12 @@ class Output:
             self,
             inputParams: Input,
             seqDB: Dict[str, Sequence],
-            accessionTables: AccessionTables,
+            accessionMatrix: AccessionMatrix,
             proteinGroupsDB: ProteinGroupsDB = None) -> None:
 
         self.seqDB: Dict[str, Sequence] = seqDB
         self.inputParams: str = inputParams
-        self.accessionTables: AccessionTables = accessionTables
+        self.accessionMatrix: AccessionMatrix = accessionMatrix
         self.proteinGroupsDB = proteinGroupsDB
         if proteinGroupsDB:
             self.ConvertProteinGroupsToOutputFormat()
@@ -92,21 +100,8 @@ class Output:
         """Создаёт все выходные файлы"""
         if not path.exists(self.inputParams.outputPath):
             makedirs(self.inputParams.outputPath)
-        self._accessionsBunch = (
-            self.accessionTables.GenerateAccessionsBunchOverAllTables())
-
-        # поле типа bool обозначает нужно ли добавлять столбцы Description и
-        # Sequence Length
-        fieldsToFiles: Tuple[Tuple[str, str, bool], ...] = (
-            ("Counts", "Pep_counts.txt", False),
-            ("SeqlenSumm", "Pep_seq_length_summ.txt", False),
-            ("ScNormToFileNormRatio", "Sc_norm.txt", False),
-            ("ScSumm", "Sc_summ.txt", False),
-            ("PSignalNormToFileNormRatio", "Pep_intensity_norm.txt", False),
-            ("PSignalSumm", "Pep_intensity_summ.txt", False),
-        )
 
-        for field, filename, isAdditionalColumns in fieldsToFiles:
+        for field, filename, isAdditionalColumns in self.FIELDS_TO_FILES:
             self.GenerateTableFileByField(field, filename, isAdditionalColumns)
 
         self.GenerateSequencesFiles(("sequences.fasta", "sequences.txt"))
@@ -130,37 +125,30 @@ class Output:
             isAdditionalColumns: нужно ли добавлять столбцы Description и
                 Sequence Length
         """
+        accessionMatrix = self.accessionMatrix
+        formatter = ValueFormatter()
+        names = accessionMatrix.accessionDictionary.names
         with open(self.GetJoinedOutputFilename(filename), 'w') as outFile:
-            outFile.write("Accession")
+            header = ["Accession"]
             if isAdditionalColumns:
-                outFile.write("\tDescription\tSequence length")
-            outFile.write(
-                ("\t{}" * len(self.accessionTables.sortedTableNums)).format(
-                    *self.accessionTables.sortedTableNums))
-            for accession in sorted(self._accessionsBunch.keys()):
-                outFile.write(f"\n{accession}")
+                header += ["Description", "Sequence length"]
+            outFile.write("\t".join(header + accessionMatrix.tableNums))
+            # Строки собираются одним join и записываются через буфер файла
+            # партиями, а не отдельным вызовом write для каждой ячейки
+            lines = []
+            for accession, values in zip(accessionMatrix.accessionIds,
+                                         accessionMatrix.IterRows(fieldName)):
+                name = names[accession]
+                cells = [name]
                 if isAdditionalColumns:
-                    outFile.write(f"\t{self.seqDB[accession].desc}"
-                                  f"\t{self.seqDB[accession].len}")
-                for tableNum in self.accessionTables.sortedTableNums:
-                    table = self.accessionTables[tableNum]
-                    if accession in table:
-                        # Создание локального контекста обязательно, иначе
-                        # все округления по какой-то причине начинают работать
-                        # неправильно! Например, число 0.60000000001
-                        # округляется до 0.600001, а не до 0.6
-                        with localcontext() as context:
-                            context.prec = max(
-                                1,
-                                7 + Decimal(
-                                    table[accession].__dict__[
-                                        fieldName]).adjusted())
-                            val = str(+table[accession].__dict__[fieldName])
-                            if '.' in val and "e" not in val.lower():
-                                val = val.rstrip("0").rstrip(".")
-                            outFile.write("\t{}".format(val))
-                    else:
-                        outFile.write('\t')
+                    cells += [self.seqDB[name].desc,
+                              str(self.seqDB[name].len)]
+                cells += formatter.FormatRow(values)
+                lines.append("\n" + "\t".join(cells))
+                if len(lines) >= self.WRITE_BATCH_SIZE:
+                    outFile.writelines(lines)
+                    lines.clear()
+            outFile.writelines(lines)
 
     def GenerateSequencesFiles(self, filenames: Tuple[str, str]) -> None:
         """Генерирует списки последовательностей по найденным Accession
@@ -172,11 +160,11 @@ class Output:
         """
         fastaFilename = filenames[0]
         txtFilename = filenames[1]
-        accessionsBunch: Set[Sequence] = set()
-        for tableName, table in self.accessionTables.items():
-            for accessionName in table:
-                accessionsBunch.add(accessionName)
-        sortedAccessionsBunch = sorted(accessionsBunch)
+        names = self.accessionMatrix.accessionDictionary.names
+        # Строки матрицы уже упорядочены по именам Accession
+        sortedAccessionsBunch = [
+            names[accession] for accession in
+            self.accessionMatrix.accessionIds]
         with open(self.GetJoinedOutputFilename(fastaFilename), 'w') as outFile:
             for accessionName in sortedAccessionsBunch:
                 currentSeqence = self.seqDB[accessionName]
@@ -252,6 +240,17 @@ class Output:
             ):
                 outFile.write(f"{reprAccession}\t{len(accessions) - 1}\n")
 
+    def GetFDRSettings(self) -> str:
+        """Получает параметр FDR фильтра и границы глобального FDR фильтра
+        для каждой таблицы для файла параметров"""
+        fdrCutoffs = self.accessionMatrix.fdrCutoffs
+        if fdrCutoffs is None:
+            return "default"
+        return self.inputParams.fdr.strip() + "".join(
+            f"\nFDR cutoff {tableNum}: {fdrCutoffs[tableNum]}"
+            for tableNum in sorted(fdrCutoffs, key=lambda x: float(x))
+        )
+
     def GenerateSettingsFile(self, filename: str) -> None:
         """Создаёт файл с информацией о параметрах запуска скрипта
 
@@ -263,8 +262,8 @@ class Output:
             outFile.write(
                 '"ProteinPilot summary analyzer"'
                 "\n#Protein filter-"
-                # TODO
-                "\nGlobal FDR critical value (<% k r or default): default"
+                "\nGlobal FDR critical value (<% k r or default): "
+                + self.GetFDRSettings() +
                 f"\nID exclusion list:" + (
                     ' ' + self.inputParams.blackList[0] if (
                         self.inputParams.blackList is not None
@@ -295,11 +294,24 @@ class Output:
             outFile.write("Accession\tFilename\tUnused\tseq_length_summ\t" +
                           "counts\tSc_summ\tPep_intensity__summ\tSc_norm\t" +
                           "Pep_intensity__norm\tseq_length")
-            for accessionName, accessionTables in sorted(
-                    self._accessionsBunch.items()):
-                for tableNum in sorted(accessionTables.keys(),
-                                       key=lambda x: float(x)):
-                    accession = accessionTables[tableNum]
+            accessionMatrix = self.accessionMatrix
+            names = accessionMatrix.accessionDictionary.names
+            rows = zip(
+                accessionMatrix.accessionIds,
+                accessionMatrix.IterRows("SeqlenSumm"),
+                accessionMatrix.IterRows("Counts"),
+                accessionMatrix.IterRows("ScSumm"),
+                accessionMatrix.IterRows("PSignalSumm"),
+                accessionMatrix.IterRows("ScNormToFileNormRatio"),
+                accessionMatrix.IterRows("PSignalNormToFileNormRatio"),
+            )
+            for accessionId, *fieldValues in rows:
+                accessionName = names[accessionId]
+                for tableNum, (seqlenSumm, counts, scSumm, pSignalSumm,
+                               scNorm, pSignalNorm) in zip(
+                        accessionMatrix.tableNums, zip(*fieldValues)):
+                    if counts is None:
+                        continue
                     outFile.write(
                         ("\n{accession}\t{tableNum}\t" +
                          "{seqlenSumm}\t{counts}\t{scSumm}\t" +
@@ -307,12 +319,12 @@ class Output:
                          "{seqlen}").format(
                              accession=accessionName,
                              tableNum=tableNum,
-                             seqlenSumm=accession.SeqlenSumm,
-                             counts=accession.Counts,
-                             scSumm=accession.ScSumm,
-                             pSignalSumm=accession.PSignalSumm,
-                             scNorm=accession.ScNormToFileNormRatio,
-                             pSignalNorm=accession.PSignalNormToFileNormRatio,
+                             seqlenSumm=seqlenSumm,
+                             counts=counts,
+                             scSumm=scSumm,
+                             pSignalSumm=pSignalSumm,
+                             scNorm=scNorm,
+                             pSignalNorm=pSignalNorm,
                              seqlen=self.seqDB[accessionName].len))
 
     def GetJoinedOutputFilename(self, filename: str):
@@ -0,0 +1,224 @@
+from copy import copy
+from itertools import product
+from os import makedirs, path
+from typing import Any, Dict, Iterable, List, Optional
+from .FDRCutoff import FDRCutoff
+from .Functions import (
+    RaiseNotFoundAccessions,
+    ReportBlackListCounts,
+    ReportRepresentativeStats,
+)
+from .Input import Input
+from .PeptideColumns import PeptideColumns
+from .PeptideTables import PeptideTables
+from .TableStages import (
+    FilterPeptideTables,
+    ReadRawPeptideTables,
+    WriteAccessionTables,
+)
+from .TableWorkers import TableWorkers
+
+
+def _CombinationsStage(state: Dict[str, Any]) -> List[str]:
+    """Обрабатывает комбинации параметров процесса TableWorkers
+
+    Номера таблиц процесса (state["tableNums"]) — имена комбинаций.
+
+    Returns:
+        Имена обработанных комбинаций
+    """
+    sweep: ParameterSweep = state["sweep"]
+    for name in state["tableNums"]:
+        sweep.RunCombination(name)
+    return state["tableNums"]
+
+
+class ParameterSweep:
+    """Обработка одних и тех же таблиц с несколькими наборами параметров
+
+    Таблицы считываются, проходят FDR фильтр, чёрный список и выбор
+    репрезентативных Accession один раз (см. Prepare). Для каждой комбинации
+    параметров фильтры по confidence применяются к копии Peptide таблиц
+    (PeptideTables.Snapshot), а выходные файлы записываются в отдельную
+    папку внутри inputParams.outputPath. Список папок и параметров
+    записывается в файл INDEX_FILENAME. При inputParams.jobs > 1 комбинации
+    распределяются между процессами TableWorkers.
+
+    Файл сетки параметров: в каждой строке имя параметра из PARAMETERS,
+    двоеточие и значения, разделённые "|", например:
+        confPeptide: >= 90 | >= 95
+        minGroupsWithAccession: 1 | 2
+    Пустое значение допустимо (например, отключает Protein confidence
+    фильтр). Параметры, отсутствующие в сетке, берутся из inputParams.
+
+    Attributes:
+        inputParams: параметры запуска обработки
+        grid: значения каждого параметра вида {
+                "имя параметра": ["значение", ...]
+            }
+        combinations: параметры запуска каждой комбинации вида {
+                "имя папки": Input
+            }
+        peptideTables: Peptide таблицы с выбранными репрезентативными
+            Accession или None, если Prepare ещё не вызван
+        fdrCutoffs: границы глобального FDR фильтра для каждой таблицы
+    """
+
+    PARAMETERS = (
+        "proteinConfidence",
+        "confPeptide",
+        "minGroupsWithAccession",
+        "maxGroupAbsence",
+    )
+    INTEGER_PARAMETERS = ("minGroupsWithAccession", "maxGroupAbsence")
+    INDEX_FILENAME = "sweep.txt"
+
+    inputParams: Input
+    grid: Dict[str, List[str]]
+    combinations: Dict[str, Input]
+    peptideTables: Optional[PeptideTables]
+    fdrCutoffs: Dict[str, FDRCutoff]
+
+    def __init__(self, inputParams: Input, grid: Dict[str, List[str]]):
+        """
+        Args:
+            inputParams: параметры запуска обработки
+            grid: значения каждого параметра (см. ReadGrid)
+        """
+        for name, values in grid.items():
+            if name not in self.PARAMETERS:
+                raise ValueError(f"Unknown sweep parameter: {name}")
+            if not len(values):
+                raise ValueError(f"No values for sweep parameter: {name}")
+        self.inputParams = inputParams
+        self.grid = {
+            name: list(grid[name]) for name in self.PARAMETERS
+            if name in grid
+        }
+        self.combinations = self.GetCombinations()
+        self.peptideTables = None
+        self.fdrCutoffs = {}
+
+    @staticmethod
+    def ReadGrid(lines: Iterable[str]) -> Dict[str, List[str]]:
+        """Разбирает строки файла сетки параметров
+
+        Args:
+            lines: строки файла сетки параметров
+
+        Returns:
+            Словарь вида {
+                "имя параметра": ["значение", ...]
+            }
+        """
+        grid: Dict[str, List[str]] = {}
+        for line in lines:
+            if not len(line.strip()):
+                continue
+            name, separator, values = line.partition(":")
+            if not separator:
+                raise ValueError(f"Wrong sweep grid line: {line}")
+            grid[name.strip()] = [
+                value.strip() for value in values.split("|")
+            ]
+        return grid
+
+    def GetCombinations(self) -> Dict[str, Input]:
+        """Получает параметры запуска для всех комбинаций значений сетки
+
+        Returns:
+            Словарь вида {
+                "имя папки": Input
+            }
+        """
+        combinations: Dict[str, Input] = {}
+        names = list(self.grid)
+        width = len(str(self.Count()))
+        for i, values in enumerate(product(*self.grid.values()), 1):
+            inputParams = copy(self.inputParams)
+            for name, value in zip(names, values):
+                setattr(
+                    inputParams,
+                    name,
+                    int(value) if name in self.INTEGER_PARAMETERS else value,
+                )
+            combinationName = f"sweep_{i:0{width}d}"
+            inputParams.outputPath = path.join(
+                self.inputParams.outputPath, combinationName
+            )
+            combinations[combinationName] = inputParams
+        return combinations
+
+    def Count(self) -> int:
+        """Получает количество комбинаций параметров"""
+        count = 1
+        for values in self.grid.values():
+            count *= len(values)
+        return count
+
+    def Prepare(self, columnNames: PeptideColumns) -> None:
+        """Считывает таблицы и выбирает репрезентативные Accession
+
+        Построчные таблицы после выбора не нужны и освобождаются.
+
+        Args:
+            columnNames: имена заголовков
+        """
+        rawPeptideTables = ReadRawPeptideTables(self.inputParams, columnNames)
+        if self.inputParams.blackList is not None:
+            ReportBlackListCounts(rawPeptideTables.blackListCounts)
+        RaiseNotFoundAccessions(
+            rawPeptideTables.accessionCatalog.notFoundAccessions)
+        self.peptideTables = PeptideTables(
+            rawPeptideTables, seqDB=self.inputParams.seqDB
+        )
+        ReportRepresentativeStats(self.peptideTables.representativeStats)
+        self.fdrCutoffs = rawPeptideTables.fdrCutoffs
+        rawPeptideTables.clear()
+
+    def RunCombination(self, name: str) -> None:
+        """Применяет фильтры к копии Peptide таблиц и записывает выходные
+        файлы одной комбинации параметров
+
+        Args:
+            name: имя комбинации (папки)
+        """
+        inputParams = self.combinations[name]
+        WriteAccessionTables(
+            inputParams,
+            FilterPeptideTables(
+                inputParams, self.peptideTables.Snapshot(), self.fdrCutoffs
+            ),
+        )
+
+    def WriteIndex(self) -> None:
+        """Записывает список папок и параметров комбинаций"""
+        if not path.exists(self.inputParams.outputPath):
+            makedirs(self.inputParams.outputPath)
+        with open(
+            path.join(self.inputParams.outputPath, self.INDEX_FILENAME), "w"
+        ) as outFile:
+            outFile.write("\t".join(["Folder", *self.grid]) + "\n")
+            for name, values in zip(
+                self.combinations, product(*self.grid.values())
+            ):
+                outFile.write("\t".join([name, *values]) + "\n")
+
+    def Run(self, columnNames: PeptideColumns) -> None:
+        """Обрабатывает все комбинации параметров
+
+        Args:
+            columnNames: имена заголовков
+        """
+        self.Prepare(columnNames)
+        self.WriteIndex()
+        if self.inputParams.jobs > 1 and len(self.combinations) > 1:
+            with TableWorkers(
+                self.inputParams.jobs,
+                {name: 1 for name in self.combinations},
+                {"sweep": self},
+            ) as workers:
+                workers.Run(_CombinationsStage)
+        else:
+            for name in self.combinations:
+                self.RunCombination(name)
@@ -9,3 +9,7 @@ class PeptideAccession:
     sc: Decimal = Decimal(0)
     precursorSignal: Decimal = Decimal(0)
     sequence: str = ""
+
+    @property
+    def sequenceLength(self) -> int:
+        return len(self.sequence)
@@ -34,3 +34,7 @@ class PeptideRow:
         self.sc = sc
         self.precursorSignal = precursorSignal
         self.sequence = sequence
+
+    @property
+    def sequenceLength(self) -> int:
+        return len(self.sequence)
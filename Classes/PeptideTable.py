@@ -1,22 +1,38 @@
+from copy import copy
 from decimal import Decimal
-from typing import List
+from operator import attrgetter
+from typing import Iterator, List, Optional
+from .AccessionDictionary import AccessionDictionary
 from .BaseClasses.Table import Table
 from .PeptideAccession import PeptideAccession
 from .PeptideColumns import PeptideColumns
+from .PeptideRow import PeptideRow
 
 
 class PeptideTable(Table):
-    """Считывает PeptideTable в список вида List[PeptideAccession]"""
+    """Считывает PeptideTable в список вида List[PeptideAccession]
+
+    Attributes:
+        columns: номера и имена считываемых столбцов
+        accessionDictionary: словарь кодов Accession
+    """
 
     columns: PeptideColumns
+    accessionDictionary: AccessionDictionary
 
     def __init__(
         self,
         tableFilename: str = None,
         unsafeFlag: bool = False,
         columns: PeptideColumns = PeptideColumns(),
+        accessionDictionary: Optional[AccessionDictionary] = None,
     ):
         self.columns = columns
+        self.accessionDictionary = (
+            accessionDictionary
+            if accessionDictionary is not None
+            else AccessionDictionary()
+        )
         super().__init__(tableFilename, unsafeFlag)
 
     def Load(self, tableFilename) -> List[PeptideAccession]:
@@ -36,6 +52,47 @@ class PeptideTable(Table):
             )
         return self
 
+    def AppendRow(self, row: PeptideRow, accessionId: int) -> None:
+        """Добавляет строку Peptide таблицы с репрезентативным Accession
+
+        Args:
+            row: строка RawPeptideTable
+            accessionId: код репрезентативного Accession
+        """
+        self.append(
+            PeptideAccession(
+                self.accessionDictionary.names[accessionId],
+                confidence=row.confidence,
+                sc=row.sc,
+                precursorSignal=row.precursorSignal,
+                sequence=row.sequence,
+            )
+        )
+
+    def IterAccessionIds(self) -> Iterator[int]:
+        """Получает код Accession каждой строки
+
+        Yields:
+            Код Accession строки
+        """
+        names = list(map(attrgetter("name"), self))
+        # Имена строк, добавленных AppendRow, уже есть в словаре, поэтому
+        # коды берутся напрямую из словаря ids
+        try:
+            return iter(list(map(self.accessionDictionary.ids.__getitem__,
+                                 names)))
+        except KeyError:
+            return map(self.accessionDictionary.GetId, names)
+
+    def Snapshot(self) -> 'PeptideTable':
+        """Создаёт копию таблицы, строки которой общие с исходной таблицей
+
+        Фильтры изменяют только список строк (см. Table.Compact), а не сами
+        строки, поэтому копию можно фильтровать независимо от исходной
+        таблицы.
+        """
+        return copy(self)
+
     def __str__(self):
         return self.__repr__()
 
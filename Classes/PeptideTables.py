@@ -1,12 +1,14 @@
-from Classes.PeptideAccession import PeptideAccession
 from Classes.Sequence import Sequence
 from collections import defaultdict
-from Classes.PeptideRow import PeptideRow
+from copy import copy
 from Classes.RawPeptideTable import RawPeptideTable
 from Classes.RawPeptideTables import RawPeptideTables
-from typing import Dict, List, Tuple
-from .PeptideTable import PeptideTable
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+from .AccessionCatalog import AccessionCatalog
+from .AccessionDictionary import AccessionDictionary
 from .ProteinPerTableList import ProteinPerTableList
+from .RepresentativeStats import RepresentativeStats
+from .TableFilter import FilterTable
 
 
 class PeptideTables(dict):
@@ -14,78 +16,132 @@ class PeptideTables(dict):
         "номер таблицы": PeptideTable,
     }
 
+    Репрезентативные Accession выбираются по кодам Accession из общего для
+    всех таблиц словаря rawPeptideTables.accessionDictionary.
+
     Attributes:
         rawPeptideTables: считанные построчно Peptide таблицы
         seqDB: база данных последовательностей Accession
+        accessionDictionary: словарь кодов Accession
+        accessionCatalog: каталог Accession таблиц
+            (RawPeptideTables.accessionCatalog)
+        representativeStats: статистика выбора репрезентативных Accession
+        globalRanks: ранги Accession среди всех таблиц (см. GetGlobalRank)
     """
 
     rawPeptideTables: RawPeptideTables
     seqDB: Dict[str, Sequence]
+    accessionDictionary: AccessionDictionary
+    accessionCatalog: AccessionCatalog
+    representativeStats: RepresentativeStats
+    globalRanks: Dict[int, Tuple[int, int]]
 
     def __init__(
         self,
         rawPeptideTables: RawPeptideTables,
         seqDB: Dict[str, Sequence],
+        generalCounts: Optional[Dict[int, int]] = None,
     ) -> None:
         """
         Args:
             rawPeptideTables: считанные построчно Peptide таблицы
             seqDB: база данных последовательностей Accession
+            generalCounts: количество появлений каждого Accession (по кодам)
+                во всех таблицах, если rawPeptideTables содержит только часть
+                таблиц
         """
 
         self.rawPeptideTables = rawPeptideTables
         self.seqDB = seqDB
-        self.ExtractFromRawPeptideTables()
+        self.accessionDictionary = rawPeptideTables.accessionDictionary
+        self.accessionCatalog = rawPeptideTables.accessionCatalog
+        self.ExtractFromRawPeptideTables(generalCounts)
         self.sortedTableNums = self.GetSortedTableNums()
 
-    def ExtractFromRawPeptideTables(self) -> None:
-        """Преобразовывает rawPeptideTables в PeptideTables"""
+    def ExtractFromRawPeptideTables(
+        self, generalCounts: Optional[Dict[int, int]] = None
+    ) -> None:
+        """Преобразовывает rawPeptideTables в PeptideTables
+
+        Args:
+            generalCounts: количество появлений каждого Accession во всех
+                таблицах. Если не задано, подсчитывается по rawPeptideTables
+        """
         tableNum: str
         table: RawPeptideTable
         countsPerTable = self.GetAccessionCountsPerTable()
-        generalCounts = self.GetGeneralAccessionCounts(countsPerTable)
+        if generalCounts is None:
+            generalCounts = self.accessionCatalog.generalCounts
+        stats = self.representativeStats = RepresentativeStats()
+        self.globalRanks = {}
         for tableNum, table in self.rawPeptideTables.items():
-            self[tableNum] = PeptideTable()
-            row: PeptideRow
+            peptideTable = self[tableNum] = table.CreatePeptideTable()
             print(tableNum)
-            for row in table:
-                representativeAccession = self.GetRepresentativeForRow(
-                    row,
-                    countsPerCurrentTable=countsPerTable[tableNum],
-                    generalCounts=generalCounts,
-                )
-                self[tableNum].append(
-                    PeptideAccession(
-                        representativeAccession,
-                        confidence=row.confidence,
-                        sc=row.sc,
-                        precursorSignal=row.precursorSignal,
-                        sequence=row.sequence,
+            countsPerCurrentTable = countsPerTable[tableNum]
+            # Строки с одинаковыми Accession в одной таблице получают один и
+            # тот же репрезентативный Accession
+            resolved: Dict[Tuple[int, ...], int] = {}
+            getResolved = resolved.get
+            singleAccessionRows = 0
+            for row, accessionIds in zip(table, table.IterAccessionIds()):
+                if len(accessionIds) == 1:
+                    singleAccessionRows += 1
+                    peptideTable.AppendRow(row, accessionIds[0])
+                    continue
+                key = tuple(accessionIds)
+                representativeAccession = getResolved(key)
+                if representativeAccession is None:
+                    representativeAccession = resolved[key] = (
+                        self.GetRepresentativeForRow(
+                            key, countsPerCurrentTable, generalCounts
+                        )
                     )
-                )
+                peptideTable.AppendRow(row, representativeAccession)
+            stats.rows += len(table)
+            stats.singleAccessionRows += singleAccessionRows
+            stats.cacheHits += (
+                len(table) - singleAccessionRows - len(resolved)
+            )
 
-    def GetAccessionCountsPerTable(self) -> Dict[str, Dict[str, int]]:
-        countsPerTable = {}
+    def GetAccessionCountsPerTable(self) -> Dict[str, Dict[int, int]]:
+        """Получает количество появлений каждого Accession в каждой
+        таблице из каталога Accession (RawPeptideTables.accessionCatalog).
+        Таблицы, строки которых не обрабатывались RowPipeline,
+        подсчитываются и добавляются в каталог
+        """
+        catalog = self.accessionCatalog
         for tableNum, table in self.rawPeptideTables.items():
-            countsPerTable[tableNum] = self.CountAccessionsInRawTable(table)
-        return countsPerTable
+            if tableNum not in catalog.tableCounts:
+                catalog.AddTable(
+                    tableNum, self.CountAccessionsInRawTable(table))
+        catalog.ResolveSequences(self.seqDB)
+        return catalog.tableCounts
 
     @staticmethod
     def CountAccessionsInRawTable(
         rawPeptideTable: RawPeptideTable,
-    ) -> Dict[str, int]:
-        counts: Dict[str, int] = defaultdict(lambda: 0)
-        row: PeptideRow
-        for row in rawPeptideTable:
-            for accession in row.accessions:
-                counts[accession] += 1
+    ) -> Dict[int, int]:
+        """Подсчитывает количество появлений каждого Accession в таблице
+
+        Returns:
+            Словарь вида {код Accession: количество появлений}
+        """
+        counts: Dict[int, int] = defaultdict(lambda: 0)
+        for accessionIds in rawPeptideTable.IterAccessionIds():
+            for accessionId in accessionIds:
+                counts[accessionId] += 1
         return counts
 
     @staticmethod
     def GetGeneralAccessionCounts(
-        countsPerTable: Dict[str, Dict[str, int]]
-    ) -> Dict[str, int]:
-        generalCounts: Dict[str, int] = defaultdict(lambda: 0)
+        countsPerTable: Dict[str, Dict[Hashable, int]]
+    ) -> Dict[Hashable, int]:
+        """Суммирует количество появлений Accession по всем таблицам
+
+        Ключами могут быть как коды, так и имена Accession (при параллельной
+        обработке количество передаётся между процессами по именам).
+        """
+        generalCounts: Dict[Hashable, int] = defaultdict(lambda: 0)
         for table in countsPerTable.values():
             for accession, count in table.items():
                 generalCounts[accession] += count
@@ -93,10 +149,10 @@ class PeptideTables(dict):
 
     def GetRepresentativeForRow(
         self,
-        row: PeptideRow,
-        countsPerCurrentTable: Dict[str, int],
-        generalCounts: Dict[str, int],
-    ) -> str:
+        accessionIds: Iterable[int],
+        countsPerCurrentTable: Dict[int, int],
+        generalCounts: Dict[int, int],
+    ) -> int:
         """Выбирает репрезентативный Accession для строки.
 
         Сначала учитывается количество появлений каждого Accession в текущей
@@ -105,44 +161,75 @@ class PeptideTables(dict):
         потом сравнивается длина последовательностей.
 
         Args:
-            row: PeptideRow
+            accessionIds: коды Accession строки
             countsPerCurrentTable: количество появлений в текущей таблице
             generalCounts: количество появлений во всех таблицах
 
         Returns:
-            str - репрезентативный Accession
+            int - код репрезентативного Accession
         """
         representativeAccessions = self.GetRepresentativeForRowByCounts(
-            row.accessions, countsPerCurrentTable
-        )
-        if len(representativeAccessions) == 1:
-            return representativeAccessions[0]
-        representativeAccessions = self.GetRepresentativeForRowByCounts(
-            representativeAccessions, generalCounts
+            accessionIds, countsPerCurrentTable
         )
         if len(representativeAccessions) == 1:
+            self.representativeStats.byTableCounts += 1
             return representativeAccessions[0]
-        representativeAccessions = self.GetRepresentativeForRowBySequences(
-            representativeAccessions
+        # Первый из Accession с наибольшим количеством появлений во всех
+        # таблицах, а среди них — с наибольшей длиной последовательности
+        representativeAccession = max(
+            representativeAccessions,
+            key=lambda accessionId: self.GetGlobalRank(
+                accessionId, generalCounts
+            ),
         )
-        return representativeAccessions[0]
+        generalCount = generalCounts[representativeAccession]
+        if [
+            generalCounts[accessionId]
+            for accessionId in representativeAccessions
+        ].count(generalCount) == 1:
+            self.representativeStats.byGeneralCounts += 1
+        else:
+            self.representativeStats.bySequenceLengths += 1
+        return representativeAccession
+
+    def GetGlobalRank(
+        self, accessionId: int, generalCounts: Dict[int, int]
+    ) -> Tuple[int, int]:
+        """Получает ранг Accession среди всех таблиц. Ранги запоминаются в
+        globalRanks
+
+        Args:
+            accessionId: код Accession
+            generalCounts: количество появлений во всех таблицах
+
+        Returns:
+            Количество появлений во всех таблицах и длина
+            последовательности
+        """
+        rank = self.globalRanks.get(accessionId)
+        if rank is None:
+            rank = self.globalRanks[accessionId] = (
+                generalCounts[accessionId],
+                self.accessionCatalog.lengths[accessionId],
+            )
+        return rank
 
     @staticmethod
     def GetRepresentativeForRowByCounts(
-        accessions: List[str], counts: Dict[str, int]
-    ) -> List[str]:
+        accessions: Iterable[int], counts: Dict[int, int]
+    ) -> List[int]:
         """Выбирает репрезентативный Accession на основе словаря с количеством
         появлений каждого Accession.
 
         Args:
-            accessions: список Accession, для которого выбирается
+            accessions: коды Accession, из которых выбирается
                 репрезентативный
             counts: словарь с количеством появлений каждого Accession
 
         Returns:
-            None: если
+            Коды Accession с наибольшим количеством появлений
         """
-        representativeAccession: Tuple[str, int] = ("", 0)
+        representativeAccession: Tuple[int, int] = (-1, 0)
         variants = []
         for accession in accessions:
             if counts[accession] > representativeAccession[1]:
@@ -155,21 +242,16 @@ class PeptideTables(dict):
                 variants.append(accession)
         return variants
 
-    def GetRepresentativeForRowBySequences(
-        self, accessions: List[str]
-    ) -> List[str]:
-        representativeAccession: Tuple[str, int] = ("", 0)
-        variants = []
-        for accession in accessions:
-            if self.seqDB[accession].len > representativeAccession[1]:
-                representativeAccession = (
-                    accession,
-                    self.seqDB[accession].len,
-                )
-                variants = [accession]
-            elif self.seqDB[accession].len == representativeAccession[1]:
-                variants.append(accession)
-        return variants
+    def Snapshot(self) -> 'PeptideTables':
+        """Создаёт копию таблиц, которую можно фильтровать независимо от
+        исходных таблиц (см. PeptideTable.Snapshot и
+        ArrayPeptideTable.Snapshot). Репрезентативные Accession заново не
+        выбираются
+        """
+        snapshot = copy(self)
+        for tableNum, table in self.items():
+            snapshot[tableNum] = table.Snapshot()
+        return snapshot
 
     def GetSortedTableNums(self) -> List[str]:
         """Получает отсортированный список номеров таблиц
@@ -189,12 +271,8 @@ class PeptideTables(dict):
                 таблицам
         """
         for tableNum, table in self.items():
-            i = 0
-            while i < len(table):
-                if table[i].name not in proteinPerTableList[tableNum]:
-                    table.pop(i)
-                    continue
-                i += 1
+            proteinAccessions = set(proteinPerTableList[tableNum])
+            FilterTable(table, lambda row: row.name in proteinAccessions)
 
     def ApplyProteinReplacements(
         self, proteinReplacements: Dict[str, Dict[str, str]]
@@ -0,0 +1,140 @@
+from decimal import Decimal
+from typing import List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .ArrayPeptideTable import ArrayPeptideTable
+    from .ArrayRawPeptideTable import ArrayRawPeptideTable
+
+
+class PeptideRowView:
+    """Строка ArrayRawPeptideTable, которая ведёт себя как PeptideRow
+
+    Значения считываются из массивов таблицы при обращении и записываются в
+    них при присваивании. Представление строки действительно, пока из
+    таблицы не удалялись строки перед ней.
+
+    Attributes:
+        table: таблица, к которой относится строка
+        index: номер строки в таблице
+    """
+
+    table: 'ArrayRawPeptideTable'
+    index: int
+
+    def __init__(self, table: 'ArrayRawPeptideTable', index: int) -> None:
+        self.table = table
+        self.index = index
+
+    @property
+    def accessions(self) -> List[str]:
+        """Список имён Accession строки. Изменение возвращаемого списка не
+        меняет таблицу, для этого список нужно присвоить accessions"""
+        start = self.table.accessionStarts[self.index]
+        names = self.table.accessionDictionary.names
+        return [
+            names[accessionId]
+            for accessionId in self.table.accessionCodes[
+                start:start + self.table.accessionCounts[self.index]]
+        ]
+
+    @accessions.setter
+    def accessions(self, accessions: List[str]) -> None:
+        self.table.SetAccessions(self.index, accessions)
+
+    @property
+    def confidence(self) -> Decimal:
+        return self.table.confidence[self.index]
+
+    @confidence.setter
+    def confidence(self, confidence: Decimal) -> None:
+        self.table.confidence[self.index] = confidence
+
+    @property
+    def sc(self) -> Decimal:
+        return self.table.sc[self.index]
+
+    @sc.setter
+    def sc(self, sc: Decimal) -> None:
+        self.table.sc[self.index] = sc
+
+    @property
+    def precursorSignal(self) -> Decimal:
+        return self.table.precursorSignal[self.index]
+
+    @precursorSignal.setter
+    def precursorSignal(self, precursorSignal: Decimal) -> None:
+        self.table.precursorSignal[self.index] = precursorSignal
+
+    @property
+    def sequenceLength(self) -> int:
+        return self.table.sequenceLengths[self.index]
+
+    def __repr__(self) -> str:
+        return (f"PeptideRowView(accessions={self.accessions!r}, "
+                f"confidence={self.confidence!r}, sc={self.sc!r}, "
+                f"precursorSignal={self.precursorSignal!r}, "
+                f"sequenceLength={self.sequenceLength!r})")
+
+
+class PeptideAccessionView:
+    """Строка ArrayPeptideTable, которая ведёт себя как PeptideAccession
+
+    Значения считываются из массивов таблицы при обращении и записываются в
+    них при присваивании. Представление строки действительно, пока из
+    таблицы не удалялись строки перед ней.
+
+    Attributes:
+        table: таблица, к которой относится строка
+        index: номер строки в таблице
+    """
+
+    table: 'ArrayPeptideTable'
+    index: int
+
+    def __init__(self, table: 'ArrayPeptideTable', index: int) -> None:
+        self.table = table
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self.table.accessionDictionary.names[
+            self.table.names[self.index]]
+
+    @name.setter
+    def name(self, name: str) -> None:
+        self.table.names[self.index] = (
+            self.table.accessionDictionary.GetId(name))
+
+    @property
+    def confidence(self) -> Decimal:
+        return self.table.confidence[self.index]
+
+    @confidence.setter
+    def confidence(self, confidence: Decimal) -> None:
+        self.table.confidence[self.index] = confidence
+
+    @property
+    def sc(self) -> Decimal:
+        return self.table.sc[self.index]
+
+    @sc.setter
+    def sc(self, sc: Decimal) -> None:
+        self.table.sc[self.index] = sc
+
+    @property
+    def precursorSignal(self) -> Decimal:
+        return self.table.precursorSignal[self.index]
+
+    @precursorSignal.setter
+    def precursorSignal(self, precursorSignal: Decimal) -> None:
+        self.table.precursorSignal[self.index] = precursorSignal
+
+    @property
+    def sequenceLength(self) -> int:
+        return self.table.sequenceLengths[self.index]
+
+    def __repr__(self) -> str:
+        return (f"PeptideAccessionView(name={self.name!r}, "
+                f"confidence={self.confidence!r}, sc={self.sc!r}, "
+                f"precursorSignal={self.precursorSignal!r}, "
+                f"sequenceLength={self.sequenceLength!r})")
@@ -0,0 +1,111 @@
+from typing import Any, Dict, Iterable, List, Set
+
+
+try:
+    PopCount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def PopCount(value: int) -> int:
+        """Количество единичных битов неотрицательного числа"""
+        return bin(value).count("1")
+
+
+class PresenceMatrix:
+    """Матрица присутствия Accession в таблицах
+
+    Строка матрицы — битовое множество (int) таблиц, содержащих Accession:
+    бит i установлен, если Accession есть в таблице tableNums[i]. Группа
+    таблиц задаётся маской битов её таблиц, поэтому количество таблиц
+    группы без Accession равно размеру группы минус количество единичных
+    битов в пересечении строки и маски. У многих Accession строки
+    совпадают, поэтому количество групп считается один раз для каждой
+    различной строки.
+
+    Attributes:
+        tableNums: номера таблиц в порядке битов
+        rows: словарь вида {код Accession: битовое множество таблиц}
+    """
+
+    tableNums: List[str]
+    rows: Dict[int, int]
+
+    def __init__(self, accessionTables: Dict[str, Dict[int, Any]]) -> None:
+        """
+        Args:
+            accessionTables: словарь вида {
+                    "Номер таблицы": {код Accession: значение}
+                }
+        """
+        self.tableNums = list(accessionTables)
+        rows: Dict[int, int] = {}
+        get = rows.get
+        for bit, table in enumerate(accessionTables.values()):
+            flag = 1 << bit
+            for accessionId in table:
+                rows[accessionId] = get(accessionId, 0) | flag
+        self.rows = rows
+
+    def GetMask(self, tableNums: Iterable[str]) -> int:
+        """Получает маску битов таблиц
+
+        Args:
+            tableNums: номера таблиц
+
+        Returns:
+            Битовое множество таблиц
+        """
+        bits = {tableNum: bit for bit, tableNum in enumerate(self.tableNums)}
+        mask = 0
+        for tableNum in tableNums:
+            mask |= 1 << bits[tableNum]
+        return mask
+
+    def CountGroupsWithAccessions(
+        self, groups: Dict[str, List[str]], maxGroupAbsence: int
+    ) -> Dict[int, int]:
+        """Подсчитывает для каждого Accession количество групп, в которых он
+        отсутствует не более maxGroupAbsence раз
+
+        Args:
+            groups: словарь вида {"номер группы": [номера таблиц]}
+            maxGroupAbsence: максимальное количество отсутствий Accession в
+                группе
+
+        Returns:
+            Словарь вида {код Accession: количество групп}
+        """
+        # Accession присутствует в группе, если в ней не меньше
+        # minPresence таблиц с ним
+        groupMasks = [
+            (self.GetMask(tableNums), len(tableNums) - maxGroupAbsence)
+            for tableNums in groups.values()
+        ]
+        countsPerRow: Dict[int, int] = {}
+        counts: Dict[int, int] = {}
+        for accessionId, row in self.rows.items():
+            count = countsPerRow.get(row)
+            if count is None:
+                count = countsPerRow[row] = sum(
+                    PopCount(row & mask) >= minPresence
+                    for mask, minPresence in groupMasks
+                )
+            counts[accessionId] = count
+        return counts
+
+    def GetAccessionsInGroups(
+        self,
+        groups: Dict[str, List[str]],
+        maxGroupAbsence: int,
+        minGroupsWithAccession: int,
+    ) -> Set[int]:
+        """Находит Accession, присутствующие не менее чем в
+        minGroupsWithAccession группах (см. CountGroupsWithAccessions)
+
+        Returns:
+            Коды Accession
+        """
+        return {
+            accessionId
+            for accessionId, count in self.CountGroupsWithAccessions(
+                groups, maxGroupAbsence).items()
+            if count >= minGroupsWithAccession
+        }
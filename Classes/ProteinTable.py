@@ -1,8 +1,10 @@
 from decimal import Decimal
-from typing import List
+from typing import Callable, Iterator, List, Optional, Tuple
 from .BaseClasses.Table import Table
 from .BaseClasses.BaseProteinAccession import BaseProteinAccession
+from .DecimalArray import DecimalArray
 from .ProteinColumns import ProteinColumns
+from .TableCache import TableCache
 
 
 class ProteinTable(Table):
@@ -11,15 +13,54 @@ class ProteinTable(Table):
     def __init__(self,
                  tableFilename: str = None,
                  unsafeFlag: bool = False,
-                 columns: ProteinColumns = ProteinColumns()):
+                 columns: ProteinColumns = ProteinColumns(),
+                 cache: Optional[TableCache] = None,
+                 stopCondition: Optional[
+                     Callable[[Tuple[str, ...]], bool]] = None):
         self.columns = columns
-        super().__init__(tableFilename, unsafeFlag)
+        super().__init__(tableFilename, unsafeFlag, cache, stopCondition)
 
     def Load(self, tableFilename: str) -> List[BaseProteinAccession]:
-        super().Load(tableFilename)
-        self.columns.TestColumnNames(self.pop(0))
-        for i, line in enumerate(self):
-            self[i] = BaseProteinAccession(line[self.columns.accession[0]],
-                                           Decimal(
-                                               line[self.columns.unused[0]]))
+        self.LoadRows(tableFilename, self.columns)
         return self
+
+    def IterRows(self, tableFilename: str) -> Iterator[BaseProteinAccession]:
+        """Лениво считывает строки таблицы
+
+        Из файла разбираются только столбцы Accession и Unused.
+
+        Args:
+            tableFilename: имя файла таблицы
+
+        Yields:
+            BaseProteinAccession для каждой строки таблицы
+        """
+        for accession, unused in self.ReadMappedColumns(
+                tableFilename, self.columns):
+            yield BaseProteinAccession(accession, Decimal(unused))
+
+    @staticmethod
+    def IsDecoyRow(values: Tuple[str, ...]) -> bool:
+        """Условие остановки чтения (см. Table.stopCondition) на первом
+        обратном Accession
+
+        ProteinAccessionsDB и ProteinGroupsDB не используют строки, начиная
+        с первого обратного Accession, поэтому остаток файла можно не
+        разбирать.
+
+        Args:
+            values: значения столбцов строки в порядке ProteinColumns
+
+        Returns:
+            True, если Accession строки обратный
+        """
+        return values[0].startswith("RRRRR")
+
+    @staticmethod
+    def PackRow(row: BaseProteinAccession) -> Tuple:
+        return (row.name, *DecimalArray.Pack(row.unused))
+
+    @staticmethod
+    def UnpackRow(values: Tuple) -> BaseProteinAccession:
+        return BaseProteinAccession(values[0],
+                                    DecimalArray.Unpack(*values[1:]))
@@ -1,57 +1,160 @@
 from Classes.PeptideRow import PeptideRow
 from decimal import Decimal
-from typing import List
+from typing import Callable, Iterator, List, Optional, Tuple
+from .AccessionDictionary import AccessionDictionary
 from .BaseClasses.Table import Table
+from .DecimalArray import DecimalArray
 from .PeptideAccession import PeptideAccession
 from .PeptideColumns import PeptideColumns
+from .PeptideTable import PeptideTable
+from .TableCache import TableCache
+from .TableFilter import FilterTable
 
 
 class RawPeptideTable(Table):
-    """Считывает PeptideTable в список вида List[PeptideRow]."""
+    """Считывает PeptideTable в список вида List[PeptideRow].
+
+    Attributes:
+        columns: номера и имена считываемых столбцов
+        accessionDictionary: словарь кодов Accession. Имена Accession в
+            строках таблицы берутся из него (см. AccessionDictionary.Intern)
+    """
 
     columns: PeptideColumns
+    accessionDictionary: AccessionDictionary
 
     def __init__(
         self,
         tableFilename: str = None,
         unsafeFlag: bool = False,
         columns: PeptideColumns = PeptideColumns(),
+        cache: Optional[TableCache] = None,
+        accessionDictionary: Optional[AccessionDictionary] = None,
+        stopCondition: Optional[Callable[[Tuple[str, ...]], bool]] = None,
     ):
         """Initializes table settings and reads table from file"""
         self.columns = columns
-        super().__init__(tableFilename, unsafeFlag)
+        self.accessionDictionary = (
+            accessionDictionary
+            if accessionDictionary is not None
+            else AccessionDictionary()
+        )
+        super().__init__(tableFilename, unsafeFlag, cache, stopCondition)
 
     def Load(self, tableFilename) -> List[PeptideAccession]:
-        super().Load(tableFilename)
-        self.columns.TestColumnNames(self.pop(0))
-        for i, line in enumerate(self):
-            self[i] = PeptideRow(
-                accessions=list(
-                    map(
-                        lambda x: x.strip(),
-                        line[self.columns.accession[0]].split(";"),
-                    )
-                ),
-                confidence=Decimal(line[self.columns.confidence[0]]),
-                sc=Decimal(line[self.columns.sc[0]]),
+        self.clear()
+        intern = self.accessionDictionary.Intern
+        for row in self.IterLoadedRows(tableFilename, self.columns):
+            row.accessions = list(map(intern, row.accessions))
+            self.append(row)
+        return self
+
+    def IterAccessionIds(self) -> Iterator[List[int]]:
+        """Получает коды Accession каждой строки
+
+        Yields:
+            Список кодов Accession строки
+        """
+        getId = self.accessionDictionary.GetId
+        # Имена строк уже есть в словаре (см. Load), поэтому коды
+        # берутся напрямую из словаря ids
+        getExistingId = self.accessionDictionary.ids.__getitem__
+        for row in self:
+            try:
+                yield list(map(getExistingId, row.accessions))
+            except KeyError:
+                yield list(map(getId, row.accessions))
+
+    def IterRows(self, tableFilename: str) -> Iterator[PeptideRow]:
+        """Лениво считывает строки таблицы
+
+        Из файла разбираются только столбцы, указанные в self.columns.
+
+        Args:
+            tableFilename: имя файла таблицы
+
+        Yields:
+            PeptideRow для каждой строки таблицы
+        """
+        for (
+            accessions,
+            sc,
+            precursorSignal,
+            sequence,
+            confidence,
+        ) in self.ReadMappedColumns(tableFilename, self.columns):
+            yield PeptideRow(
+                accessions=[
+                    accession.strip() for accession in accessions.split(";")
+                ],
+                confidence=Decimal(confidence),
+                sc=Decimal(sc),
                 precursorSignal=(
-                    Decimal(line[self.columns.precursorSignal[0]])
-                    if len(line[self.columns.precursorSignal[0]].strip()) > 0
+                    Decimal(precursorSignal)
+                    if len(precursorSignal.strip()) > 0
                     else Decimal(0)
                 ),
-                sequence=line[self.columns.sequence[0]],
+                sequence=sequence,
             )
-        return self
+
+    @staticmethod
+    def IsDecoyRow(values: Tuple[str, ...]) -> bool:
+        """Условие остановки чтения (см. Table.stopCondition) на первой
+        строке, все Accession которой обратные
+
+        До этой строки таблица обрезается default FDR фильтром (см.
+        FDRFilter.ApplyDefaultFilter), поэтому остаток файла можно не
+        разбирать.
+
+        Args:
+            values: значения столбцов строки в порядке PeptideColumns
+
+        Returns:
+            True, если все Accession строки обратные
+        """
+        accessions = values[0]
+        # Большинство строк не содержат обратных Accession
+        return "RRRRR" in accessions and all(
+            accession.strip().startswith("RRRRR")
+            for accession in accessions.split(";")
+        )
+
+    @staticmethod
+    def PackRow(row: PeptideRow) -> Tuple:
+        # Пары из DecimalArray.Pack записываются в кортеж строки без
+        # вложенных кортежей: так кэш быстрее считывается
+        return (
+            tuple(row.accessions),
+            *DecimalArray.Pack(row.confidence),
+            *DecimalArray.Pack(row.sc),
+            *DecimalArray.Pack(row.precursorSignal),
+            row.sequence,
+        )
+
+    @staticmethod
+    def UnpackRow(values: Tuple) -> PeptideRow:
+        unpack = DecimalArray.Unpack
+        return PeptideRow(
+            accessions=list(values[0]),
+            confidence=unpack(values[1], values[2]),
+            sc=unpack(values[3], values[4]),
+            precursorSignal=unpack(values[5], values[6]),
+            sequence=values[7],
+        )
 
     def RemoveRowsWithAccessions(self, accessions: List[str]) -> None:
-        i = 0
-        while i < len(self):
-            for accession in self[i].accessions:
-                if accession in accessions:
-                    self.pop(i)
-                    break
-            else:
-                i += 1
+        """Удаляет все строки, содержащие хотя бы один Accession из списка
+
+        Args:
+            accessions: список имён Accession
+        """
+        removedAccessions = set(accessions)
+        FilterTable(
+            self, lambda row: removedAccessions.isdisjoint(row.accessions))
+
+    def CreatePeptideTable(self) -> PeptideTable:
+        """Создаёт пустую Peptide таблицу для строк этой таблицы"""
+        return PeptideTable(accessionDictionary=self.accessionDictionary)
 
     def __str__(self):
         return self.__repr__()
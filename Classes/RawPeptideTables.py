@@ -1,7 +1,12 @@
 from Classes.RawPeptideTable import RawPeptideTable
 from os import listdir
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
+from .AccessionCatalog import AccessionCatalog
+from .AccessionDictionary import AccessionDictionary
+from .ArrayRawPeptideTable import ArrayRawPeptideTable
+from .FDRCutoff import FDRCutoff
 from .PeptideColumns import PeptideColumns
+from .TableCache import TableCache
 
 
 class RawPeptideTables(dict):
@@ -11,39 +16,117 @@ class RawPeptideTables(dict):
 
     Attributes:
         columnNames: имена заголовков
+        cache: кэш считанных таблиц
+        arrayTables: считывать таблицы в ArrayRawPeptideTable
+        stopAtDecoys: считывать таблицы до первой строки, все Accession
+            которой обратные (см. RawPeptideTable.IsDecoyRow)
+        accessionDictionary: общий для всех таблиц словарь кодов Accession
+        blackListCounts: количество строк, удалённых по правилам чёрного
+            списка (см. RowPipeline)
+        fdrCutoffs: границы глобального FDR фильтра для каждой таблицы
+            (см. FDRFilter.ApplyGlobalFilter)
+        accessionCatalog: каталог Accession таблиц, заполняемый
+            RowPipeline. Пустой, если строки не обрабатывались
     """
 
     columnNames: PeptideColumns
+    cache: Optional[TableCache]
+    arrayTables: bool
+    stopAtDecoys: bool
+    accessionDictionary: AccessionDictionary
+    blackListCounts: Dict[str, int]
+    fdrCutoffs: Dict[str, FDRCutoff]
+    accessionCatalog: AccessionCatalog
 
     def __init__(
-        self, columnNames: PeptideColumns, inputDir: str = None
+        self,
+        columnNames: PeptideColumns,
+        inputDir: str = None,
+        tableNums: Optional[Iterable[str]] = None,
+        cache: Optional[TableCache] = None,
+        arrayTables: bool = False,
+        stopAtDecoys: bool = False,
     ) -> None:
         """
         Args:
             columnNames: имена заголовков
             inputDir: путь, из которого считываются таблицы
+            tableNums: номера считываемых таблиц, если нужно считать не все
+                таблицы из inputDir
+            cache: кэш считанных таблиц
+            arrayTables: считывать таблицы в ArrayRawPeptideTable
+            stopAtDecoys: считывать таблицы до первой строки, все Accession
+                которой обратные
         """
 
         self.columnNames = columnNames
+        self.cache = cache
+        self.arrayTables = arrayTables
+        self.stopAtDecoys = stopAtDecoys
+        self.accessionDictionary = AccessionDictionary()
+        self.blackListCounts = {}
+        self.fdrCutoffs = {}
+        self.accessionCatalog = AccessionCatalog(self.accessionDictionary)
 
         if inputDir is not None:
-            self.ReadPeptideSummaries(inputDir)
+            self.ReadPeptideSummaries(inputDir, tableNums)
             self.sortedTableNums = self.GetSortedTableNums()
 
-    def ReadPeptideSummaries(self, inputDir: str) -> None:
+    def ReadPeptideSummaries(
+        self, inputDir: str, tableNums: Optional[Iterable[str]] = None
+    ) -> None:
         """Считывает все PeptideSummary файлы в словарь
 
         Args:
             inputDir: путь, из которого считываются таблицы
+            tableNums: номера считываемых таблиц, если нужно считать не все
+                таблицы из inputDir
+        """
+        filenames = self.GetPeptideSummaryFilenames(inputDir)
+        stopCondition = (
+            RawPeptideTable.IsDecoyRow if self.stopAtDecoys else None
+        )
+        if tableNums is not None:
+            tableNums = set(tableNums)
+        for tableNum, filename in filenames.items():
+            if tableNums is None or tableNum in tableNums:
+                if self.arrayTables:
+                    self[tableNum] = ArrayRawPeptideTable(
+                        filename,
+                        unsafeFlag=True,
+                        columns=self.columnNames,
+                        cache=self.cache,
+                        accessionDictionary=self.accessionDictionary,
+                        stopCondition=stopCondition,
+                    )
+                else:
+                    self[tableNum] = RawPeptideTable(
+                        filename,
+                        unsafeFlag=True,
+                        columns=self.columnNames,
+                        cache=self.cache,
+                        accessionDictionary=self.accessionDictionary,
+                        stopCondition=stopCondition,
+                    )
+
+    @staticmethod
+    def GetPeptideSummaryFilenames(inputDir: str) -> Dict[str, str]:
+        """Получает имена всех PeptideSummary файлов в папке
+
+        Args:
+            inputDir: путь, в котором ищутся таблицы
+
+        Returns:
+            Словарь вида {
+                "номер таблицы": "путь к файлу"
+            }
         """
+        filenames: Dict[str, str] = {}
         for filename in listdir(inputDir):
             if "Peptide" in filename:
                 tableNum = filename.split("_")[0]
-                self[tableNum] = RawPeptideTable(
-                    inputDir + "/" + filename,
-                    unsafeFlag=True,
-                    columns=self.columnNames,
-                )
+                filenames[tableNum] = inputDir + "/" + filename
+        return filenames
 
     def GetSortedTableNums(self) -> List[str]:
         """Получает отсортированный список номеров таблиц
@@ -0,0 +1,44 @@
+from dataclasses import dataclass, fields
+
+
+@dataclass
+class RepresentativeStats:
+    """Статистика выбора репрезентативных Accession (см.
+    PeptideTables.ExtractFromRawPeptideTables)
+
+    Attributes:
+        rows: количество строк
+        singleAccessionRows: количество строк с одним Accession
+        cacheHits: количество строк, для которых репрезентативный Accession
+            взят из кэша (в таблице уже была строка с теми же Accession)
+        byTableCounts: количество выборов по количеству появлений в таблице
+        byGeneralCounts: количество выборов по количеству появлений во всех
+            таблицах
+        bySequenceLengths: количество выборов по длине последовательности
+    """
+    rows: int = 0
+    singleAccessionRows: int = 0
+    cacheHits: int = 0
+    byTableCounts: int = 0
+    byGeneralCounts: int = 0
+    bySequenceLengths: int = 0
+
+    def Add(self, other: 'RepresentativeStats') -> None:
+        """Прибавляет статистику другой части таблиц (например, таблиц
+        другого процесса TableWorkers)
+
+        Args:
+            other: прибавляемая статистика
+        """
+        for field in fields(self):
+            setattr(self, field.name,
+                    getattr(self, field.name) + getattr(other, field.name))
+
+    def __str__(self) -> str:
+        return (
+            f"{self.rows} rows, {self.singleAccessionRows} with one"
+            f" accession, {self.cacheHits} cached, resolved by table"
+            f" counts: {self.byTableCounts}, by general counts:"
+            f" {self.byGeneralCounts}, by sequence lengths:"
+            f" {self.bySequenceLengths}"
+        )
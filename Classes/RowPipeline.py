@@ -0,0 +1,139 @@
+from collections import defaultdict
+from typing import Dict, FrozenSet, Mapping, Optional, Set
+from .AccessionCatalog import AccessionCatalog
+from .AccessionExclusionList import AccessionExclusionList
+from .Functions import IsReversed
+from .RawPeptideTables import RawPeptideTables
+from .Sequence import Sequence
+from .TableFilter import CompactTable
+
+
+class RowPipeline:
+    """Обрабатывает строки считанных Peptide таблиц за один проход по
+    каждой таблице
+
+    Для каждой строки по кодам Accession последовательно:
+        1. удаляются обратные Accession (default FDR фильтр), а таблица
+           отбрасывается, начиная с первой строки, в которой не осталось
+           Accession;
+        2. строка удаляется, если в ней есть Accession из чёрного списка;
+        3. подсчитывается количество появлений каждого Accession оставшихся
+           строк (см. PeptideTables.CountAccessionsInRawTable).
+    Подсчитанные Accession заносятся в каталог (AccessionCatalog), и
+    наличие в базе данных последовательностей проверяется один раз для
+    каждого различного Accession. Результат совпадает с
+    последовательным применением FDRFilter.ApplyDefaultFilter,
+    AccessionExclusionList.RemoveExcludedRows, GetNotFoundAccessions и
+    подсчёта Accession.
+
+    После глобального FDR фильтра (FDRFilter.ApplyGlobalFilter) в таблицах
+    нет обратных строк и Accession, поэтому первый шаг ничего не меняет.
+
+    Attributes:
+        rawPeptideTables: считанные построчно Peptide таблицы
+        seqDB: база данных последовательностей Accession
+        exclusionList: чёрный список или None
+        reversedIds: коды обратных Accession
+        excludedIds: коды Accession из чёрного списка вида {код: правило}
+    """
+
+    rawPeptideTables: RawPeptideTables
+    seqDB: Mapping[str, Sequence]
+    exclusionList: Optional[AccessionExclusionList]
+    reversedIds: FrozenSet[int]
+    excludedIds: Dict[int, str]
+
+    def __init__(
+        self,
+        rawPeptideTables: RawPeptideTables,
+        seqDB: Mapping[str, Sequence],
+        exclusionList: Optional[AccessionExclusionList] = None,
+    ) -> None:
+        """
+        Args:
+            rawPeptideTables: считанные построчно Peptide таблицы
+            seqDB: база данных последовательностей Accession
+            exclusionList: чёрный список или None
+        """
+        self.rawPeptideTables = rawPeptideTables
+        self.seqDB = seqDB
+        self.exclusionList = exclusionList
+        accessionDictionary = rawPeptideTables.accessionDictionary
+        self.reversedIds = frozenset(
+            accessionId
+            for accessionId, accession in enumerate(accessionDictionary.names)
+            if IsReversed(accession)
+        )
+        self.excludedIds = (
+            exclusionList.GetExcludedIds(accessionDictionary)
+            if exclusionList is not None
+            else {}
+        )
+
+    def Apply(self) -> Set[str]:
+        """Обрабатывает все таблицы. Количество удалённых по правилам
+        чёрного списка строк записывается в rawPeptideTables.blackListCounts,
+        количество появлений Accession, длины последовательностей и
+        отсутствующие в seqDB Accession — в rawPeptideTables.accessionCatalog
+
+        Returns:
+            Множество не обратных Accession оставшихся строк, отсутствующих
+            в seqDB
+        """
+        blackListCounts: Dict[str, int] = {}
+        catalog = AccessionCatalog(
+            self.rawPeptideTables.accessionDictionary)
+        for tableNum, table in self.rawPeptideTables.items():
+            catalog.AddTable(
+                tableNum, self.ApplyToTable(table, blackListCounts))
+        self.rawPeptideTables.blackListCounts = blackListCounts
+        self.rawPeptideTables.accessionCatalog = catalog
+        return catalog.ResolveSequences(self.seqDB)
+
+    def ApplyToTable(
+        self, table, blackListCounts: Dict[str, int]
+    ) -> Dict[int, int]:
+        """Обрабатывает одну таблицу
+
+        Args:
+            table: RawPeptideTable или ArrayRawPeptideTable
+            blackListCounts: количество удалённых строк по правилам чёрного
+                списка, к которому прибавляются строки этой таблицы
+
+        Returns:
+            Словарь вида {код Accession: количество появлений}
+        """
+        names = self.rawPeptideTables.accessionDictionary.names
+        reversedIds = self.reversedIds
+        excludedIds = self.excludedIds
+        isdisjoint = (
+            excludedIds.keys().isdisjoint if len(excludedIds) else None
+        )
+        counts: Dict[int, int] = defaultdict(lambda: 0)
+        keep = []
+        for index, accessionIds in enumerate(table.IterAccessionIds()):
+            if not reversedIds.isdisjoint(accessionIds):
+                accessionIds = [
+                    accessionId for accessionId in accessionIds
+                    if accessionId not in reversedIds
+                ]
+                table[index].accessions = [
+                    names[accessionId] for accessionId in accessionIds
+                ]
+            if not len(accessionIds):
+                break
+            if isdisjoint is not None and not isdisjoint(accessionIds):
+                keep.append(False)
+                rule = next(
+                    excludedIds[accessionId]
+                    for accessionId in accessionIds
+                    if accessionId in excludedIds
+                )
+                blackListCounts[rule] = blackListCounts.get(rule, 0) + 1
+                continue
+            keep.append(True)
+            for accessionId in accessionIds:
+                counts[accessionId] += 1
+        keep.extend([False] * (len(table) - len(keep)))
+        CompactTable(table, keep)
+        return counts
@@ -1,4 +1,7 @@
+from typing import Tuple
 from .Sequence import Sequence
+from .SequenceIndex import NON_RESIDUE_BYTES, SequenceIndex
+from .SequenceSnapshot import SequenceSnapshot
 
 
 class SequenceDatabase(dict):
@@ -20,36 +23,105 @@ class SequenceDatabase(dict):
         """
 
         with open(seqDBFilename) as seqDBFile:
-            strings = seqDBFile.read().split('\n')
-            seqDBFile.close()
-            seqDB = SequenceDatabase()
-            i = 0
-            while(i < len(strings)):
-                if len(strings[i]):
-                    if strings[i][0] == '>':
-                        seqID = strings[i].split(' ')[0][1:]
-                        seqDB[seqID] = Sequence(accession=seqID)
-                        if len(strings[i].split(' ')) > 1:
-                            seqDB[seqID].desc = strings[i].split(' ')[1]
-                            for word in strings[i].split(' ')[2:]:
-                                if word.startswith("OS="):
-                                    break
-                                seqDB[seqID].desc += ' ' + word
-                        i += 1
-                        while ((i < len(strings)) and (
-                                not len(strings[i]) or strings[i][0] != '>')):
-                            seqDB[seqID].seq += ''.join(
-                                [ch for ch in strings[i]
-                                 if ch in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"])
-                            i += 1
-                        i -= 1
-                        if not seqDB[seqID].len:
-                            input("Error! Length of sequence with id "
-                                  f"{seqID} = 0")
-                            raise(IndexError)
-                i += 1
-
-            return seqDB
+            text = seqDBFile.read()
+        seqDB = SequenceDatabase()
+        # Каждая запись начинается со строки, первый символ которой — '>'.
+        # Всё, что находится до первой такой строки, пропускается
+        for record in ('\n' + text).split('\n>')[1:]:
+            headerEnd = record.find('\n')
+            if headerEnd == -1:
+                headerEnd = len(record)
+            seqID, desc = SequenceDatabase.ParseHeader(
+                '>' + record[:headerEnd])
+            seq = record[headerEnd + 1:].encode(
+                "ascii", "ignore").translate(
+                    None, NON_RESIDUE_BYTES).decode("ascii")
+            if not seq:
+                input("Error! Length of sequence with id "
+                      f"{seqID} = 0")
+                raise(IndexError)
+            seqDB[seqID] = Sequence(accession=seqID, desc=desc, seq=seq)
+        return seqDB
+
+    @staticmethod
+    def fromIndexedFile(seqDBFilename: str) -> 'SequenceDatabase':
+        """Считывание последовательностей через индекс fasta файла
+
+        Индекс (SequenceIndex) хранит имена, длины, описания и смещения
+        последовательностей и сохраняется рядом с fasta файлом. Если индекса
+        нет или fasta файл изменился, индекс строится заново. Сами
+        последовательности считываются из файла только при обращении к seq.
+
+        Args:
+            seqDBFilename: Имя файла с последовательностями
+        Returns:
+            Словарь вида {"Accession": IndexedSequence}
+        """
+
+        sequences = SequenceIndex.Read(seqDBFilename)
+        if sequences is None:
+            sequences = SequenceIndex.Build(seqDBFilename,
+                                            SequenceDatabase.ParseHeader)
+        seqDB = SequenceDatabase()
+        seqDB.update(sequences)
+        return seqDB
+
+    @staticmethod
+    def fromSnapshot(seqDBFilename: str,
+                     withSequences: bool = True) -> 'SequenceDatabase':
+        """Считывание последовательностей через двоичный снимок
+
+        Снимок (SequenceSnapshot) сохраняется рядом с fasta файлом при первом
+        использовании и проверяется по хэшу содержимого fasta файла, поэтому
+        при повторных запусках fasta файл не разбирается заново.
+
+        Args:
+            seqDBFilename: Имя файла с последовательностями
+            withSequences: хранить ли в снимке сами последовательности. Если
+                нет, последовательности считываются из fasta файла при
+                обращении к seq (как в fromIndexedFile)
+        Returns:
+            Словарь вида {"Accession": Sequence}
+        """
+
+        fastaHash = SequenceSnapshot.GetFastaHash(seqDBFilename)
+        sequences = SequenceSnapshot.Load(
+            seqDBFilename, fastaHash, withSequences)
+        if sequences is None:
+            sequences = (
+                SequenceDatabase.fromFile(seqDBFilename)
+                if withSequences
+                else SequenceIndex.Scan(seqDBFilename,
+                                        SequenceDatabase.ParseHeader))
+            try:
+                SequenceSnapshot.Save(
+                    seqDBFilename, fastaHash, sequences, withSequences)
+            except OSError:
+                pass
+        if isinstance(sequences, SequenceDatabase):
+            return sequences
+        seqDB = SequenceDatabase()
+        seqDB.update(sequences)
+        return seqDB
+
+    @staticmethod
+    def ParseHeader(header: str) -> Tuple[str, str]:
+        """Получение имени и описания последовательности из строки заголовка
+
+        Описанием считаются все слова после имени вплоть до слова,
+        начинающегося с "OS=".
+
+        Args:
+            header: строка заголовка, начинающаяся с '>'
+        Returns:
+            Кортеж (имя, описание)
+        """
+
+        seqID, _, desc = header.partition(' ')
+        descEnd = desc.find(" OS=")
+        if descEnd != -1:
+            desc = desc[:descEnd]
+        return seqID[1:], desc
 
     def __getitem__(self, key):
         if key not in self:
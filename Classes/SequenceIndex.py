@@ -0,0 +1,252 @@
+from locale import getpreferredencoding
+from mmap import mmap, ACCESS_READ
+from os import path, replace, stat
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from .Sequence import Sequence
+
+# Все байты, кроме заглавных латинских букв, удаляются из
+# последовательности так же, как и при чтении SequenceDatabase.fromFile
+NON_RESIDUE_BYTES = bytes(
+    byte for byte in range(256) if not ord("A") <= byte <= ord("Z"))
+
+
+class FastaMap:
+    """Отображённый в память fasta файл, из которого по смещениям
+    считываются последовательности
+
+    Файл открывается при первом обращении. При копировании в другой процесс
+    (pickle) передаётся только имя файла.
+
+    Attributes:
+        filename: имя fasta файла
+    """
+
+    filename: str
+    _file: Any
+    _map: Optional[mmap]
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self._file = None
+        self._map = None
+
+    def ReadSequence(self, offset: int, end: int) -> str:
+        """Считывает последовательность, удаляя все символы, кроме A-Z
+
+        Args:
+            offset: смещение начала последовательности в байтах
+            end: смещение конца последовательности в байтах
+
+        Returns:
+            Последовательность
+        """
+        if self._map is None:
+            self._file = open(self.filename, "rb")
+            self._map = mmap(self._file.fileno(), 0, access=ACCESS_READ)
+        return self._map[offset:end].translate(
+            None, NON_RESIDUE_BYTES).decode("ascii")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"filename": self.filename}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["filename"])
+
+
+class IndexedSequence(Sequence):
+    """Последовательность, которая считывается из fasta файла только при
+    первом обращении к seq
+
+    Attributes:
+        source: fasta файл последовательности
+        offset: смещение начала последовательности в файле в байтах
+        end: смещение конца последовательности в файле в байтах
+    """
+
+    source: FastaMap
+    offset: int
+    end: int
+
+    def __init__(self,
+                 accession: str,
+                 desc: str,
+                 length: int,
+                 source: FastaMap,
+                 offset: int,
+                 end: int):
+        self.accession = accession
+        self.desc = desc
+        self.len = length
+        self.source = source
+        self.offset = offset
+        self.end = end
+        self._loadedSeq: Optional[str] = None
+
+    @property
+    def seq(self):
+        if self._loadedSeq is None:
+            self._loadedSeq = self.source.ReadSequence(self.offset, self.end)
+        return self._loadedSeq
+
+    @seq.setter
+    def seq(self, seq: str):
+        self.len = len(seq)
+        self._loadedSeq = seq
+
+
+class SequenceIndex:
+    """Индекс fasta файла
+
+    Хранит для каждой последовательности её имя, длину, смещения начала и
+    конца в файле и описание. Сохраняется рядом с fasta файлом в файл с
+    расширением INDEX_EXTENSION и перестраивается, если fasta файл изменился.
+
+    Формат индекса — текстовый файл, первая строка которого содержит версию
+    формата, размер и время изменения fasta файла, а остальные строки —
+    значения, разделённые табуляцией:
+    Accession    длина    начало    конец    описание
+    """
+
+    INDEX_VERSION = "PeptideSummaryAnalyzer sequence index 1"
+    INDEX_EXTENSION = ".idx"
+
+    @classmethod
+    def GetIndexFilename(cls, seqDBFilename: str) -> str:
+        return seqDBFilename + cls.INDEX_EXTENSION
+
+    @classmethod
+    def GetIndexHeader(cls, seqDBFilename: str) -> str:
+        fileStat = stat(seqDBFilename)
+        return (f"#{cls.INDEX_VERSION}\t{fileStat.st_size}"
+                f"\t{fileStat.st_mtime_ns}")
+
+    @staticmethod
+    def IterRecords(
+            seqDBFilename: str,
+            parseHeader: Callable[[str], Tuple[str, str]]
+    ) -> Iterator[Tuple[str, str, int, int, int]]:
+        """Находит все последовательности в fasta файле за один проход
+
+        Args:
+            seqDBFilename: имя fasta файла
+            parseHeader: функция, получающая имя и описание
+                последовательности из строки заголовка
+
+        Yields:
+            Кортежи (имя, описание, длина, начало, конец)
+        """
+        if path.getsize(seqDBFilename) == 0:
+            return
+        encoding = getpreferredencoding(False)
+        with open(seqDBFilename, "rb") as seqDBFile, mmap(
+                seqDBFile.fileno(), 0, access=ACCESS_READ) as mappedFile:
+            size = len(mappedFile)
+            if mappedFile[:1] == b">":
+                start = 0
+            else:
+                start = mappedFile.find(b"\n>")
+                if start == -1:
+                    return
+                start += 1
+            while True:
+                headerEnd = mappedFile.find(b"\n", start)
+                if headerEnd == -1:
+                    headerEnd = size
+                nextHeader = mappedFile.find(b"\n>", headerEnd)
+                end = size if nextHeader == -1 else nextHeader + 1
+                seqID, desc = parseHeader(
+                    mappedFile[start:headerEnd].rstrip(b"\r").decode(
+                        encoding))
+                offset = min(headerEnd + 1, end)
+                length = len(mappedFile[offset:end].translate(
+                    None, NON_RESIDUE_BYTES))
+                yield seqID, desc, length, offset, end
+                if nextHeader == -1:
+                    break
+                start = end
+
+    @classmethod
+    def Build(cls,
+              seqDBFilename: str,
+              parseHeader: Callable[[str], Tuple[str, str]]
+              ) -> Dict[str, IndexedSequence]:
+        """Строит индекс fasta файла и сохраняет его рядом с файлом
+
+        Если сохранить индекс не удалось (например, каталог доступен только
+        для чтения), построенный индекс всё равно возвращается.
+
+        Args:
+            seqDBFilename: имя fasta файла
+            parseHeader: функция, получающая имя и описание
+                последовательности из строки заголовка
+
+        Returns:
+            Словарь вида {"Accession": IndexedSequence}
+        """
+        sequences = cls.Scan(seqDBFilename, parseHeader)
+        indexFilename = cls.GetIndexFilename(seqDBFilename)
+        try:
+            with open(indexFilename + ".tmp", "w") as indexFile:
+                indexFile.write(cls.GetIndexHeader(seqDBFilename) + "\n")
+                for seqID, sequence in sequences.items():
+                    indexFile.write(
+                        f"{seqID}\t{sequence.len}\t{sequence.offset}"
+                        f"\t{sequence.end}\t{sequence.desc}\n")
+            replace(indexFilename + ".tmp", indexFilename)
+        except OSError:
+            pass
+        return sequences
+
+    @classmethod
+    def Scan(cls,
+             seqDBFilename: str,
+             parseHeader: Callable[[str], Tuple[str, str]]
+             ) -> Dict[str, IndexedSequence]:
+        """Строит индекс fasta файла в памяти, не сохраняя его
+
+        Args:
+            seqDBFilename: имя fasta файла
+            parseHeader: функция, получающая имя и описание
+                последовательности из строки заголовка
+
+        Returns:
+            Словарь вида {"Accession": IndexedSequence}
+        """
+        source = FastaMap(seqDBFilename)
+        sequences: Dict[str, IndexedSequence] = {}
+        for seqID, desc, length, offset, end in cls.IterRecords(
+                seqDBFilename, parseHeader):
+            if not length:
+                input("Error! Length of sequence with id "
+                      f"{seqID} = 0")
+                raise(IndexError)
+            sequences[seqID] = IndexedSequence(
+                seqID, desc, length, source, offset, end)
+        return sequences
+
+    @classmethod
+    def Read(cls, seqDBFilename: str) -> Optional[Dict[str, IndexedSequence]]:
+        """Считывает индекс fasta файла
+
+        Args:
+            seqDBFilename: имя fasta файла
+
+        Returns:
+            Словарь вида {"Accession": IndexedSequence} или None, если индекса
+            нет или он построен для другой версии fasta файла
+        """
+        indexFilename = cls.GetIndexFilename(seqDBFilename)
+        if not path.exists(indexFilename):
+            return None
+        source = FastaMap(seqDBFilename)
+        sequences: Dict[str, IndexedSequence] = {}
+        with open(indexFilename) as indexFile:
+            if indexFile.readline().rstrip("\n") != cls.GetIndexHeader(
+                    seqDBFilename):
+                return None
+            for line in indexFile:
+                seqID, length, offset, end, desc = line.rstrip(
+                    "\n").split("\t", 4)
+                sequences[seqID] = IndexedSequence(
+                    seqID, desc, int(length), source, int(offset), int(end))
+        return sequences
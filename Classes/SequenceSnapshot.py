@@ -0,0 +1,130 @@
+import marshal
+from hashlib import blake2b
+from os import getpid, path, remove, replace
+from struct import Struct
+from typing import Dict, Optional, Union
+from .Sequence import Sequence
+from .SequenceIndex import FastaMap, IndexedSequence
+
+
+class SequenceSnapshot:
+    """Двоичный снимок базы последовательностей
+
+    Снимок сохраняется рядом с fasta файлом в файл с расширением
+    SNAPSHOT_EXTENSION и содержит имена, длины и описания последовательностей,
+    а также либо сами последовательности, либо их смещения в fasta файле
+    (тогда последовательности считываются при обращении, см. IndexedSequence).
+    Снимок считается действительным, только если совпадают версия формата,
+    хэш содержимого fasta файла и режим (с последовательностями или без).
+
+    Формат: заголовок HEADER (MAGIC, версия, флаг наличия последовательностей,
+    хэш fasta файла), за которым следуют столбцы, сериализованные marshal:
+    (имена, описания, последовательности) или
+    (имена, описания, длины, начала, концы).
+    """
+
+    MAGIC = b"PSASEQDB"
+    SNAPSHOT_VERSION = 1
+    SNAPSHOT_EXTENSION = ".snapshot"
+    HASH_SIZE = 32
+    HASH_CHUNK_SIZE = 1 << 20
+    HEADER = Struct(f"<8sHB{HASH_SIZE}s")
+
+    @classmethod
+    def GetSnapshotFilename(cls, seqDBFilename: str) -> str:
+        return seqDBFilename + cls.SNAPSHOT_EXTENSION
+
+    @classmethod
+    def GetFastaHash(cls, seqDBFilename: str) -> bytes:
+        """Вычисляет хэш содержимого fasta файла
+
+        Args:
+            seqDBFilename: имя fasta файла
+
+        Returns:
+            Хэш длиной HASH_SIZE байт
+        """
+        fastaHash = blake2b(digest_size=cls.HASH_SIZE)
+        with open(seqDBFilename, "rb") as seqDBFile:
+            for chunk in iter(
+                    lambda: seqDBFile.read(cls.HASH_CHUNK_SIZE), b""):
+                fastaHash.update(chunk)
+        return fastaHash.digest()
+
+    @classmethod
+    def Save(cls,
+             seqDBFilename: str,
+             fastaHash: bytes,
+             sequences: Dict[str, Union[Sequence, IndexedSequence]],
+             withSequences: bool) -> None:
+        """Сохраняет снимок базы последовательностей рядом с fasta файлом
+
+        Args:
+            seqDBFilename: имя fasta файла
+            fastaHash: хэш fasta файла (см. GetFastaHash)
+            sequences: словарь вида {"Accession": Sequence}. Если
+                withSequences == False, значения должны быть IndexedSequence
+            withSequences: сохранять ли сами последовательности
+        """
+        accessions = list(sequences.keys())
+        descs = [sequence.desc for sequence in sequences.values()]
+        if withSequences:
+            columns = (accessions, descs,
+                       [sequence.seq for sequence in sequences.values()])
+        else:
+            columns = (accessions, descs,
+                       [sequence.len for sequence in sequences.values()],
+                       [sequence.offset for sequence in sequences.values()],
+                       [sequence.end for sequence in sequences.values()])
+        snapshotFilename = cls.GetSnapshotFilename(seqDBFilename)
+        tempFilename = f"{snapshotFilename}.{getpid()}.tmp"
+        try:
+            with open(tempFilename, "wb") as snapshotFile:
+                snapshotFile.write(cls.HEADER.pack(
+                    cls.MAGIC, cls.SNAPSHOT_VERSION, withSequences,
+                    fastaHash))
+                snapshotFile.write(marshal.dumps(columns))
+            replace(tempFilename, snapshotFilename)
+        except OSError:
+            if path.exists(tempFilename):
+                remove(tempFilename)
+            raise
+
+    @classmethod
+    def Load(cls,
+             seqDBFilename: str,
+             fastaHash: bytes,
+             withSequences: bool
+             ) -> Optional[Dict[str, Union[Sequence, IndexedSequence]]]:
+        """Считывает снимок базы последовательностей
+
+        Args:
+            seqDBFilename: имя fasta файла
+            fastaHash: хэш fasta файла (см. GetFastaHash)
+            withSequences: должен ли снимок содержать сами последовательности
+
+        Returns:
+            Словарь вида {"Accession": Sequence} или None, если снимка нет,
+            он повреждён или построен для другого fasta файла
+        """
+        try:
+            with open(cls.GetSnapshotFilename(seqDBFilename),
+                      "rb") as snapshotFile:
+                header = snapshotFile.read(cls.HEADER.size)
+                if header != cls.HEADER.pack(cls.MAGIC, cls.SNAPSHOT_VERSION,
+                                             withSequences, fastaHash):
+                    return None
+                columns = marshal.loads(snapshotFile.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        sequences: Dict[str, Union[Sequence, IndexedSequence]] = {}
+        if withSequences:
+            for accession, desc, seq in zip(*columns):
+                sequences[accession] = Sequence(accession, desc, seq)
+        else:
+            source = FastaMap(seqDBFilename)
+            for accession, desc, length, offset, end in zip(*columns):
+                sequences[accession] = IndexedSequence(
+                    accession, desc, length, source, offset, end)
+        return sequences
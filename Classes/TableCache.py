@@ -0,0 +1,128 @@
+import marshal
+import zlib
+from hashlib import blake2b
+from os import (
+    getpid, listdir, makedirs, path, remove, replace, stat, utime)
+from typing import Any, List, Optional, Tuple
+
+
+class TableCache:
+    """Кэш считанных таблиц на диске
+
+    Для каждого файла таблицы хранится список строк, уже разобранных на
+    нужные столбцы, в сжатом виде (marshal + zlib). Ключ кэша составляется из
+    пути к файлу, его размера, времени изменения, хэша содержимого, типа
+    таблицы и расположения столбцов, поэтому изменённые файлы считываются
+    заново. Когда суммарный размер кэша превышает maxSize, удаляются записи,
+    которые дольше всех не использовались.
+
+    Attributes:
+        cacheDir: папка для хранения кэша
+        maxSize: максимальный суммарный размер записей кэша в байтах
+    """
+
+    CACHE_VERSION = 2
+    ENTRY_EXTENSION = ".tbl"
+    HASH_CHUNK_SIZE = 1 << 20
+
+    cacheDir: str
+    maxSize: int
+
+    def __init__(self, cacheDir: str, maxSize: int = 1 << 30) -> None:
+        """
+        Args:
+            cacheDir: папка для хранения кэша
+            maxSize: максимальный суммарный размер записей кэша в байтах
+        """
+        self.cacheDir = cacheDir
+        self.maxSize = maxSize
+
+    def GetKey(self, tableFilename: str, *layout: Any) -> str:
+        """Вычисляет ключ кэша для файла таблицы
+
+        Args:
+            tableFilename: имя файла таблицы
+            layout: всё, что определяет результат разбора файла (тип таблицы,
+                расположение столбцов и т. п.)
+
+        Returns:
+            Ключ кэша
+        """
+        fileStat = stat(tableFilename)
+        contentHash = blake2b(digest_size=16)
+        with open(tableFilename, "rb") as inFile:
+            for chunk in iter(
+                    lambda: inFile.read(self.HASH_CHUNK_SIZE), b""):
+                contentHash.update(chunk)
+        return blake2b(
+            repr((
+                self.CACHE_VERSION,
+                path.abspath(tableFilename),
+                fileStat.st_size,
+                fileStat.st_mtime_ns,
+                contentHash.hexdigest(),
+                layout,
+            )).encode(),
+            digest_size=20,
+        ).hexdigest()
+
+    def Load(self, key: str) -> Optional[List[Tuple]]:
+        """Получает строки таблицы из кэша
+
+        Args:
+            key: ключ кэша (см. GetKey)
+
+        Returns:
+            Список строк таблицы или None, если записи нет в кэше
+        """
+        entryFilename = self._GetEntryFilename(key)
+        try:
+            with open(entryFilename, "rb") as entryFile:
+                rows = marshal.loads(zlib.decompress(entryFile.read()))
+            utime(entryFilename)
+        except (OSError, EOFError, ValueError, TypeError, zlib.error):
+            return None
+        return rows
+
+    def Save(self, key: str, rows: List[Tuple]) -> None:
+        """Сохраняет строки таблицы в кэш и удаляет устаревшие записи
+
+        Args:
+            key: ключ кэша (см. GetKey)
+            rows: список строк таблицы, состоящих только из str, int и
+                кортежей из них
+        """
+        makedirs(self.cacheDir, exist_ok=True)
+        entryFilename = self._GetEntryFilename(key)
+        tempFilename = f"{entryFilename}.{getpid()}.tmp"
+        with open(tempFilename, "wb") as entryFile:
+            entryFile.write(zlib.compress(marshal.dumps(rows), 1))
+        replace(tempFilename, entryFilename)
+        self.Evict()
+
+    def Evict(self) -> None:
+        """Удаляет записи, которые дольше всех не использовались, пока
+        суммарный размер кэша больше maxSize"""
+        entries = []
+        for filename in listdir(self.cacheDir):
+            if not filename.endswith(self.ENTRY_EXTENSION):
+                continue
+            entryFilename = path.join(self.cacheDir, filename)
+            try:
+                entryStat = stat(entryFilename)
+            except FileNotFoundError:
+                continue
+            entries.append(
+                (entryStat.st_mtime_ns, entryStat.st_size, entryFilename))
+        totalSize = sum(size for _, size, _ in entries)
+        for _, size, entryFilename in sorted(entries):
+            if totalSize <= self.maxSize:
+                break
+            try:
+                remove(entryFilename)
+            except FileNotFoundError:
+                pass
+            totalSize -= size
+
+    def _GetEntryFilename(self, key: str) -> str:
+        return path.join(self.cacheDir, key + self.ENTRY_EXTENSION)
@@ -0,0 +1,40 @@
+"""Фильтрация таблиц по маске строк
+
+Вместо удаления строк по одной (pop в цикле, квадратичное время) фильтр
+сначала вычисляет маску оставляемых строк по всей таблице, а затем таблица
+сжимается один раз методом Compact. Compact есть у всех таблиц: у
+основанных на списке (Table.Compact) и у таблиц из массивов
+(ArrayRawPeptideTable.Compact, ArrayPeptideTable.Compact).
+"""
+from typing import Any, Callable, Sequence
+
+
+def CompactTable(table: Any, keep: Sequence[bool]) -> int:
+    """Оставляет в таблице только строки, для которых keep истинно
+
+    Если удалять нечего, таблица не изменяется.
+
+    Args:
+        table: таблица с методом Compact
+        keep: маска строк, длина которой равна длине таблицы
+
+    Returns:
+        Количество удалённых строк
+    """
+    removedCount = len(keep) - sum(keep)
+    if removedCount:
+        table.Compact(keep)
+    return removedCount
+
+
+def FilterTable(table: Any, predicate: Callable[[Any], bool]) -> int:
+    """Оставляет в таблице только строки, для которых predicate истинно
+
+    Args:
+        table: таблица с методом Compact
+        predicate: функция, получающая строку таблицы
+
+    Returns:
+        Количество удалённых строк
+    """
+    return CompactTable(table, [bool(predicate(row)) for row in table])
@@ -0,0 +1,353 @@
+"""Этапы обработки, которые выполняются для каждой таблицы независимо от
+остальных. Используются как при последовательной обработке, так и
+процессами TableWorkers при параллельной (--jobs). Завершающий этап
+(WriteAccessionTables) выполняется для всех таблиц вместе"""
+from os import path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from .Accession import Accession
+from .AccessionExclusionList import AccessionExclusionList
+from .AccessionMatrix import AccessionMatrix
+from .AccessionTables import AccessionTables
+from .FDRCutoff import FDRCutoff
+from .FDRFilter import FDRFilter
+from .GlobalFDR import GlobalFDR
+from .Functions import (
+    ApplyGroupFilter,
+    ApplyPeptideConfidenceFilter,
+    ApplyProteinConfidenceFilter,
+    CalculateAccessionsNormRatios,
+    GetScPsigAndNormFilesSumm,
+    RaiseNotFoundAccessions,
+    ReportBlackListCounts,
+    ReportRepresentativeStats,
+)
+from .Input import Input
+from .NumericVerification import (
+    GetReferenceTables,
+    ReportNumericDeviations,
+    SelectVerificationTables,
+)
+from .Output import Output
+from .PeptideColumns import PeptideColumns
+from .PeptideTables import PeptideTables
+from .RawPeptideTables import RawPeptideTables
+from .RepresentativeStats import RepresentativeStats
+from .RowPipeline import RowPipeline
+from .TableCache import TableCache
+from .TableWorkers import TableWorkers
+
+
+def ReadRawPeptideTables(
+    inputParams: Input,
+    columnNames: PeptideColumns,
+    tableNums: Optional[Iterable[str]] = None,
+) -> RawPeptideTables:
+    """Считывает Peptide таблицы, применяет к ним FDR фильтр и чёрный
+    список и заполняет каталог Accession (RawPeptideTables.accessionCatalog):
+    количество появлений Accession в каждой таблице и Accession,
+    отсутствующие в базе данных последовательностей
+
+    Args:
+        inputParams: параметры запуска обработки
+        columnNames: имена заголовков
+        tableNums: номера считываемых таблиц, если нужно считать не все
+            таблицы
+
+    Returns:
+        Считанные построчно Peptide таблицы
+    """
+    fdrParams = GlobalFDR.ParseParams(inputParams.fdr)
+    rawPeptideTables = RawPeptideTables(
+        columnNames,
+        inputDir=inputParams.inputPath,
+        tableNums=tableNums,
+        cache=(
+            TableCache(inputParams.cachePath, inputParams.cacheSize)
+            if inputParams.cachePath is not None
+            else None
+        ),
+        arrayTables=inputParams.arrayTables,
+        # Default FDR фильтр обрезает таблицы на первой обратной строке, а
+        # глобальному FDR фильтру нужны все строки
+        stopAtDecoys=fdrParams is None,
+    )
+
+    if fdrParams is not None:
+        rawPeptideTables.fdrCutoffs = FDRFilter(
+            rawPeptideTables=rawPeptideTables
+        ).ApplyGlobalFilter(*fdrParams)
+
+    # Default FDR фильтр, чёрный список, проверка наличия в базе данных
+    # последовательностей и подсчёт Accession — за один проход по таблице
+    RowPipeline(
+        rawPeptideTables,
+        inputParams.seqDB,
+        AccessionExclusionList(inputParams.blackList[1])
+        if inputParams.blackList is not None
+        else None,
+    ).Apply()
+    return rawPeptideTables
+
+
+def GetAccessionTables(
+    inputParams: Input,
+    rawPeptideTables: RawPeptideTables,
+    generalCounts: Optional[Dict[int, int]] = None,
+) -> AccessionTables:
+    """Выбирает репрезентативные Accession, выводит статистику выбора,
+    применяет фильтры по confidence и подсчитывает параметры Accession для
+    каждой таблицы
+
+    Args:
+        inputParams: параметры запуска обработки
+        rawPeptideTables: считанные построчно Peptide таблицы
+        generalCounts: количество появлений каждого Accession (по кодам
+            rawPeptideTables.accessionDictionary) во всех таблицах, если
+            rawPeptideTables содержит только часть таблиц
+
+    Returns:
+        AccessionTables для таблиц из rawPeptideTables
+    """
+    peptideTables = PeptideTables(
+        rawPeptideTables,
+        seqDB=inputParams.seqDB,
+        generalCounts=generalCounts,
+    )
+    ReportRepresentativeStats(peptideTables.representativeStats)
+    return FilterPeptideTables(
+        inputParams, peptideTables, rawPeptideTables.fdrCutoffs
+    )
+
+
+def FilterPeptideTables(
+    inputParams: Input,
+    peptideTables: PeptideTables,
+    fdrCutoffs: Optional[Dict[str, FDRCutoff]] = None,
+) -> AccessionTables:
+    """Применяет фильтры по confidence к Peptide таблицам и подсчитывает
+    параметры Accession для каждой таблицы
+
+    Args:
+        inputParams: параметры запуска обработки
+        peptideTables: Peptide таблицы с выбранными репрезентативными
+            Accession. Фильтры изменяют таблицы
+        fdrCutoffs: границы глобального FDR фильтра для каждой таблицы
+
+    Returns:
+        AccessionTables для таблиц из peptideTables
+    """
+    if inputParams.isProteinConfidence is True:
+        ApplyProteinConfidenceFilter(
+            inputParams.proteinConfidence, peptideTables
+        )
+    ApplyPeptideConfidenceFilter(inputParams.confPeptide, peptideTables)
+
+    accessionTables = AccessionTables(
+        inputParams.seqDB, peptideTables, inputParams.numericBackend
+    )
+    if inputParams.numericBackend == "float" and inputParams.verifyTables:
+        accessionTables.referenceTables = GetReferenceTables(
+            inputParams.seqDB,
+            peptideTables,
+            SelectVerificationTables(
+                RawPeptideTables.GetPeptideSummaryFilenames(
+                    inputParams.inputPath
+                ),
+                inputParams.verifyTables,
+            ),
+        )
+    accessionTables.fdrCutoffs = fdrCutoffs or None
+    return accessionTables
+
+
+def WriteAccessionTables(
+    inputParams: Input, accessionTables: AccessionTables
+) -> None:
+    """Переводит AccessionTables в AccessionMatrix, нормализует параметры
+    Accession, применяет фильтр по группам и записывает выходные файлы
+
+    Args:
+        inputParams: параметры запуска обработки
+        accessionTables: AccessionTables всех таблиц
+    """
+    accessionMatrix = AccessionMatrix(accessionTables)
+    filesSumms = GetScPsigAndNormFilesSumm(accessionMatrix)
+    CalculateAccessionsNormRatios(accessionMatrix, filesSumms)
+    ReportNumericDeviations(accessionMatrix, accessionTables.referenceTables)
+
+    ApplyGroupFilter(
+        accessionMatrix,
+        inputParams.maxGroupAbsence,
+        inputParams.minGroupsWithAccession,
+    )
+
+    Output(
+        inputParams,
+        seqDB=inputParams.seqDB,
+        accessionMatrix=accessionMatrix,
+        proteinGroupsDB=None,
+    )
+
+
+def _ReadTablesStage(
+    state: Dict[str, Any], columnNames: PeptideColumns
+) -> Tuple[
+    Dict[str, Dict[str, int]], Set[str], Dict[str, int], Dict[str, FDRCutoff]
+]:
+    """Первый этап параллельной обработки, выполняемый в TableWorkers
+
+    Коды Accession у каждого процесса свои, поэтому Accession'ы передаются
+    в основной процесс по именам.
+
+    Returns:
+        Количество появлений каждого Accession в каждой таблице процесса,
+        множество Accession, отсутствующих в базе данных последовательностей,
+        количество строк, удалённых по правилам чёрного списка, и границы
+        глобального FDR фильтра таблиц процесса
+    """
+    inputParams: Input = state["inputParams"]
+    rawPeptideTables = ReadRawPeptideTables(
+        inputParams, columnNames, state["tableNums"]
+    )
+    state["rawPeptideTables"] = rawPeptideTables
+    accessionDictionary = rawPeptideTables.accessionDictionary
+    catalog = rawPeptideTables.accessionCatalog
+    countsPerTable = {
+        tableNum: accessionDictionary.KeysToNames(counts)
+        for tableNum, counts in catalog.tableCounts.items()
+    }
+    return (
+        countsPerTable,
+        catalog.notFoundAccessions,
+        rawPeptideTables.blackListCounts,
+        rawPeptideTables.fdrCutoffs,
+    )
+
+
+def _AccessionTablesStage(
+    state: Dict[str, Any], generalCounts: Dict[str, int]
+) -> Tuple[
+    Dict[str, Dict[str, Accession]],
+    Dict[str, Dict[str, Accession]],
+    RepresentativeStats,
+]:
+    """Второй этап параллельной обработки, выполняемый в TableWorkers
+
+    Статистика выбора репрезентативных Accession выводится основным
+    процессом после суммирования по всем процессам.
+
+    Args:
+        generalCounts: количество появлений каждого Accession во всех
+            таблицах вида {"Имя Accession": количество}
+
+    Returns:
+        Accession'ы каждой таблицы процесса и проверочных таблиц процесса
+        (см. AccessionTables.referenceTables) вида {
+            "Номер таблицы": {
+                "Имя Accession": Accession
+            }
+        }, а также статистику выбора репрезентативных Accession
+    """
+    rawPeptideTables: RawPeptideTables = state.pop("rawPeptideTables")
+    inputParams: Input = state["inputParams"]
+    peptideTables = PeptideTables(
+        rawPeptideTables,
+        seqDB=inputParams.seqDB,
+        generalCounts=rawPeptideTables.accessionDictionary.KeysToIds(
+            generalCounts
+        ),
+    )
+    accessionTables = FilterPeptideTables(
+        inputParams, peptideTables, rawPeptideTables.fdrCutoffs
+    )
+    referenceTables = accessionTables.referenceTables or {}
+    return (
+        {
+            tableNum: accessionTables.ExportTable(tableNum)
+            for tableNum in accessionTables
+        },
+        {
+            tableNum: referenceTables.ExportTable(tableNum)
+            for tableNum in referenceTables
+        },
+        peptideTables.representativeStats,
+    )
+
+
+def GetAccessionTablesInParallel(
+    inputParams: Input, columnNames: PeptideColumns
+) -> AccessionTables:
+    """Параллельно выполняет ReadRawPeptideTables, проверку наличия
+    Accession в базе данных последовательностей и GetAccessionTables
+
+    Таблицы распределяются между inputParams.jobs процессами. Между этапами
+    основной процесс только суммирует количество появлений Accession во всех
+    таблицах, поэтому результат совпадает с последовательной обработкой.
+
+    Args:
+        inputParams: параметры запуска обработки
+        columnNames: имена заголовков
+
+    Returns:
+        AccessionTables для всех таблиц
+    """
+    filenames = RawPeptideTables.GetPeptideSummaryFilenames(
+        inputParams.inputPath
+    )
+    tableWeights = {
+        tableNum: path.getsize(filename)
+        for tableNum, filename in filenames.items()
+    }
+    accessionsPerTable: Dict[str, Dict[str, Accession]] = {}
+    referencePerTable: Dict[str, Dict[str, Accession]] = {}
+    with TableWorkers(
+        inputParams.jobs, tableWeights, {"inputParams": inputParams}
+    ) as workers:
+        countsPerTable: Dict[str, Dict[str, int]] = {}
+        notFoundAccessions: Set[str] = set()
+        blackListCounts: Dict[str, int] = {}
+        fdrCutoffs: Dict[str, FDRCutoff] = {}
+        for (partCounts, partNotFoundAccessions, partBlackListCounts,
+             partFDRCutoffs) in workers.Run(_ReadTablesStage, columnNames):
+            countsPerTable.update(partCounts)
+            notFoundAccessions.update(partNotFoundAccessions)
+            fdrCutoffs.update(partFDRCutoffs)
+            for rule, count in partBlackListCounts.items():
+                blackListCounts[rule] = blackListCounts.get(rule, 0) + count
+        if inputParams.blackList is not None:
+            ReportBlackListCounts(blackListCounts)
+        RaiseNotFoundAccessions(notFoundAccessions)
+
+        generalCounts = dict(
+            PeptideTables.GetGeneralAccessionCounts(countsPerTable)
+        )
+        representativeStats = RepresentativeStats()
+        for part, referencePart, partStats in workers.Run(
+            _AccessionTablesStage, generalCounts
+        ):
+            accessionsPerTable.update(part)
+            referencePerTable.update(referencePart)
+            representativeStats.Add(partStats)
+        ReportRepresentativeStats(representativeStats)
+
+    accessionTables = AccessionTables(
+        inputParams.seqDB, None, inputParams.numericBackend
+    )
+    for tableNum in filenames:
+        accessionTables.ImportTable(tableNum, accessionsPerTable[tableNum])
+    if fdrCutoffs:
+        accessionTables.fdrCutoffs = {
+            tableNum: fdrCutoffs[tableNum] for tableNum in filenames
+        }
+    if referencePerTable:
+        referenceTables = AccessionTables(inputParams.seqDB, None)
+        referenceTables.accessionDictionary = (
+            accessionTables.accessionDictionary
+        )
+        for tableNum in filenames:
+            if tableNum in referencePerTable:
+                referenceTables.ImportTable(
+                    tableNum, referencePerTable[tableNum]
+                )
+        accessionTables.referenceTables = referenceTables
+    return accessionTables
@@ -0,0 +1,145 @@
+from decimal import Context, getcontext, setcontext
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def _WorkerLoop(connection: Connection,
+                state: Dict[str, Any],
+                context: Context) -> None:
+    """Цикл процесса-обработчика
+
+    Получает из connection пары (функция, аргументы), вызывает
+    функция(state, *аргументы) и отправляет обратно пару
+    (успешно ли выполнение, результат или исключение). Завершается при
+    получении None.
+
+    Args:
+        connection: канал связи с основным процессом
+        state: состояние процесса, сохраняемое между этапами
+        context: контекст Decimal основного процесса
+    """
+    setcontext(context)
+    while True:
+        task = connection.recv()
+        if task is None:
+            break
+        function, args = task
+        try:
+            connection.send((True, function(state, *args)))
+        except BaseException as exception:
+            connection.send((False, exception))
+    connection.close()
+
+
+class TableWorkers:
+    """Процессы-обработчики, между которыми распределены таблицы
+
+    Каждый процесс получает постоянную часть таблиц (ключ "tableNums" в его
+    состоянии) и хранит данные этих таблиц между этапами обработки, поэтому
+    между процессами передаются только результаты этапов, а не сами таблицы.
+
+    Attributes:
+        partitions: номера таблиц каждого процесса
+    """
+
+    partitions: List[List[str]]
+    _processes: List[Process]
+    _connections: List[Connection]
+
+    def __init__(self,
+                 jobs: int,
+                 tableWeights: Dict[str, int],
+                 state: Dict[str, Any]) -> None:
+        """
+        Args:
+            jobs: максимальное количество процессов
+            tableWeights: словарь вида {
+                    "номер таблицы": трудоёмкость обработки (размер файла)
+                }
+            state: начальное состояние, копируемое в каждый процесс
+        """
+        self.partitions = self.SplitTables(tableWeights, jobs)
+        self._processes = []
+        self._connections = []
+        for tableNums in self.partitions:
+            connection, workerConnection = Pipe()
+            process = Process(
+                target=_WorkerLoop,
+                args=(workerConnection,
+                      {**state, "tableNums": tableNums},
+                      getcontext()),
+                daemon=True)
+            process.start()
+            workerConnection.close()
+            self._processes.append(process)
+            self._connections.append(connection)
+
+    @staticmethod
+    def SplitTables(tableWeights: Dict[str, int],
+                    jobs: int) -> List[List[str]]:
+        """Распределяет таблицы между процессами так, чтобы суммарная
+        трудоёмкость таблиц каждого процесса была примерно одинаковой
+
+        Args:
+            tableWeights: словарь вида {
+                    "номер таблицы": трудоёмкость обработки
+                }
+            jobs: максимальное количество процессов
+
+        Returns:
+            Непустые списки номеров таблиц для каждого процесса
+        """
+        partitions: List[Tuple[int, List[str]]] = [
+            (0, []) for _ in range(max(1, min(jobs, len(tableWeights))))]
+        for tableNum in sorted(tableWeights,
+                               key=lambda x: (-tableWeights[x], x)):
+            i = min(range(len(partitions)), key=lambda x: partitions[x][0])
+            weight, tableNums = partitions[i]
+            tableNums.append(tableNum)
+            partitions[i] = (weight + tableWeights[tableNum], tableNums)
+        return [tableNums for _, tableNums in partitions if len(tableNums)]
+
+    def Run(self, function: Callable, *args) -> List[Any]:
+        """Выполняет function(state, *args) в каждом процессе
+
+        Args:
+            function: функция уровня модуля, принимающая состояние процесса
+                и args
+            args: аргументы, передаваемые во все процессы
+
+        Returns:
+            Результаты всех процессов в порядке self.partitions
+        """
+        for connection in self._connections:
+            connection.send((function, args))
+        results = []
+        exception = None
+        for connection in self._connections:
+            isSuccess, result = connection.recv()
+            if isSuccess:
+                results.append(result)
+            elif exception is None:
+                exception = result
+        if exception is not None:
+            raise exception
+        return results
+
+    def Close(self) -> None:
+        """Завершает все процессы"""
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self) -> 'TableWorkers':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.Close()
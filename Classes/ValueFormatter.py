@@ -0,0 +1,87 @@
+from decimal import Context, Decimal, getcontext
+from typing import Iterable, List, Optional, Union
+
+
+class ValueFormatter:
+    """Форматирует значения Accession для выходных таблиц
+
+    Значение округляется до 6 знаков после запятой (но не меньше, чем до
+    одной значащей цифры), после чего незначащие нули дробной части
+    отбрасываются. Значения float переводятся в Decimal через repr, целые
+    числа записываются как есть.
+
+    Вместо создания локального контекста для каждого значения используется
+    одна копия текущего контекста, точность которой меняется перед
+    округлением: результат совпадает с округлением в localcontext, но без
+    затрат на вход в контекст и выход из него.
+
+    Attributes:
+        context: копия текущего контекста, в которой округляются значения
+    """
+
+    context: Context
+
+    def __init__(self) -> None:
+        # Копия нужна, чтобы изменение точности не влияло на вычисления вне
+        # форматирования
+        self.context = getcontext().copy()
+
+    def Format(self, value: Union[Decimal, float, int]) -> str:
+        """Форматирует одно значение
+
+        Args:
+            value: значение поля Accession
+
+        Returns:
+            Строковое представление значения
+        """
+        return self._FormatValues((value,))[0]
+
+    def FormatRow(
+        self, values: Iterable[Optional[Union[Decimal, float, int]]]
+    ) -> List[str]:
+        """Форматирует значения строки выходной таблицы
+
+        Args:
+            values: значения по таблицам (None, если Accession нет в таблице)
+
+        Returns:
+            Строковые представления значений (пустая строка вместо None)
+        """
+        return self._FormatValues(values)
+
+    def _FormatValues(
+        self, values: Iterable[Optional[Union[Decimal, float, int]]]
+    ) -> List[str]:
+        """Форматирует значения (см. ValueFormatter)
+
+        Округление записано один раз в цикле по значениям, а не в функции,
+        вызываемой для каждого значения: вызов занимает столько же времени,
+        сколько само округление.
+
+        Args:
+            values: значения (None, если значения нет)
+
+        Returns:
+            Строковые представления значений (пустая строка вместо None)
+        """
+        context = self.context
+        plus = context.plus
+        cells = []
+        append = cells.append
+        for value in values:
+            if value is None:
+                append('')
+                continue
+            if isinstance(value, int):
+                append(str(int(value)))
+                continue
+            if isinstance(value, float):
+                value = Decimal(repr(value))
+            context.prec = max(1, 7 + value.adjusted())
+            formatted = str(plus(value))
+            if ('.' in formatted and 'E' not in formatted
+                    and 'e' not in formatted):
+                formatted = formatted.rstrip("0").rstrip(".")
+            append(formatted)
+        return cells
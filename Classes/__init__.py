@@ -3,14 +3,15 @@ from .AccessionTables import AccessionTables
 from .Comparable import Comparable
 from .Errors import (ColumnNotFoundError,
                      RepresentativeAccessionNotFoundError)
-from .Functions import (ApplyBlackList,
-                        ApplyPeptideConfidenceFilter,
+from .Functions import (ApplyPeptideConfidenceFilter,
                         ApplyProteinConfidenceFilter,
                         ApplyGroupFilter,
                         CalculateAccessionsNormRatios,
+                        GetFileLines,
                         GetInput,
                         GetScPsigAndNormFilesSumm,
-                        TestFastaAccessions)
+                        RaiseNotFoundAccessions,
+                        ReportBlackListCounts)
 from .Output import Output
 from .Input import Input
 from .PeptideTables import PeptideTables
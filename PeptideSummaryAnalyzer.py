@@ -1,22 +1,20 @@
 #!/usr/bin/env python3
-from Classes.FDRFilter import FDRFilter
-from Classes.RawPeptideTables import RawPeptideTables
+from Classes.ParameterSweep import ParameterSweep
+from Classes.TableStages import (
+    GetAccessionTables,
+    GetAccessionTablesInParallel,
+    ReadRawPeptideTables,
+    WriteAccessionTables,
+)
 from decimal import FloatOperation, getcontext
 
-from Classes import AccessionTables
 from Classes import (
-    ApplyBlackList,
-    ApplyPeptideConfidenceFilter,
-    ApplyGroupFilter,
-    ApplyProteinConfidenceFilter,
-    CalculateAccessionsNormRatios,
+    GetFileLines,
     GetInput,
-    GetScPsigAndNormFilesSumm,
-    TestFastaAccessions,
+    RaiseNotFoundAccessions,
+    ReportBlackListCounts,
 )
 from Classes import Input
-from Classes import Output
-from Classes import PeptideTables
 from Classes import PeptideColumns
 
 """См. README"""
@@ -29,42 +27,25 @@ def main(inputParams: Input = None) -> None:
         inputParams = GetInput()
     columnNames = PeptideColumns()
 
-    rawPeptideTables = RawPeptideTables(
-        columnNames, inputDir=inputParams.inputPath
-    )
-
-    # TODO: FDR filter
-    FDRFilter(rawPeptideTables=rawPeptideTables).ApplyDefaultFilter()
-
-    if inputParams.blackList is not None:
-        ApplyBlackList(rawPeptideTables, inputParams.blackList[1])
-
-    TestFastaAccessions(inputParams.seqDB, rawPeptideTables)
-    peptideTables = PeptideTables(rawPeptideTables, seqDB=inputParams.seqDB)
+    if inputParams.sweepPath is not None:
+        ParameterSweep(
+            inputParams,
+            ParameterSweep.ReadGrid(GetFileLines(inputParams.sweepPath)),
+        ).Run(columnNames)
+        return
 
-    if inputParams.isProteinConfidence is True:
-        ApplyProteinConfidenceFilter(
-            inputParams.proteinConfidence, peptideTables
+    if inputParams.jobs > 1:
+        accessionTables = GetAccessionTablesInParallel(
+            inputParams, columnNames
         )
-    ApplyPeptideConfidenceFilter(inputParams.confPeptide, peptideTables)
-
-    accessionTables = AccessionTables(inputParams.seqDB, peptideTables)
-    accessionTables.sortedTableNums = peptideTables.GetSortedTableNums()
-    filesSumms = GetScPsigAndNormFilesSumm(accessionTables)
-    CalculateAccessionsNormRatios(accessionTables, filesSumms)
-
-    ApplyGroupFilter(
-        accessionTables,
-        inputParams.maxGroupAbsence,
-        inputParams.minGroupsWithAccession,
-    )
-
-    Output(
-        inputParams,
-        seqDB=inputParams.seqDB,
-        accessionTables=accessionTables,
-        proteinGroupsDB=None,
-    )
+    else:
+        rawPeptideTables = ReadRawPeptideTables(inputParams, columnNames)
+        if inputParams.blackList is not None:
+            ReportBlackListCounts(rawPeptideTables.blackListCounts)
+        RaiseNotFoundAccessions(
+            rawPeptideTables.accessionCatalog.notFoundAccessions)
+        accessionTables = GetAccessionTables(inputParams, rawPeptideTables)
+    WriteAccessionTables(inputParams, accessionTables)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from Classes.AccessionExclusionList import AccessionExclusionList
+from Classes.PeptideColumns import PeptideColumns
+from Classes.RawPeptideTables import RawPeptideTables
+
+
+class AccessionExclusionListTest(unittest.TestCase):
+
+    peptideColumns = PeptideColumns(
+        accession=(1, "Accessions"),
+        sc=(3, "Score"),
+        precursorSignal=(4, "Intensity (Peptide)"),
+        sequence=(2, "Sequence"),
+        confidence=(0, "Best Conf (Peptide)"),
+    )
+    lines = ["cont|0001|KER", "", "KRT*", "/P0+[1-3]/", "  Q1  ", ""]
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tempDir.name, "1.1_PeptideSummary.txt"),
+                  'w') as outFile:
+            outFile.write('\n'.join([
+                "Best Conf (Peptide)\tAccessions\tSequence\tScore\t"
+                "Intensity (Peptide)",
+                "99\tA; cont|0001|KER\tAAK\t1\t1",
+                "99\tKRT10\tAAK\t1\t1",
+                "99\tB; P002\tAAK\t1\t1",
+                "99\tP004\tAAK\t1\t1",
+                "99\tKRT1; Q1\tAAK\t1\t1",
+                "99\tcont|0001|KERX; KR\tAAK\t1\t1",
+            ]))
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def testMatch(self):
+        exclusionList = AccessionExclusionList(self.lines)
+        self.assertEqual(exclusionList.accessions,
+                         frozenset(["cont|0001|KER", "Q1"]))
+        self.assertListEqual(exclusionList.rules, ["KRT*", "/P0+[1-3]/"])
+        self.assertEqual(exclusionList.Match("Q1"), "Q1")
+        self.assertEqual(exclusionList.Match("KRT"), "KRT*")
+        self.assertEqual(exclusionList.Match("P0003"), "/P0+[1-3]/")
+        self.assertIsNone(exclusionList.Match("P0004"))
+        self.assertIsNone(exclusionList.Match("XKRT1"))
+        self.assertIsNone(exclusionList.Match(""))
+
+    def testInvalidRule(self):
+        with self.assertRaises(ValueError):
+            AccessionExclusionList(["/P[/"])
+
+    def testRemoveExcludedRows(self):
+        exclusionList = AccessionExclusionList(self.lines)
+        for arrayTables in (False, True):
+            rawPeptideTables = RawPeptideTables(
+                self.peptideColumns, self.tempDir.name,
+                arrayTables=arrayTables)
+            removedCounts = exclusionList.RemoveExcludedRows(
+                rawPeptideTables["1.1"], exclusionList.GetExcludedIds(
+                    rawPeptideTables.accessionDictionary))
+            self.assertDictEqual(removedCounts, {
+                "cont|0001|KER": 1, "KRT*": 2, "/P0+[1-3]/": 1})
+            self.assertListEqual(
+                [row.accessions for row in rawPeptideTables["1.1"]],
+                [["P004"], ["cont|0001|KERX", "KR"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import random
+import unittest
+from decimal import Decimal
+from Classes.Accession import Accession
+from Classes.AccessionMatrix import AccessionMatrix
+from Classes.AccessionTables import AccessionTables
+
+
+class AccessionMatrixTest(unittest.TestCase):
+
+    def CreateTables(self, rng, numericBackend):
+        accessionTables = AccessionTables({}, None, numericBackend)
+        convert = float if numericBackend == "float" else Decimal
+        for tableNum in ("10.1", "2.1", "2.2", "3.1"):
+            table = accessionTables[tableNum] = {}
+            for name in rng.sample([f"P{i}" for i in range(15)],
+                                   rng.randrange(15)):
+                accessionId = accessionTables.accessionDictionary.GetId(name)
+                table[accessionId] = Accession(
+                    name=name,
+                    ScNorm=convert(Decimal(rng.randrange(10 ** 6)).scaleb(
+                        rng.randrange(-6, 0))),
+                    Counts=rng.randrange(1, 10))
+        return accessionTables
+
+    def testSumsAndRatios(self):
+        rng = random.Random(7)
+        for numericBackend in ("decimal", "float"):
+            accessionTables = self.CreateTables(rng, numericBackend)
+            accessionMatrix = AccessionMatrix(accessionTables)
+            self.assertListEqual(accessionMatrix.tableNums,
+                                 ["2.1", "2.2", "3.1", "10.1"])
+            sums = accessionMatrix.GetColumnSums("ScNorm")
+            expectedSums = []
+            for tableNum in accessionMatrix.tableNums:
+                expectedSum = accessionTables.zero
+                for accession in accessionTables[tableNum].values():
+                    expectedSum += accession.ScNorm
+                expectedSums.append(expectedSum)
+            self.assertListEqual(sums, expectedSums)
+            accessionMatrix.SetRatios("ScNormToFileNormRatio", "ScNorm",
+                                      sums)
+            for tableNum, tableSum in zip(accessionMatrix.tableNums, sums):
+                self.assertDictEqual(
+                    accessionMatrix.GetColumn(
+                        tableNum, "ScNormToFileNormRatio"),
+                    {
+                        accessionId: (accession.ScNorm / tableSum
+                                      if tableSum != 0
+                                      else accessionTables.zero)
+                        for accessionId, accession
+                        in accessionTables[tableNum].items()
+                    })
+            for accessionId, counts in zip(
+                    accessionMatrix.accessionIds,
+                    accessionMatrix.IterRows("Counts")):
+                self.assertTupleEqual(counts, tuple(
+                    accessionTables[tableNum][accessionId].Counts
+                    if accessionId in accessionTables[tableNum] else None
+                    for tableNum in accessionMatrix.tableNums))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import random
+import tempfile
+import unittest
+from decimal import Decimal
+from Classes.AccessionMatrix import AccessionMatrix
+from Classes.AccessionTables import AccessionTables
+from Classes.DecimalArray import DecimalArray
+from Classes.PeptideColumns import PeptideColumns
+from Classes.PeptideTables import PeptideTables
+from Classes.RawPeptideTables import RawPeptideTables
+from Classes.Sequence import Sequence
+
+
+class AccessionTablesTest(unittest.TestCase):
+
+    peptideColumns = PeptideColumns(
+        accession=(1, "Accessions"),
+        sc=(3, "Score"),
+        precursorSignal=(4, "Intensity (Peptide)"),
+        sequence=(2, "Sequence"),
+        confidence=(0, "Best Conf (Peptide)"),
+    )
+    names = [f"P{i}" for i in range(10)]
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        rng = random.Random(5)
+        self.seqDB = {
+            name: Sequence(name, seq="K" * rng.randrange(1, 50))
+            for name in self.names
+        }
+        for tableNum in range(1, 4):
+            lines = ["Best Conf (Peptide)\tAccessions\tSequence\tScore\t"
+                     "Intensity (Peptide)"]
+            for _ in range(rng.randrange(20, 80)):
+                accessions = rng.sample(self.names, rng.randrange(1, 3))
+                sc = Decimal(rng.randrange(10 ** 4)).scaleb(-2)
+                pSignal = Decimal(rng.randrange(10 ** 6)).scaleb(
+                    rng.randrange(-3, 2))
+                lines.append(
+                    f"99\t{'; '.join(accessions)}\t"
+                    f"{'A' * rng.randrange(3, 20)}\t{sc}\t{pSignal}")
+            filename = os.path.join(self.tempDir.name,
+                                    f"{tableNum}.1_PeptideSummary.txt")
+            with open(filename, 'w') as outFile:
+                outFile.write('\n'.join(lines))
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def GetPeptideTables(self, arrayTables):
+        return PeptideTables(
+            RawPeptideTables(self.peptideColumns, self.tempDir.name,
+                             arrayTables=arrayTables),
+            self.seqDB)
+
+    def GetNaiveAccessions(self, peptideTable):
+        accessions = {}
+        for row in peptideTable:
+            values = accessions.setdefault(
+                row.name, [0, 0, Decimal(0), Decimal(0)])
+            values[0] += 1
+            values[1] += row.sequenceLength
+            values[2] += row.sc
+            values[3] += row.precursorSignal
+        return {
+            name: (str(scSumm), str(scSumm / self.seqDB[name].len),
+                   str(pSignalSumm),
+                   str(pSignalSumm / self.seqDB[name].len), seqlenSumm,
+                   counts)
+            for name, (counts, seqlenSumm, scSumm, pSignalSumm)
+            in accessions.items()
+        }
+
+    def AssertAggregated(self, peptideTables):
+        accessionTables = AccessionTables(self.seqDB, peptideTables)
+        for tableNum, peptideTable in peptideTables.items():
+            self.assertDictEqual(
+                {
+                    accession.name: (
+                        str(accession.ScSumm), str(accession.ScNorm),
+                        str(accession.PSignalSumm),
+                        str(accession.PSignalNorm), accession.SeqlenSumm,
+                        accession.Counts)
+                    for accession in accessionTables[tableNum].values()
+                },
+                self.GetNaiveAccessions(peptideTable))
+
+    def testAggregation(self):
+        self.AssertAggregated(self.GetPeptideTables(False))
+        self.AssertAggregated(self.GetPeptideTables(True))
+
+    def testDecimalFallback(self):
+        peptideTables = self.GetPeptideTables(True)
+        for peptideTable in peptideTables.values():
+            peptideTable.sc = DecimalArray(
+                list(peptideTable.sc) + [Decimal("NaN")])
+            peptideTable.sc.Compact([True] * (len(peptideTable.sc) - 1)
+                                    + [False])
+            self.assertIsNotNone(peptideTable.sc.decimals)
+        self.AssertAggregated(peptideTables)
+
+    def testMatrixFromTableColumns(self):
+        for arrayTables in (False, True):
+            for numericBackend in AccessionTables.NUMERIC_BACKENDS:
+                accessionTables = AccessionTables(
+                    self.seqDB, self.GetPeptideTables(arrayTables),
+                    numericBackend)
+                imported = AccessionTables(self.seqDB, None, numericBackend)
+                imported.accessionDictionary = (
+                    accessionTables.accessionDictionary)
+                for tableNum, table in accessionTables.items():
+                    self.assertIsNotNone(
+                        accessionTables.GetTableColumns(tableNum))
+                    imported[tableNum] = dict(table)
+                    self.assertIsNone(imported.GetTableColumns(tableNum))
+                matrix = AccessionMatrix(accessionTables)
+                expected = AccessionMatrix(imported)
+                self.assertListEqual(matrix.accessionIds,
+                                     expected.accessionIds)
+                self.assertListEqual(matrix.tableRows, expected.tableRows)
+                self.assertDictEqual(matrix.planes, expected.planes)
+        accessionTables["1.1"] = {}
+        self.assertIsNone(accessionTables.GetTableColumns("1.1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
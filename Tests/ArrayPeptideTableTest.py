@@ -0,0 +1,156 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from Classes.AccessionDictionary import AccessionDictionary
+from Classes.ArrayRawPeptideTable import ArrayRawPeptideTable
+from Classes.DecimalArray import DecimalArray
+from Classes.FDRFilter import FDRFilter
+from Classes.PeptideAccession import PeptideAccession
+from Classes.PeptideColumns import PeptideColumns
+from Classes.RawPeptideTable import RawPeptideTable
+from Classes.TableCache import TableCache
+
+
+class ArrayPeptideTableTest(unittest.TestCase):
+
+    peptideColumns = PeptideColumns(
+        accession=(1, "Accessions"),
+        sc=(3, "Score"),
+        precursorSignal=(4, "Intensity (Peptide)"),
+        sequence=(2, "Sequence"),
+        confidence=(0, "Best Conf (Peptide)"),
+    )
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(
+            self.tempDir.name, "1.1_PeptideSummary.txt")
+        with open(self.filename, 'w') as outFile:
+            outFile.write('\n'.join([
+                "Best Conf (Peptide)\tAccessions\tSequence\tScore\t"
+                "Intensity (Peptide)",
+                "99.5\tA; B\tAAK\t10\t1.50",
+                "95\tRRRRRC; C\tCCK\t2.000\t",
+                "0\tB\tK\t-0.5\t1.2e+05",
+                "50\tRRRRRD\tDDDK\t1\t1",
+            ]))
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def LoadTables(self):
+        return (
+            RawPeptideTable(self.filename, True, self.peptideColumns),
+            ArrayRawPeptideTable(self.filename, True, self.peptideColumns),
+        )
+
+    def AssertSameRows(self, rawTable, arrayTable):
+        self.assertEqual(len(rawTable), len(arrayTable))
+        for row, view in zip(rawTable, arrayTable):
+            self.assertEqual(view.accessions, row.accessions)
+            for name in ("confidence", "sc", "precursorSignal"):
+                self.assertEqual(
+                    str(getattr(view, name)), str(getattr(row, name)))
+            self.assertEqual(view.sequenceLength, len(row.sequence))
+
+    def testDecimalArrayKeepsRepresentation(self):
+        values = [Decimal("1.50"), Decimal("0.00"), Decimal("-2"),
+                  Decimal("5E+2"), Decimal("123456789.123")]
+        decimalArray = DecimalArray(values)
+        self.assertIsNone(decimalArray.decimals)
+        self.assertListEqual(list(map(str, decimalArray)),
+                             list(map(str, values)))
+        decimalArray[1] = Decimal("7.0")
+        del decimalArray[0]
+        self.assertEqual(str(decimalArray[0]), "7.0")
+
+    def testDecimalArrayFallsBackToDecimals(self):
+        for special in (Decimal("-0.0"), Decimal("NaN"),
+                        Decimal("1" * 30), Decimal("1E+200")):
+            decimalArray = DecimalArray([Decimal("1.5")])
+            decimalArray.append(special)
+            self.assertIsNotNone(decimalArray.decimals)
+            self.assertEqual(str(decimalArray[0]), "1.5")
+            self.assertEqual(str(decimalArray[1]), str(special))
+
+    def testPackedValuesAreRestored(self):
+        for value in (Decimal("1.50"), Decimal("-2"), Decimal("1.2E+5"),
+                      Decimal("-0.0"), Decimal("NaN"), Decimal("1" * 30)):
+            packed = DecimalArray.Pack(value)
+            self.assertEqual(str(DecimalArray.Unpack(*packed)), str(value))
+            decimalArray = DecimalArray()
+            decimalArray.AppendPacked(*packed)
+            self.assertEqual(str(decimalArray[0]), str(value))
+        self.assertTupleEqual(DecimalArray.Pack(Decimal("1.50")), (150, -2))
+
+    def testLoadedTableIsEqual(self):
+        rawTable, arrayTable = self.LoadTables()
+        self.AssertSameRows(rawTable, arrayTable)
+
+    def testCachedTableIsEqual(self):
+        cache = TableCache(os.path.join(self.tempDir.name, "cache"))
+        rawTable = RawPeptideTable(self.filename, True, self.peptideColumns)
+        for _ in range(2):
+            arrayTable = ArrayRawPeptideTable(
+                self.filename, True, self.peptideColumns, cache=cache)
+            self.AssertSameRows(rawTable, arrayTable)
+            self.assertIsNone(arrayTable.confidence.decimals)
+
+    def testFilters(self):
+        rawTable, arrayTable = self.LoadTables()
+        for table in (rawTable, arrayTable):
+            FDRFilter({"1.1": table}).ApplyDefaultFilter()
+        self.AssertSameRows(rawTable, arrayTable)
+        self.assertEqual(len(arrayTable), 3)
+        self.assertEqual(arrayTable[1].accessions, ["C"])
+
+        for table in (rawTable, arrayTable):
+            table.RemoveRowsWithAccessions(["A", "X"])
+        self.AssertSameRows(rawTable, arrayTable)
+        self.assertEqual(len(arrayTable), 2)
+
+    def testSetAccessions(self):
+        _, arrayTable = self.LoadTables()
+        arrayTable[2].accessions = ["X", "Y", "Z"]
+        arrayTable[0].accessions = ["Y"]
+        self.assertEqual(arrayTable[2].accessions, ["X", "Y", "Z"])
+        self.assertEqual(arrayTable[0].accessions, ["Y"])
+        self.assertEqual(arrayTable[1].accessions, ["RRRRRC", "C"])
+
+    def testSharedAccessionDictionary(self):
+        accessionDictionary = AccessionDictionary()
+        rawTable = RawPeptideTable(
+            self.filename, True, self.peptideColumns,
+            accessionDictionary=accessionDictionary)
+        arrayTable = ArrayRawPeptideTable(
+            self.filename, True, self.peptideColumns,
+            accessionDictionary=accessionDictionary)
+        self.assertListEqual(
+            [list(ids) for ids in rawTable.IterAccessionIds()],
+            [list(ids) for ids in arrayTable.IterAccessionIds()])
+        self.assertIs(rawTable[0].accessions[1], arrayTable[2].accessions[0])
+        self.assertListEqual(accessionDictionary.SortByNames([3, 0, 2]),
+                             [0, 3, 2])
+
+    def testPeptideTable(self):
+        rawTable, arrayTable = self.LoadTables()
+        peptideTable = arrayTable.CreatePeptideTable()
+        for row, accessionIds in zip(arrayTable,
+                                     arrayTable.IterAccessionIds()):
+            peptideTable.AppendRow(row, accessionIds[-1])
+        peptideTable.append(PeptideAccession(
+            "A", Decimal(1), Decimal("2.0"), Decimal(3), "KK"))
+        self.assertListEqual([row.name for row in peptideTable],
+                             ["B", "C", "B", "RRRRRD", "A"])
+        self.assertEqual(str(peptideTable[4].sc), "2.0")
+        self.assertEqual(peptideTable[4].sequenceLength, 2)
+        peptideTable[0].name = "Z"
+        peptideTable.pop(1)
+        del peptideTable[-2:]
+        self.assertListEqual([row.name for row in peptideTable], ["Z", "B"])
+        self.assertEqual(str(peptideTable[1].precursorSignal), "1.2E+5")
+
+
+if __name__ == "__main__":
+    unittest.main()
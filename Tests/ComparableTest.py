@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from Classes.Comparable import Comparable
+from Classes.DecimalArray import DecimalArray
+
+
+class ComparableTest(unittest.TestCase):
+
+    values = list(map(Decimal, [
+        "95", "94.99", "95.00", "1E+2", "-3", "99.5", "0"]))
+
+    def testSameAsPythonComparison(self):
+        for paramString in ("<95", "<=95", ">95", ">=95.0", "==95",
+                            "!=95", ">1E+1", "<=-3"):
+            comparable = Comparable(paramString)
+            expected = [
+                eval(f"{value}{comparable.op}{comparable.val}")
+                for value in self.values
+            ]
+            self.assertListEqual(
+                [comparable.compare(value) for value in self.values],
+                expected)
+            self.assertListEqual(comparable.compareMany(self.values),
+                                 expected)
+            self.assertListEqual(
+                comparable.compareMany(DecimalArray(self.values)), expected)
+
+    def testEmptyParam(self):
+        for comparable in (Comparable(), Comparable(">=")):
+            self.assertTrue(comparable.compare(Decimal(-1)))
+            self.assertListEqual(
+                comparable.compareMany(DecimalArray(self.values)),
+                [True] * len(self.values))
+
+    def testParamsFromFile(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            filename = os.path.join(tempDir, "params.txt")
+            with open(filename, "w") as paramFile:
+                paramFile.write("1.1\t95\n2 50\n")
+            comparable = Comparable(f">= {filename}")
+        self.assertTrue(comparable.compare(Decimal(95), "1.1"))
+        self.assertFalse(comparable.compare("94.5", "1.1"))
+        self.assertTrue(comparable.compare(Decimal(60), "2"))
+        self.assertTrue(comparable.compare(Decimal(0), "3"))
+        self.assertListEqual(
+            comparable.compareMany(DecimalArray(self.values), "2"),
+            [True, True, True, True, False, True, False])
+
+    def testDefaultOperation(self):
+        comparable = Comparable(" 95 ")
+        self.assertEqual(comparable.op, ">=")
+        self.assertListEqual(
+            comparable.compareMany(DecimalArray(self.values)),
+            [True, False, True, True, False, True, False])
+        self.assertEqual(str(comparable), ">= 95")
+
+    def testUnknownOperation(self):
+        with self.assertRaises(ValueError):
+            Comparable("=95").compare(Decimal(1))
+
+    def testChangedParam(self):
+        comparable = Comparable(">=95")
+        self.assertFalse(comparable.compare(Decimal(90)))
+        comparable.val = "80"
+        self.assertTrue(comparable.compare(Decimal(90)))
+        comparable.op = "<"
+        self.assertFalse(comparable.compare(Decimal(90)))
+
+
+if __name__ == "__main__":
+    unittest.main()
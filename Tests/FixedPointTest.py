@@ -0,0 +1,50 @@
+import random
+import unittest
+from decimal import Decimal
+from Classes.DecimalArray import DecimalArray
+from Classes.FixedPoint import GroupSums
+
+
+class FixedPointTest(unittest.TestCase):
+
+    def GetDecimalSums(self, keys, values):
+        sums = {}
+        for key, value in zip(keys, values):
+            sums[key] = sums.get(key, Decimal(0)) + value
+        return sums
+
+    def AssertSameSums(self, keys, values):
+        fixedSums = GroupSums(keys, DecimalArray(values))
+        decimalSums = self.GetDecimalSums(keys, values)
+        self.assertListEqual(list(fixedSums), list(decimalSums))
+        self.assertListEqual(list(map(str, fixedSums.values())),
+                             list(map(str, decimalSums.values())))
+
+    def testSameExponent(self):
+        keys = [3, 0, 3, 1, 0]
+        values = list(map(Decimal, ["1.50", "2.00", "-1.50", "0.01", "7.25"]))
+        self.AssertSameSums(keys, values)
+        self.AssertSameSums(keys, list(map(Decimal, "12345")))
+        self.AssertSameSums(keys, [Decimal("1E+2")] * 5)
+
+    def testMixedExponents(self):
+        rng = random.Random(1)
+        keys = [rng.randrange(20) for _ in range(1000)]
+        values = [
+            Decimal(rng.randrange(-10 ** 6, 10 ** 6)).scaleb(
+                rng.randrange(-3, 3))
+            for _ in keys
+        ]
+        self.AssertSameSums(keys, values)
+
+    def testFallback(self):
+        self.assertIsNone(GroupSums(
+            [0, 0], DecimalArray([Decimal("1.5"), Decimal("NaN")])))
+        self.assertIsNone(GroupSums(
+            [0, 0], DecimalArray([Decimal(9 * 10 ** 17)] * 2 + [
+                Decimal("1E-10")])))
+        self.assertEqual(GroupSums([], DecimalArray()), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
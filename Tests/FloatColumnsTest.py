@@ -0,0 +1,48 @@
+import random
+import unittest
+from decimal import Decimal
+from Classes.DecimalArray import DecimalArray
+from Classes.FloatColumns import GroupFloatSums, ToFloats
+from Classes.NumericVerification import (
+    GetRelativeDeviation,
+    SelectVerificationTables,
+)
+
+
+class FloatColumnsTest(unittest.TestCase):
+
+    def testToFloats(self):
+        rng = random.Random(1)
+        values = [
+            Decimal(rng.randrange(-10 ** 9, 10 ** 9)).scaleb(
+                rng.randrange(-6, 4))
+            for _ in range(1000)
+        ]
+        self.assertListEqual(list(ToFloats(DecimalArray(values))),
+                             list(map(float, values)))
+        values.append(Decimal("NaN"))
+        self.assertEqual(len(ToFloats(DecimalArray(values))), 1001)
+
+    def testGroupFloatSums(self):
+        sums = GroupFloatSums([2, 0, 2, 5], [0.5, 1.0, 0.25, 3.0])
+        self.assertListEqual(list(sums.items()),
+                             [(2, 0.75), (0, 1.0), (5, 3.0)])
+        self.assertEqual(GroupFloatSums([], []), {})
+
+    def testSelectVerificationTables(self):
+        tableNums = ["10.1", "0.1", "2.1", "1.1", "1.2"]
+        self.assertListEqual(SelectVerificationTables(tableNums, 2),
+                             ["0.1", "1.2"])
+        self.assertListEqual(SelectVerificationTables(tableNums, 10),
+                             ["0.1", "1.1", "1.2", "2.1", "10.1"])
+        self.assertListEqual(SelectVerificationTables(tableNums, 0), [])
+
+    def testRelativeDeviation(self):
+        self.assertAlmostEqual(
+            GetRelativeDeviation(1.01, Decimal("1.00")), 0.01)
+        self.assertEqual(GetRelativeDeviation(0.5, Decimal(0)), 0.5)
+        self.assertEqual(GetRelativeDeviation(3, 3), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import random
+import tempfile
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+from Classes.FDRFilter import FDRFilter
+from Classes.GlobalFDR import GlobalFDR
+from Classes.Input import Input
+from Classes.PeptideColumns import PeptideColumns
+from Classes.RawPeptideTables import RawPeptideTables
+
+
+class GlobalFDRTest(unittest.TestCase):
+
+    peptideColumns = PeptideColumns(
+        accession=(1, "Accessions"),
+        sc=(3, "Score"),
+        precursorSignal=(4, "Intensity (Peptide)"),
+        sequence=(2, "Sequence"),
+        confidence=(0, "Best Conf (Peptide)"),
+    )
+
+    def GetNaiveCutoffCount(self, confidences, isDecoy, criticalValue, k):
+        order = sorted(range(len(confidences)),
+                       key=confidences.__getitem__, reverse=True)
+        cutoffCount = 0
+        decoyCount = 0
+        for rowCount, rowIndex in enumerate(order, 1):
+            decoyCount += isDecoy[rowIndex]
+            if (rowCount < len(order)
+                    and confidences[order[rowCount]]
+                    == confidences[rowIndex]):
+                continue
+            if (Fraction(decoyCount, rowCount) * 100 * Fraction(k)
+                    < Fraction(criticalValue)):
+                cutoffCount = rowCount
+        return cutoffCount
+
+    def testCutoffCount(self):
+        rng = random.Random(2)
+        for _ in range(20):
+            size = rng.randrange(1, 300)
+            confidences = [Decimal(rng.randrange(100)) for _ in range(size)]
+            isDecoy = [rng.random() < 0.2 for _ in range(size)]
+            globalFDR = GlobalFDR(confidences, isDecoy)
+            for criticalValue, k in (("0", "1"), ("1", "1"), ("5", "1.333"),
+                                     ("20", "2"), ("100", "1")):
+                self.assertEqual(
+                    globalFDR.GetCutoffCount(Decimal(criticalValue),
+                                             Decimal(k)),
+                    self.GetNaiveCutoffCount(confidences, isDecoy,
+                                             criticalValue, k))
+
+    def testOrder(self):
+        globalFDR = GlobalFDR(list(map(Decimal, "5375")), [False] * 4)
+        self.assertListEqual(globalFDR.order, [2, 0, 3, 1])
+        self.assertEqual(globalFDR.GetCutoffCount(Decimal("0.1")), 4)
+        self.assertEqual(GlobalFDR([], []).GetCutoffCount(Decimal(1)), 0)
+
+    def testTies(self):
+        # Граница между строками с confidence 90 дала бы FDR 0 %, но строки
+        # с одинаковым confidence остаются или удаляются вместе
+        confidences = list(map(Decimal, ["99", "90", "90", "90", "80"]))
+        isDecoy = [False, False, True, False, False]
+        globalFDR = GlobalFDR(confidences, isDecoy)
+        self.assertListEqual(list(globalFDR.boundaries), [1, 4, 5])
+        self.assertEqual(globalFDR.GetCutoffCount(Decimal(1)), 1)
+        self.assertEqual(globalFDR.GetCutoffCount(Decimal(30)), 5)
+        globalFDR = GlobalFDR(confidences[::-1], isDecoy[::-1])
+        self.assertEqual(globalFDR.GetCutoffCount(Decimal(1)), 1)
+
+    def testBlankAccessionRows(self):
+        # Как в выгрузках ProteinPilot: после обратных строк идут строки с
+        # пустой ячейкой Accessions, в том числе с высоким confidence
+        rng = random.Random(4)
+        rows = []
+        for _ in range(200):
+            accessions = "RRRRRP1" if rng.random() < 0.03 else "P1; P2"
+            rows.append((rng.randrange(50, 100), accessions))
+        rows += [(rng.randrange(10, 50), "RRRRRP2") for _ in range(20)]
+        rows += [(rng.choice((0, 99)), rng.choice(("", " ")))
+                 for _ in range(100)]
+        lines = ["Best Conf (Peptide)\tAccessions\tSequence\tScore\t"
+                 "Intensity (Peptide)"]
+        lines += [f"{confidence}\t{accessions}\tAAK\t1\t1"
+                  for confidence, accessions in rows]
+        with tempfile.TemporaryDirectory() as tempDir:
+            with open(os.path.join(tempDir, "1.1_PeptideSummary.txt"),
+                      'w') as outFile:
+                outFile.write('\n'.join(lines))
+            scoredRows = [row for row in rows if row[1].strip()]
+            confidences = [Decimal(row[0]) for row in scoredRows]
+            isDecoy = [row[1].startswith("RRRRR") for row in scoredRows]
+            cutoffCount = self.GetNaiveCutoffCount(
+                confidences, isDecoy, "5", "1")
+            for arrayTables in (False, True):
+                rawPeptideTables = RawPeptideTables(
+                    self.peptideColumns, tempDir, arrayTables=arrayTables)
+                cutoff = FDRFilter(rawPeptideTables).Apply("5")["1.1"]
+                table = rawPeptideTables["1.1"]
+                self.assertEqual(cutoff.targetCount + cutoff.decoyCount,
+                                 cutoffCount)
+                self.assertEqual(len(table), cutoff.targetCount)
+                self.assertGreater(len(table), 0)
+                for row in table:
+                    self.assertListEqual(row.accessions, ["P1", "P2"])
+
+    def testParseParams(self):
+        self.assertIsNone(GlobalFDR.ParseParams("default"))
+        self.assertIsNone(GlobalFDR.ParseParams(" "))
+        self.assertEqual(GlobalFDR.ParseParams("1"), (Decimal(1), Decimal(1)))
+        self.assertEqual(GlobalFDR.ParseParams("<1% 1.333"),
+                         (Decimal(1), Decimal("1.333")))
+        self.assertEqual(GlobalFDR.ParseParams("1 1.333 30"),
+                         (Decimal(1), Decimal("1.333")))
+        for fdr in ("x", "1 2 3 4", "1 0", "1 kest 30"):
+            with self.assertRaises(ValueError):
+                GlobalFDR.ParseParams(fdr)
+        inputParams = Input()
+        with self.assertRaises(ValueError):
+            inputParams.fdr = "1 kest 30"
+        self.assertEqual(inputParams.fdr, "default")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import unittest
+from decimal import Decimal
+from Classes.ArrayPeptideTable import ArrayPeptideTable
+from Classes.Comparable import Comparable
+from Classes.Functions import ApplyPeptideConfidenceFilter
+from Classes.Input import Input
+from Classes.ParameterSweep import ParameterSweep
+from Classes.PeptideAccession import PeptideAccession
+from Classes.PeptideTable import PeptideTable
+
+
+class ParameterSweepTest(unittest.TestCase):
+
+    def GetInput(self):
+        inputParams = Input()
+        inputParams.outputPath = "Output"
+        inputParams.proteinConfidence = "default"
+        inputParams.confPeptide = ">= 95"
+        inputParams.minGroupsWithAccession = 1
+        inputParams.maxGroupAbsence = 0
+        return inputParams
+
+    def testReadGrid(self):
+        self.assertDictEqual(
+            ParameterSweep.ReadGrid([
+                "confPeptide: >= 90 | >=95",
+                "",
+                " proteinConfidence :  | default",
+            ]),
+            {"confPeptide": [">= 90", ">=95"],
+             "proteinConfidence": ["", "default"]})
+        with self.assertRaises(ValueError):
+            ParameterSweep.ReadGrid(["confPeptide >= 90"])
+
+    def testCombinations(self):
+        inputParams = self.GetInput()
+        sweep = ParameterSweep(inputParams, {
+            "maxGroupAbsence": ["0", "1"],
+            "proteinConfidence": ["", ">= 99"],
+            "confPeptide": ["> 50", ">= 90", "== 99"],
+        })
+        self.assertEqual(sweep.Count(), 12)
+        self.assertListEqual(list(sweep.grid), [
+            "proteinConfidence", "confPeptide", "maxGroupAbsence"])
+        combination = sweep.combinations["sweep_12"]
+        self.assertEqual(combination.outputPath,
+                         os.path.join("Output", "sweep_12"))
+        self.assertTrue(combination.isProteinConfidence)
+        self.assertEqual(str(combination.confPeptide), "== 99")
+        self.assertEqual(combination.maxGroupAbsence, 1)
+        self.assertEqual(combination.minGroupsWithAccession, 1)
+        self.assertFalse(sweep.combinations["sweep_01"].isProteinConfidence)
+        self.assertEqual(str(inputParams.confPeptide), ">= 95")
+        self.assertEqual(inputParams.outputPath, "Output")
+        with self.assertRaises(ValueError):
+            ParameterSweep(inputParams, {"fdr": ["1"]})
+
+    def testSnapshot(self):
+        for table in (PeptideTable(), ArrayPeptideTable()):
+            for i, confidence in enumerate(("99", "50", "95", "10")):
+                table.append(PeptideAccession(
+                    str(i), Decimal(confidence), Decimal(1), Decimal(1),
+                    "K"))
+            snapshot = table.Snapshot()
+            ApplyPeptideConfidenceFilter(Comparable(">=", "95"),
+                                         {"1": snapshot})
+            self.assertListEqual([row.name for row in snapshot], ["0", "2"])
+            self.assertListEqual([str(row.confidence) for row in table],
+                                 ["99", "50", "95", "10"])
+
+
+if __name__ == "__main__":
+    unittest.main()
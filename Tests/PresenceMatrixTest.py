@@ -0,0 +1,84 @@
+import random
+import unittest
+from Classes.Accession import Accession
+from Classes.AccessionMatrix import AccessionMatrix
+from Classes.AccessionTables import AccessionTables
+from Classes.Functions import ApplyGroupFilter, GenerateGroupsBunch
+from Classes.PresenceMatrix import PresenceMatrix
+
+
+class PresenceMatrixTest(unittest.TestCase):
+
+    def CreateTables(self, rng, tableCount, accessionCount):
+        accessionTables = AccessionTables({}, None)
+        for i in range(tableCount):
+            tableNum = f"{rng.randrange(1, 5)}.{i}"
+            accessionTables[tableNum] = {
+                accessionId: Accession(name=str(accessionId),
+                                       Counts=rng.randrange(1, 10))
+                for accessionId in map(
+                    accessionTables.accessionDictionary.GetId,
+                    map(str, rng.sample(range(accessionCount),
+                                        rng.randrange(accessionCount + 1))))
+            }
+        return accessionTables
+
+    def GetNaiveKeptAccessions(self, accessionTables, maxGroupAbsence,
+                               minGroupsWithAccession):
+        groups = GenerateGroupsBunch(accessionTables)
+        accessions = set()
+        for table in accessionTables.values():
+            accessions.update(table)
+        keptAccessions = set()
+        for accession in accessions:
+            groupsWithAccession = 0
+            for tableNums in groups.values():
+                absence = sum(accession not in accessionTables[tableNum]
+                              for tableNum in tableNums)
+                groupsWithAccession += absence <= maxGroupAbsence
+            if groupsWithAccession >= minGroupsWithAccession:
+                keptAccessions.add(accession)
+        return keptAccessions
+
+    def testMask(self):
+        presenceMatrix = PresenceMatrix({
+            "1.1": {0: None, 1: None}, "1.2": {1: None}, "2.1": {2: None}})
+        self.assertEqual(presenceMatrix.GetMask(["1.1", "2.1"]), 0b101)
+        self.assertDictEqual(presenceMatrix.rows, {0: 1, 1: 3, 2: 4})
+        self.assertDictEqual(
+            presenceMatrix.CountGroupsWithAccessions(
+                {"1": ["1.1", "1.2"], "2": ["2.1"]}, 0),
+            {0: 0, 1: 1, 2: 1})
+
+    def testApplyGroupFilter(self):
+        rng = random.Random(3)
+        for _ in range(30):
+            accessionTables = self.CreateTables(
+                rng, rng.randrange(1, 12), rng.randrange(1, 20))
+            maxGroupAbsence = rng.randrange(3)
+            minGroupsWithAccession = rng.randrange(4)
+            keptAccessions = self.GetNaiveKeptAccessions(
+                accessionTables, maxGroupAbsence, minGroupsWithAccession)
+            expected = {
+                tableNum: {
+                    accessionId: accession.Counts
+                    for accessionId, accession in table.items()
+                    if accessionId in keptAccessions
+                }
+                for tableNum, table in accessionTables.items()
+            }
+            accessionMatrix = AccessionMatrix(accessionTables)
+            ApplyGroupFilter(accessionMatrix, maxGroupAbsence,
+                             minGroupsWithAccession)
+            self.assertListEqual(
+                accessionMatrix.accessionIds,
+                accessionTables.accessionDictionary.SortByNames(
+                    keptAccessions))
+            for tableNum, table in expected.items():
+                column = accessionMatrix.GetColumn(tableNum, "Counts")
+                self.assertDictEqual(column, table)
+                self.assertListEqual(list(column), list(table))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from unittest import mock
+from Classes.BaseClasses.Table import Table
+from Classes.PeptideColumns import PeptideColumns
+from Classes.ProteinColumns import ProteinColumns
+from Classes.ProteinTable import ProteinTable
+from Classes.RawPeptideTable import RawPeptideTable
+
+
+class ReadColumnsTest(unittest.TestCase):
+
+    peptideColumns = PeptideColumns(
+        accession=(1, "Accessions"),
+        sc=(3, "Score"),
+        precursorSignal=(4, "Intensity (Peptide)"),
+        sequence=(2, "Sequence"),
+        confidence=(0, "Best Conf (Peptide)"),
+    )
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def WriteFile(self, filename: str, lines) -> str:
+        filename = os.path.join(self.tempDir.name, filename)
+        with open(filename, 'w') as outFile:
+            outFile.write('\n'.join(lines))
+        return filename
+
+    def testRawPeptideTableProjection(self):
+        filename = self.WriteFile("1.1_PeptideSummary.txt", [
+            "Best Conf (Peptide)\tAccessions\tSequence\tScore\t"
+            "Intensity (Peptide)\tSpectrum",
+            "99.5\tA; B\tAAK\t10\t1.50\t1.1.1.1",
+            "",
+            "95\tC\tCCK\t2\t\t1.1.1.2\textra",
+            ""])
+        table = RawPeptideTable(
+            filename, unsafeFlag=True, columns=self.peptideColumns)
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table[0].accessions, ["A", "B"])
+        self.assertEqual(table[0].confidence, Decimal("99.5"))
+        self.assertEqual(str(table[0].precursorSignal), "1.50")
+        self.assertEqual(table[0].sequence, "AAK")
+        self.assertEqual(table[1].accessions, ["C"])
+        self.assertEqual(table[1].precursorSignal, Decimal(0))
+
+    def testBlockBoundaries(self):
+        filename = self.WriteFile("1.1_PeptideSummary.txt", [
+            "",
+            "Best Conf (Peptide)\tAccessions\tSequence\tScore\t"
+            "Intensity (Peptide)\r",
+            *(f"{99 - i}\tA{i}\tAAK\t{i}\t1.5\r" for i in range(20)),
+            ""])
+        table = RawPeptideTable(columns=self.peptideColumns)
+        rows = list(table.ReadMappedColumns(filename, self.peptideColumns))
+        self.assertEqual(len(rows), 20)
+        self.assertTupleEqual(rows[-1], ("A19", "19", "1.5", "AAK", "80"))
+        for blockSize in (1, 7, 64):
+            with mock.patch.object(Table, "MAPPED_BLOCK_SIZE", blockSize):
+                self.assertListEqual(
+                    list(table.ReadMappedColumns(
+                        filename, self.peptideColumns)),
+                    rows)
+
+    def testIterRowsIsLazy(self):
+        filename = self.WriteFile("1.1_PeptideSummary.txt", [
+            "Best Conf (Peptide)\tAccessions\tSequence\tScore\t"
+            "Intensity (Peptide)",
+            "99\tA\tAAK\t10\t1",
+            "99\tB\tAAK\t10\t1"])
+        rows = RawPeptideTable(columns=self.peptideColumns).IterRows(filename)
+        self.assertEqual(next(rows).accessions, ["A"])
+        self.assertEqual(next(rows).accessions, ["B"])
+        with self.assertRaises(StopIteration):
+            next(rows)
+
+    def testSafeReadColumnsException(self):
+        filename = self.WriteFile("1.1_ProteinSummary.txt", [
+            "Unused\tAccession",
+            "1\tA",
+            "0\tB\tC"])
+        with self.assertRaises(ValueError):
+            ProteinTable(filename, columns=ProteinColumns(
+                accession=(1, "Accession"), unused=(0, "Unused")))
+
+    def testWrongHeader(self):
+        filename = self.WriteFile("1.1_ProteinSummary.txt", [
+            "Unused\tName",
+            "1\tA"])
+        with self.assertRaises(ValueError):
+            ProteinTable(filename, True, columns=ProteinColumns(
+                accession=(1, "Accession"), unused=(0, "Unused")))
+
+    def testStopAtDecoys(self):
+        filename = self.WriteFile("1.1_PeptideSummary.txt", [
+            "Best Conf (Peptide)\tAccessions\tSequence\tScore\t"
+            "Intensity (Peptide)",
+            "99\tA; RRRRRB\tAAK\t10\t1",
+            "98\tRRRRRC; RRRRRA\tAAK\t10\t1",
+            "97\tC\tAAK\t10\t1"])
+        table = RawPeptideTable(
+            filename, columns=self.peptideColumns,
+            stopCondition=RawPeptideTable.IsDecoyRow)
+        self.assertListEqual([row.accessions for row in table],
+                             [["A", "RRRRRB"]])
+        self.assertEqual(len(RawPeptideTable(
+            filename, columns=self.peptideColumns)), 3)
+
+        filename = self.WriteFile("1.1_ProteinSummary.txt", [
+            "Unused\tAccession",
+            "2\tA",
+            "0\tB",
+            "1\tRRRRRC",
+            "1\tD"])
+        table = ProteinTable(
+            filename, columns=ProteinColumns(
+                accession=(1, "Accession"), unused=(0, "Unused")),
+            stopCondition=ProteinTable.IsDecoyRow)
+        self.assertListEqual([row.name for row in table], ["A", "B"])
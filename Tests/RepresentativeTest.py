@@ -0,0 +1,110 @@
+import os
+import random
+import tempfile
+import unittest
+from Classes.PeptideColumns import PeptideColumns
+from Classes.PeptideTables import PeptideTables
+from Classes.RawPeptideTables import RawPeptideTables
+from Classes.RepresentativeStats import RepresentativeStats
+from Classes.Sequence import Sequence
+
+
+class RepresentativeTest(unittest.TestCase):
+
+    peptideColumns = PeptideColumns(
+        accession=(1, "Accessions"),
+        sc=(3, "Score"),
+        precursorSignal=(4, "Intensity (Peptide)"),
+        sequence=(2, "Sequence"),
+        confidence=(0, "Best Conf (Peptide)"),
+    )
+    names = [f"P{i}" for i in range(8)]
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        rng = random.Random(11)
+        self.seqDB = {
+            name: Sequence(name, seq="K" * rng.randrange(1, 4))
+            for name in self.names
+        }
+        for tableNum in range(1, 4):
+            lines = ["Best Conf (Peptide)\tAccessions\tSequence\tScore\t"
+                     "Intensity (Peptide)"]
+            for _ in range(rng.randrange(20, 80)):
+                accessions = rng.sample(self.names, rng.randrange(1, 5))
+                lines.append(f"99\t{'; '.join(accessions)}\tAAK\t1\t1")
+            filename = os.path.join(self.tempDir.name,
+                                    f"{tableNum}.1_PeptideSummary.txt")
+            with open(filename, 'w') as outFile:
+                outFile.write('\n'.join(lines))
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def GetNaiveRepresentative(self, accessions, tableCounts,
+                               generalCounts):
+        for key in (tableCounts.__getitem__, generalCounts.__getitem__,
+                    lambda name: self.seqDB[name].len):
+            maxValue = max(map(key, accessions))
+            accessions = [accession for accession in accessions
+                          if key(accession) == maxValue]
+        return accessions[0]
+
+    def testRepresentatives(self):
+        for arrayTables in (False, True):
+            rawPeptideTables = RawPeptideTables(
+                self.peptideColumns, self.tempDir.name,
+                arrayTables=arrayTables)
+            tableCounts = {
+                tableNum: {
+                    name: sum(row.accessions.count(name) for row in table)
+                    for name in self.names
+                }
+                for tableNum, table in rawPeptideTables.items()
+            }
+            generalCounts = {
+                name: sum(counts[name] for counts in tableCounts.values())
+                for name in self.names
+            }
+            expected = {
+                tableNum: [
+                    self.GetNaiveRepresentative(
+                        row.accessions, tableCounts[tableNum],
+                        generalCounts)
+                    for row in table
+                ]
+                for tableNum, table in rawPeptideTables.items()
+            }
+            peptideTables = PeptideTables(rawPeptideTables, self.seqDB)
+            for tableNum, table in peptideTables.items():
+                self.assertListEqual([row.name for row in table],
+                                     expected[tableNum])
+            stats = peptideTables.representativeStats
+            self.assertEqual(stats.rows, sum(map(len, expected.values())))
+            self.assertEqual(
+                stats.rows,
+                stats.singleAccessionRows + stats.cacheHits
+                + stats.byTableCounts + stats.byGeneralCounts
+                + stats.bySequenceLengths)
+            self.assertGreater(stats.cacheHits, 0)
+
+    def testMergedStats(self):
+        # Статистика процессов TableWorkers складывается в статистику всех
+        # таблиц
+        peptideTables = PeptideTables(
+            RawPeptideTables(self.peptideColumns, self.tempDir.name),
+            self.seqDB)
+        merged = RepresentativeStats()
+        for tableNums in (["1.1"], ["2.1", "3.1"]):
+            rawPeptideTables = RawPeptideTables(
+                self.peptideColumns, self.tempDir.name, tableNums=tableNums)
+            generalCounts = rawPeptideTables.accessionDictionary.KeysToIds(
+                peptideTables.accessionDictionary.KeysToNames(
+                    peptideTables.accessionCatalog.generalCounts))
+            merged.Add(PeptideTables(rawPeptideTables, self.seqDB,
+                                     generalCounts).representativeStats)
+        self.assertEqual(merged, peptideTables.representativeStats)
+
+
+if __name__ == "__main__":
+    unittest.main()
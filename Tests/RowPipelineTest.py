@@ -0,0 +1,114 @@
+import os
+import random
+import tempfile
+import unittest
+from collections import Counter
+from Classes.AccessionExclusionList import AccessionExclusionList
+from Classes.FDRFilter import FDRFilter
+from Classes.Functions import GetNotFoundAccessions
+from Classes.PeptideColumns import PeptideColumns
+from Classes.PeptideTables import PeptideTables
+from Classes.RawPeptideTables import RawPeptideTables
+from Classes.RowPipeline import RowPipeline
+from Classes.Sequence import Sequence
+
+
+class RowPipelineTest(unittest.TestCase):
+
+    peptideColumns = PeptideColumns(
+        accession=(1, "Accessions"),
+        sc=(3, "Score"),
+        precursorSignal=(4, "Intensity (Peptide)"),
+        sequence=(2, "Sequence"),
+        confidence=(0, "Best Conf (Peptide)"),
+    )
+    blackList = ["P3", "cont|*", "/RRRRRP[0-9]/"]
+    names = ["P1", "P2", "P3", "P4", "cont|5", "RRRRRP1", "RRRRRP6"]
+    seqDB = {name: Sequence(name, seq="K" * len(name))
+             for name in ["P1", "P2", "P3", "cont|5"]}
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        rng = random.Random(17)
+        for tableNum in range(1, 4):
+            lines = ["Best Conf (Peptide)\tAccessions\tSequence\tScore\t"
+                     "Intensity (Peptide)"]
+            for _ in range(rng.randrange(20, 60)):
+                accessions = rng.sample(self.names, rng.randrange(1, 4))
+                if rng.random() < 0.05:
+                    accessions = ["RRRRRP1"]
+                lines.append(f"99\t{'; '.join(accessions)}\tAAK\t1\t1")
+            filename = os.path.join(self.tempDir.name,
+                                    f"{tableNum}.1_PeptideSummary.txt")
+            with open(filename, 'w') as outFile:
+                outFile.write('\n'.join(lines))
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def ReadTables(self, arrayTables):
+        return RawPeptideTables(self.peptideColumns, self.tempDir.name,
+                                arrayTables=arrayTables)
+
+    def RemoveExcludedRows(self, tables):
+        exclusionList = AccessionExclusionList(self.blackList)
+        excludedIds = exclusionList.GetExcludedIds(
+            tables.accessionDictionary)
+        removedCounts = Counter()
+        for table in tables.values():
+            removedCounts.update(
+                exclusionList.RemoveExcludedRows(table, excludedIds))
+        return dict(removedCounts)
+
+    def testMatchesSeparatePasses(self):
+        for arrayTables in (False, True):
+            expected = self.ReadTables(arrayTables)
+            FDRFilter(expected).ApplyDefaultFilter()
+            expectedBlackListCounts = self.RemoveExcludedRows(expected)
+            expectedNotFound = GetNotFoundAccessions(self.seqDB, expected)
+
+            actual = self.ReadTables(arrayTables)
+            notFound = RowPipeline(
+                actual, self.seqDB, AccessionExclusionList(self.blackList)
+            ).Apply()
+
+            self.assertSetEqual(notFound, expectedNotFound)
+            self.assertSetEqual(actual.accessionCatalog.notFoundAccessions,
+                                expectedNotFound)
+            self.assertDictEqual(actual.blackListCounts,
+                                 expectedBlackListCounts)
+            for tableNum in expected:
+                self.assertListEqual(
+                    [row.accessions for row in actual[tableNum]],
+                    [row.accessions for row in expected[tableNum]])
+                self.assertDictEqual(
+                    actual.accessionDictionary.KeysToNames(
+                        actual.accessionCatalog.tableCounts[tableNum]),
+                    expected.accessionDictionary.KeysToNames(
+                        PeptideTables.CountAccessionsInRawTable(
+                            expected[tableNum])))
+
+    def testWithoutBlackList(self):
+        tables = self.ReadTables(False)
+        RowPipeline(tables, self.seqDB).Apply()
+        self.assertDictEqual(tables.blackListCounts, {})
+        catalog = tables.accessionCatalog
+        self.assertSetEqual(catalog.notFoundAccessions, {"P4"})
+        self.assertDictEqual(
+            catalog.lengths,
+            {accessionId: len(tables.accessionDictionary.names[accessionId])
+             for accessionId in catalog.generalCounts
+             if tables.accessionDictionary.names[accessionId] != "P4"})
+        self.assertDictEqual(
+            catalog.generalCounts,
+            dict(PeptideTables.GetGeneralAccessionCounts(
+                catalog.tableCounts)))
+        for table in tables.values():
+            for row in table:
+                self.assertTrue(row.accessions)
+                self.assertFalse(any(accession.startswith("RRRRR")
+                                     for accession in row.accessions))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+import unittest.mock
+from Benchmarks.FastaParse import (
+    IsSameDatabase, LegacyFromFile, WriteSyntheticFasta)
+from Classes.SequenceDatabase import SequenceDatabase
+
+
+class SequenceDatabaseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tempDir.name, "test.fasta")
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def WriteFasta(self, content: str):
+        with open(self.filename, 'w') as outFile:
+            outFile.write(content)
+
+    def testSameAsLegacyParser(self):
+        self.WriteFasta("comment\nx>not a header\n\n"
+                        ">P1 first  protein OS=X OS=Y\r\n"
+                        "mkvAC*-12\n\nDE\xe9F\n"
+                        ">P2\nW\n"
+                        ">P1 duplicate\nYY\n"
+                        ">  \nQQ")
+        seqDB = SequenceDatabase.fromFile(self.filename)
+        self.assertTrue(IsSameDatabase(LegacyFromFile(self.filename), seqDB))
+        self.assertEqual(seqDB["P2"].seq, "W")
+
+    def testEmptySequenceRaises(self):
+        self.WriteFasta(">P1 first\n>P2\nAAA\n")
+        with self.assertRaises(IndexError):
+            LegacyFromFile(self.filename)
+        with unittest.mock.patch("builtins.input"):
+            with self.assertRaises(IndexError):
+                SequenceDatabase.fromFile(self.filename)
+
+    def testSyntheticSameAsLegacyParser(self):
+        WriteSyntheticFasta(self.filename, 2000)
+        self.assertTrue(IsSameDatabase(
+            LegacyFromFile(self.filename),
+            SequenceDatabase.fromFile(self.filename)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import pickle
+import tempfile
+import unittest
+from Classes.SequenceDatabase import SequenceDatabase
+from Classes.SequenceIndex import SequenceIndex
+
+
+class SequenceIndexTest(unittest.TestCase):
+
+    fasta = ("some comment\n"
+             ">sp|P1|A first protein OS=Homo sapiens GN=A\n"
+             "MKV*LA\n"
+             "\n"
+             "QRS-t\n"
+             ">P2\n"
+             "AAAA\n"
+             ">P3 third OS=X\n"
+             "CCC")
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tempDir.name, "test.fasta")
+        self.WriteFasta(self.fasta)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def WriteFasta(self, content: str):
+        with open(self.filename, 'w') as outFile:
+            outFile.write(content)
+
+    def AssertSameDatabase(self, seqDB, indexedDB):
+        self.assertListEqual(list(seqDB.keys()), list(indexedDB.keys()))
+        for accession, sequence in seqDB.items():
+            indexed = indexedDB[accession]
+            self.assertEqual(indexed.desc, sequence.desc)
+            self.assertEqual(indexed.len, sequence.len)
+            self.assertEqual(indexed.seq, sequence.seq)
+
+    def testIndexedDatabaseIsEqual(self):
+        seqDB = SequenceDatabase.fromFile(self.filename)
+        indexedDB = SequenceDatabase.fromIndexedFile(self.filename)
+        self.assertTrue(
+            os.path.exists(SequenceIndex.GetIndexFilename(self.filename)))
+        self.AssertSameDatabase(seqDB, indexedDB)
+        self.AssertSameDatabase(
+            seqDB, SequenceDatabase.fromIndexedFile(self.filename))
+        self.assertEqual(indexedDB["sp|P1|A"].seq, "MKVLAQRS")
+        self.assertEqual(indexedDB["sp|P1|A"].desc, "first protein")
+
+    def testSequencesAreLoadedOnDemand(self):
+        SequenceDatabase.fromIndexedFile(self.filename)
+        indexedDB = SequenceDatabase.fromIndexedFile(self.filename)
+        self.assertIsNone(indexedDB["P2"]._loadedSeq)
+        self.assertEqual(indexedDB["P2"].len, 4)
+        self.assertEqual(indexedDB["P2"].seq, "AAAA")
+        copy = pickle.loads(pickle.dumps(indexedDB["P3"]))
+        self.assertEqual(copy.seq, "CCC")
+
+    def testChangedFileIsIndexedAgain(self):
+        SequenceDatabase.fromIndexedFile(self.filename)
+        self.WriteFasta(">P4 fourth\nWWW\n")
+        os.utime(self.filename, ns=(0, 0))
+        indexedDB = SequenceDatabase.fromIndexedFile(self.filename)
+        self.AssertSameDatabase(
+            SequenceDatabase.fromFile(self.filename), indexedDB)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+from Classes.SequenceDatabase import SequenceDatabase
+from Classes.SequenceIndex import IndexedSequence
+from Classes.SequenceSnapshot import SequenceSnapshot
+
+
+class SequenceSnapshotTest(unittest.TestCase):
+
+    fasta = (">sp|P1|A first protein OS=Homo sapiens\n"
+             "MKVLA\nQRS\n"
+             ">P2\nAAAA\n")
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tempDir.name, "test.fasta")
+        self.snapshotFilename = SequenceSnapshot.GetSnapshotFilename(
+            self.filename)
+        self.WriteFasta(self.fasta)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def WriteFasta(self, content: str):
+        with open(self.filename, 'w') as outFile:
+            outFile.write(content)
+
+    def AssertSameDatabase(self, seqDB, snapshotDB):
+        self.assertIsInstance(snapshotDB, SequenceDatabase)
+        self.assertListEqual(list(seqDB.keys()), list(snapshotDB.keys()))
+        for accession, sequence in seqDB.items():
+            self.assertEqual(
+                (snapshotDB[accession].desc, snapshotDB[accession].len,
+                 snapshotDB[accession].seq),
+                (sequence.desc, sequence.len, sequence.seq))
+
+    def testSnapshotIsEqual(self):
+        seqDB = SequenceDatabase.fromFile(self.filename)
+        for withSequences in (True, False):
+            self.AssertSameDatabase(seqDB, SequenceDatabase.fromSnapshot(
+                self.filename, withSequences))
+            snapshotDB = SequenceDatabase.fromSnapshot(
+                self.filename, withSequences)
+            self.AssertSameDatabase(seqDB, snapshotDB)
+            self.assertEqual(
+                isinstance(snapshotDB["P2"], IndexedSequence),
+                not withSequences)
+
+    def testSnapshotIsUsedOnSecondRun(self):
+        SequenceDatabase.fromSnapshot(self.filename)
+        fastaHash = SequenceSnapshot.GetFastaHash(self.filename)
+        self.assertIsNotNone(
+            SequenceSnapshot.Load(self.filename, fastaHash, True))
+        self.assertIsNone(
+            SequenceSnapshot.Load(self.filename, fastaHash, False))
+
+    def testChangedFileIsParsedAgain(self):
+        SequenceDatabase.fromSnapshot(self.filename)
+        self.WriteFasta(">P3 third\nWWW\n")
+        self.AssertSameDatabase(SequenceDatabase.fromFile(self.filename),
+                                SequenceDatabase.fromSnapshot(self.filename))
+
+    def testDamagedSnapshotIsIgnored(self):
+        SequenceDatabase.fromSnapshot(self.filename)
+        with open(self.snapshotFilename, "r+b") as snapshotFile:
+            snapshotFile.truncate(SequenceSnapshot.HEADER.size + 3)
+        fastaHash = SequenceSnapshot.GetFastaHash(self.filename)
+        self.assertIsNone(
+            SequenceSnapshot.Load(self.filename, fastaHash, True))
+        self.AssertSameDatabase(SequenceDatabase.fromFile(self.filename),
+                                SequenceDatabase.fromSnapshot(self.filename))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import time
+import unittest
+from Classes.ProteinColumns import ProteinColumns
+from Classes.ProteinTable import ProteinTable
+from Classes.TableCache import TableCache
+
+
+class TableCacheTest(unittest.TestCase):
+
+    columns = ProteinColumns(accession=(1, "Accession"), unused=(0, "Unused"))
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.cacheDir = os.path.join(self.tempDir.name, "cache")
+        self.filename = os.path.join(
+            self.tempDir.name, "1.1_ProteinSummary.txt")
+        self.WriteTable(["1.50\tA", "0\tB"])
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def WriteTable(self, lines):
+        with open(self.filename, 'w') as outFile:
+            outFile.write('\n'.join(["Unused\tAccession", *lines]))
+
+    def LoadTable(self, cache: TableCache) -> ProteinTable:
+        return ProteinTable(
+            self.filename, True, columns=self.columns, cache=cache)
+
+    def testCachedTableIsEqual(self):
+        cache = TableCache(self.cacheDir)
+        table = self.LoadTable(cache)
+        self.assertEqual(len(os.listdir(self.cacheDir)), 1)
+        cachedTable = self.LoadTable(cache)
+        self.assertListEqual(cachedTable, table)
+        self.assertEqual(str(cachedTable[0].unused), "1.50")
+
+    def testDecimalsAreCachedAsIntegers(self):
+        cache = TableCache(self.cacheDir)
+        self.LoadTable(cache)
+        key, _ = os.path.splitext(os.listdir(self.cacheDir)[0])
+        self.assertListEqual(
+            cache.Load(key), [("A", 150, -2), ("B", 0, 0)])
+
+    def testChangedFileIsReadAgain(self):
+        cache = TableCache(self.cacheDir)
+        self.LoadTable(cache)
+        self.WriteTable(["2\tC"])
+        table = self.LoadTable(cache)
+        self.assertEqual([row.name for row in table], ["C"])
+        self.assertEqual(len(os.listdir(self.cacheDir)), 2)
+
+    def testEvictLeastRecentlyUsed(self):
+        cache = TableCache(self.cacheDir)
+        cache.Save("old", [("A",)])
+        cache.Save("new", [("B",)])
+        past = time.time() - 100
+        os.utime(os.path.join(self.cacheDir, "old.tbl"), (past, past))
+        cache.Load("old")
+        entrySize = os.path.getsize(os.path.join(self.cacheDir, "new.tbl"))
+        cache.maxSize = entrySize
+        cache.Evict()
+        self.assertListEqual(os.listdir(self.cacheDir), ["old.tbl"])
@@ -0,0 +1,93 @@
+import random
+import unittest
+from decimal import Decimal
+from Classes.ArrayPeptideTable import ArrayPeptideTable
+from Classes.Comparable import Comparable
+from Classes.Functions import (
+    ApplyPeptideConfidenceFilter,
+    ApplyProteinConfidenceFilter,
+    RemoveAccessionsListFromTable,
+)
+from Classes.PeptideAccession import PeptideAccession
+from Classes.PeptideTable import PeptideTable
+from Classes.TableFilter import CompactTable, FilterTable
+
+
+class TableFilterTest(unittest.TestCase):
+
+    rows = [
+        PeptideAccession("A", Decimal(99), Decimal(1), Decimal("1.5"), "K"),
+        PeptideAccession("B;X", Decimal(10), Decimal(2), Decimal(2), "KK"),
+        PeptideAccession("C", Decimal(95), Decimal(3), Decimal(0), "KKK"),
+        PeptideAccession("B", Decimal(50), Decimal(4), Decimal(1), "KK"),
+    ]
+
+    def CreateTables(self):
+        tables = (PeptideTable(), ArrayPeptideTable())
+        for table in tables:
+            for row in self.rows:
+                table.append(PeptideAccession(**row.__dict__))
+        return tables
+
+    def GetNames(self, table):
+        return [row.name for row in table]
+
+    def testCompactTable(self):
+        for table in self.CreateTables():
+            self.assertEqual(CompactTable(table, [True] * 4), 0)
+            self.assertEqual(len(table), 4)
+            self.assertEqual(CompactTable(table, [False, True, False, True]),
+                             2)
+            self.assertListEqual(self.GetNames(table), ["B;X", "B"])
+            self.assertEqual(str(table[1].sc), "4")
+
+    def testFilterTable(self):
+        for table in self.CreateTables():
+            self.assertEqual(
+                FilterTable(table, lambda row: row.sequenceLength != 2), 2)
+            self.assertListEqual(self.GetNames(table), ["A", "C"])
+            self.assertEqual(FilterTable(table, lambda row: False), 2)
+            self.assertEqual(len(table), 0)
+
+    def testFilters(self):
+        for table in self.CreateTables():
+            RemoveAccessionsListFromTable(table, ["B", "Y"])
+            self.assertListEqual(self.GetNames(table), ["A", "C"])
+        for table in self.CreateTables():
+            ApplyPeptideConfidenceFilter(
+                Comparable(">=", "50"), {"1": table})
+            self.assertListEqual(self.GetNames(table), ["A", "C", "B"])
+
+    def GetNaiveProteinConfidenceNames(self, rows, conf):
+        scores = {}
+        for row in rows:
+            if conf.val is None:
+                score = (2 if row.confidence >= 99
+                         else 1 if row.confidence >= 95 else 0)
+            else:
+                score = 2 * conf.compare(row.confidence)
+            scores[row.name] = scores.get(row.name, 0) + score
+        return [row.name for row in rows if scores[row.name] > 1]
+
+    def testProteinConfidenceFilters(self):
+        rng = random.Random(5)
+        for conf in (Comparable(), Comparable(">=", "97.5")):
+            for _ in range(10):
+                rows = [
+                    PeptideAccession(
+                        rng.choice("ABCDEFGH"),
+                        Decimal(rng.choice(["99", "99.00", "98.9", "96",
+                                            "95", "94.99", "50", "0"])),
+                        Decimal(1), Decimal(1), "K")
+                    for _ in range(rng.randrange(0, 30))
+                ]
+                expected = self.GetNaiveProteinConfidenceNames(rows, conf)
+                for table in (PeptideTable(), ArrayPeptideTable()):
+                    for row in rows:
+                        table.append(PeptideAccession(**row.__dict__))
+                    ApplyProteinConfidenceFilter(conf, {"1": table})
+                    self.assertListEqual(self.GetNames(table), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
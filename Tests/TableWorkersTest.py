@@ -0,0 +1,45 @@
+import unittest
+from Classes.TableWorkers import TableWorkers
+
+
+def _GetTableNums(state):
+    return list(state["tableNums"])
+
+
+def _StoreValue(state, value):
+    state["value"] = value
+    return [tableNum + value for tableNum in state["tableNums"]]
+
+
+def _GetValue(state):
+    return state["value"]
+
+
+def _RaiseError(state):
+    raise KeyError(state["tableNums"][0])
+
+
+class TableWorkersTest(unittest.TestCase):
+
+    def testSplitTables(self):
+        self.assertListEqual(
+            TableWorkers.SplitTables(
+                {"0.1": 10, "0.2": 1, "1.1": 6, "1.2": 5}, 2),
+            [["0.1", "0.2"], ["1.1", "1.2"]])
+        self.assertListEqual(
+            TableWorkers.SplitTables({"0.1": 10}, 4), [["0.1"]])
+
+    def testRunKeepsStateBetweenStages(self):
+        with TableWorkers(2, {"0.1": 2, "1.1": 1}, {}) as workers:
+            self.assertListEqual(
+                workers.Run(_GetTableNums), [["0.1"], ["1.1"]])
+            self.assertListEqual(
+                workers.Run(_StoreValue, "!"), [["0.1!"], ["1.1!"]])
+            self.assertListEqual(workers.Run(_GetValue), ["!", "!"])
+
+    def testRunRaisesWorkerException(self):
+        with TableWorkers(2, {"0.1": 2, "1.1": 1}, {}) as workers:
+            with self.assertRaises(KeyError):
+                workers.Run(_RaiseError)
+            self.assertListEqual(
+                workers.Run(_GetTableNums), [["0.1"], ["1.1"]])
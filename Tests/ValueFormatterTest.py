@@ -0,0 +1,51 @@
+import random
+import unittest
+from decimal import Decimal, localcontext
+from Classes.ValueFormatter import ValueFormatter
+
+
+class ValueFormatterTest(unittest.TestCase):
+
+    def LegacyFormat(self, value):
+        if isinstance(value, float):
+            value = Decimal(repr(value))
+        with localcontext() as context:
+            context.prec = max(1, 7 + Decimal(value).adjusted())
+            val = str(+value)
+            if '.' in val and "e" not in val.lower():
+                val = val.rstrip("0").rstrip(".")
+            return val
+
+    def GetValues(self):
+        rng = random.Random(13)
+        values = [
+            0, 17, 123456789, Decimal(0), Decimal("0E-10"), Decimal("0.000"),
+            Decimal("-0"), Decimal("1.2E+3"), Decimal("1E+30"),
+            Decimal("0.60000000001"), Decimal("9.9999999"),
+            Decimal("0.00000049999"), Decimal("0.0000005"),
+            Decimal("123456789.123456789"), Decimal("2.5000005"),
+            Decimal("NaN"), Decimal("Infinity"), 0.0, 1e-7, 1e22, 0.1 + 0.2,
+        ]
+        for _ in range(2000):
+            value = Decimal(rng.randrange(10 ** rng.randrange(1, 30))).scaleb(
+                rng.randrange(-35, 5))
+            if rng.random() < 0.5:
+                value = value / Decimal(rng.randrange(1, 10 ** 6))
+            values.append(-value if rng.random() < 0.2 else value)
+            values.append(float(value))
+        return values
+
+    def testMatchesLocalContext(self):
+        formatter = ValueFormatter()
+        values = self.GetValues()
+        expected = [self.LegacyFormat(value) for value in values]
+        self.assertListEqual([formatter.Format(value) for value in values],
+                             expected)
+        self.assertListEqual(formatter.FormatRow(values), expected)
+        self.assertListEqual(
+            formatter.FormatRow([None, Decimal("1.50"), None]),
+            ['', "1.5", ''])
+
+
+if __name__ == "__main__":
+    unittest.main()
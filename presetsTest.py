@@ -81,7 +81,7 @@ class Preset:
             self.settings.blackList = (
                 None if blackList is None else (presetFileValues[1], blackList)
             )
-        self.settings.seqDB = SequenceDatabase.fromFile(
+        self.settings.seqDB = SequenceDatabase.fromSnapshot(
             FindFastaFile(self.folder)
         )
         self.settings.proteinConfidence = presetFileValues[2]
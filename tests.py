@@ -2,6 +2,27 @@
 import unittest
 from Tests.ReadTableTest import ReadTableTest  # noqa: 401
 from Tests.ProteinDBTest import ProteinDBTest  # noqa: 401
+from Tests.ReadColumnsTest import ReadColumnsTest  # noqa: 401
+from Tests.TableWorkersTest import TableWorkersTest  # noqa: 401
+from Tests.TableCacheTest import TableCacheTest  # noqa: 401
+from Tests.SequenceIndexTest import SequenceIndexTest  # noqa: 401
+from Tests.SequenceDatabaseTest import SequenceDatabaseTest  # noqa: 401
+from Tests.SequenceSnapshotTest import SequenceSnapshotTest  # noqa: 401
+from Tests.ArrayPeptideTableTest import ArrayPeptideTableTest  # noqa: 401
+from Tests.FixedPointTest import FixedPointTest  # noqa: 401
+from Tests.FloatColumnsTest import FloatColumnsTest  # noqa: 401
+from Tests.TableFilterTest import TableFilterTest  # noqa: 401
+from Tests.ComparableTest import ComparableTest  # noqa: 401
+from Tests.AccessionExclusionListTest import (  # noqa: 401
+    AccessionExclusionListTest)
+from Tests.GlobalFDRTest import GlobalFDRTest  # noqa: 401
+from Tests.RowPipelineTest import RowPipelineTest  # noqa: 401
+from Tests.ParameterSweepTest import ParameterSweepTest  # noqa: 401
+from Tests.PresenceMatrixTest import PresenceMatrixTest  # noqa: 401
+from Tests.RepresentativeTest import RepresentativeTest  # noqa: 401
+from Tests.AccessionTablesTest import AccessionTablesTest  # noqa: 401
+from Tests.AccessionMatrixTest import AccessionMatrixTest  # noqa: 401
+from Tests.ValueFormatterTest import ValueFormatterTest  # noqa: 401
 
 
 def main():